@@ -0,0 +1,38 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0a7e4c9b2d63"
+down_revision = "f52a9c3e8d14"
+branch_labels = None
+depends_on = None
+
+
+def _column_exists(table: str, col: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(c["name"] == col for c in insp.get_columns(table))
+
+
+def upgrade() -> None:
+    # Store the full w500 URL once so readers can return shows.poster_url as-is
+    # instead of rebuilding it from poster_path on every request.
+    # poster_path was added outside alembic; nothing to backfill without it.
+    if not _column_exists("shows", "poster_path"):
+        return
+    op.execute(
+        """
+        UPDATE shows
+        SET poster_url = CASE
+            WHEN poster_path LIKE 'http%' THEN poster_path
+            WHEN poster_path LIKE '/%'    THEN 'https://image.tmdb.org/t/p/w500' || poster_path
+            ELSE 'https://image.tmdb.org/t/p/w500/' || poster_path
+        END
+        WHERE COALESCE(poster_url, '') = ''
+          AND COALESCE(poster_path, '') <> '';
+        """
+    )
+
+
+def downgrade() -> None:
+    # Data-only backfill; the URLs are still valid after a downgrade.
+    pass
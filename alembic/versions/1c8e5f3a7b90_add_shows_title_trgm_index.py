@@ -0,0 +1,24 @@
+from alembic import op
+
+revision = "1c8e5f3a7b90"
+down_revision = "0a7e4c9b2d63"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # search_shows filters on title ILIKE '%q%'; the leading wildcard defeats
+    # the btree on shows.title, but a trigram GIN index serves it.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    # CONCURRENTLY can't run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_shows_title_trgm "
+            "ON shows USING gin (title gin_trgm_ops);"
+        )
+
+
+def downgrade() -> None:
+    # pg_trgm is left installed; other objects may depend on it.
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_shows_title_trgm;")
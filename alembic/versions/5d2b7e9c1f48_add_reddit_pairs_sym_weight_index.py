@@ -0,0 +1,42 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "5d2b7e9c1f48"
+down_revision = "1c8e5f3a7b90"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(name: str) -> bool:
+    bind = op.get_bind()
+    return bind.execute(
+        sa.text("SELECT to_regclass(:n) IS NOT NULL OR to_regclass('public.' || :n) IS NOT NULL"),
+        {"n": name},
+    ).scalar()
+
+
+def upgrade() -> None:
+    # Per-show lookups read reddit_pairs_sym WHERE tmdb_id = :tid ORDER BY
+    # pair_weight DESC LIMIT n. With pair_weight in the key the top n come
+    # straight off an index-only range scan, no sort; it still serves the
+    # tmdb_id IN (...) aggregations, so it replaces the plain tmdb_id cover.
+    if not _table_exists("reddit_pairs_sym"):
+        return
+    # CONCURRENTLY can't run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reddit_pairs_sym_tmdb_weight "
+            "ON reddit_pairs_sym (tmdb_id, pair_weight DESC) INCLUDE (other_id, pair_count);"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_reddit_pairs_sym_tmdb_cover;")
+
+
+def downgrade() -> None:
+    if not _table_exists("reddit_pairs_sym"):
+        return
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reddit_pairs_sym_tmdb_cover "
+            "ON reddit_pairs_sym (tmdb_id) INCLUDE (other_id, pair_weight, pair_count);"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_reddit_pairs_sym_tmdb_weight;")
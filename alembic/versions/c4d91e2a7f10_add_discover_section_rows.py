@@ -0,0 +1,25 @@
+from alembic import op
+
+revision = "c4d91e2a7f10"
+down_revision = "ae384262c915"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Snapshot of the deterministic discover sections (top_decade + genre rows),
+    # refreshed by a background task so GET /discover never waits on TMDb.
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS discover_section_rows (
+            section      TEXT        NOT NULL,
+            rank         INTEGER     NOT NULL,
+            tmdb_id      INTEGER     NOT NULL,
+            payload      JSONB       NOT NULL,
+            refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (section, rank)
+        );
+        """
+    )
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS discover_section_rows;")
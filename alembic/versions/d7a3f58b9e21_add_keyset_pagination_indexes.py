@@ -0,0 +1,15 @@
+from alembic import op
+
+revision = "d7a3f58b9e21"
+down_revision = "c4d91e2a7f10"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Keyset pagination (WHERE user_id = ? AND id < ? ORDER BY id DESC LIMIT n)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_ratings_user_id_id_desc ON ratings (user_id, id DESC);")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_rec_feedback_user_id_id_desc ON rec_feedback (user_id, id DESC);")
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_rec_feedback_user_id_id_desc;")
+    op.execute("DROP INDEX IF EXISTS ix_ratings_user_id_id_desc;")
@@ -0,0 +1,41 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "e1b6c0d2a4f7"
+down_revision = "d7a3f58b9e21"
+branch_labels = None
+depends_on = None
+
+# (table, index, DDL body). user_favorites / not_interested already carry
+# UNIQUE (user_id, tmdb_id), which serves the anti-join lookups. reddit_pairs
+# gets no side indexes: reads go through reddit_pairs_sym (next revision),
+# so they would only slow down pair writes.
+_INDEXES = (
+    (
+        "user_reddit_pairs",
+        "ix_user_reddit_pairs_user_weight",
+        "ON user_reddit_pairs (user_id, weight DESC) INCLUDE (suggested_tmdb_id)",
+    ),
+)
+
+
+def _table_exists(name: str) -> bool:
+    bind = op.get_bind()
+    return bind.execute(
+        sa.text("SELECT to_regclass(:n) IS NOT NULL OR to_regclass('public.' || :n) IS NOT NULL"),
+        {"n": name},
+    ).scalar()
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        for table, name, body in _INDEXES:
+            # user_reddit_pairs is created at runtime; skip if not there yet.
+            if _table_exists(table):
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {body};")
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for _table, name, _body in reversed(_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name};")
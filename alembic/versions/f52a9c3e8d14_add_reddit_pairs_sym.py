@@ -0,0 +1,106 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "f52a9c3e8d14"
+down_revision = "e1b6c0d2a4f7"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(name: str) -> bool:
+    bind = op.get_bind()
+    return bind.execute(
+        sa.text("SELECT to_regclass(:n) IS NOT NULL OR to_regclass('public.' || :n) IS NOT NULL"),
+        {"n": name},
+    ).scalar()
+
+
+def upgrade() -> None:
+    # reddit_pairs used to be created by hand, outside alembic. Create it here
+    # if missing (same shape the pair builders upsert into) so the sync
+    # trigger below is always installed and the mirror can't silently stay
+    # empty once pairs start arriving.
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reddit_pairs (
+            tmdb_id_a   INTEGER          NOT NULL,
+            tmdb_id_b   INTEGER          NOT NULL,
+            pair_count  INTEGER          NOT NULL DEFAULT 0,
+            pair_weight DOUBLE PRECISION NOT NULL DEFAULT 0,
+            subreddits  TEXT[]           NOT NULL DEFAULT '{}',
+            updated_at  TIMESTAMPTZ      NOT NULL DEFAULT now(),
+            PRIMARY KEY (tmdb_id_a, tmdb_id_b)
+        );
+        """
+    )
+
+    # reddit_pairs stores each pair once (tmdb_id_a < tmdb_id_b); this mirror
+    # holds both orientations so "neighbours of X" is one index range scan
+    # instead of an a-side UNION ALL b-side (or an OR) over reddit_pairs.
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reddit_pairs_sym (
+            tmdb_id     INTEGER          NOT NULL,
+            other_id    INTEGER          NOT NULL,
+            pair_weight DOUBLE PRECISION NOT NULL DEFAULT 0,
+            pair_count  INTEGER          NOT NULL DEFAULT 0,
+            PRIMARY KEY (tmdb_id, other_id)
+        );
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_reddit_pairs_sym_tmdb_cover "
+        "ON reddit_pairs_sym (tmdb_id) INCLUDE (other_id, pair_weight, pair_count);"
+    )
+
+    # Kept in sync row-by-row with reddit_pairs.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION reddit_pairs_sym_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM reddit_pairs_sym
+                WHERE (tmdb_id, other_id) IN (
+                    (OLD.tmdb_id_a, OLD.tmdb_id_b), (OLD.tmdb_id_b, OLD.tmdb_id_a)
+                );
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO reddit_pairs_sym (tmdb_id, other_id, pair_weight, pair_count)
+                VALUES
+                    (NEW.tmdb_id_a, NEW.tmdb_id_b, COALESCE(NEW.pair_weight, 0), COALESCE(NEW.pair_count, 0)),
+                    (NEW.tmdb_id_b, NEW.tmdb_id_a, COALESCE(NEW.pair_weight, 0), COALESCE(NEW.pair_count, 0))
+                ON CONFLICT (tmdb_id, other_id) DO UPDATE
+                    SET pair_weight = EXCLUDED.pair_weight,
+                        pair_count  = EXCLUDED.pair_count;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute("DROP TRIGGER IF EXISTS trg_reddit_pairs_sym_sync ON reddit_pairs;")
+    op.execute(
+        """
+        CREATE TRIGGER trg_reddit_pairs_sym_sync
+        AFTER INSERT OR UPDATE OR DELETE ON reddit_pairs
+        FOR EACH ROW EXECUTE FUNCTION reddit_pairs_sym_sync();
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO reddit_pairs_sym (tmdb_id, other_id, pair_weight, pair_count)
+        SELECT tmdb_id_a, tmdb_id_b, COALESCE(pair_weight, 0), COALESCE(pair_count, 0) FROM reddit_pairs
+        UNION ALL
+        SELECT tmdb_id_b, tmdb_id_a, COALESCE(pair_weight, 0), COALESCE(pair_count, 0) FROM reddit_pairs
+        ON CONFLICT (tmdb_id, other_id) DO NOTHING;
+        """
+    )
+
+
+def downgrade() -> None:
+    # reddit_pairs itself is left in place: it may predate this revision.
+    if _table_exists("reddit_pairs"):
+        op.execute("DROP TRIGGER IF EXISTS trg_reddit_pairs_sym_sync ON reddit_pairs;")
+    op.execute("DROP FUNCTION IF EXISTS reddit_pairs_sym_sync();")
+    op.execute("DROP TABLE IF EXISTS reddit_pairs_sym;")
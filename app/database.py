@@ -23,8 +23,39 @@ SYNC_DSN = os.getenv(
 
 Base = declarative_base()
 
+# Pool sizing: the defaults (5 + 10 overflow) queue up under ~100 concurrent
+# requests; recycle before server-side idle timeouts drop connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# Per-connection LRUs of prepared statements, so a hot query is parsed /
+# planned once per connection instead of on every call. The one setting
+# sizes both SQLAlchemy's asyncpg adapter cache (prepared_statement_cache_size)
+# and asyncpg's own statement cache (statement_cache_size): set it to 0
+# behind a transaction-mode pgbouncer, which can't track prepared statements
+# and needs both off.
+DB_STMT_CACHE_SIZE = int(os.getenv("DB_STMT_CACHE_SIZE", "256"))
+# SQLAlchemy's compiled-SQL LRU (default 500); the module-level text()
+# constants each take one slot.
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+
 # --- Async engine/session (for async endpoints)
-async_engine = create_async_engine(ASYNC_DSN, future=True, pool_pre_ping=True)
+async_engine = create_async_engine(
+    ASYNC_DSN,
+    future=True,
+    pool_pre_ping=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    query_cache_size=DB_QUERY_CACHE_SIZE,
+    connect_args={
+        "prepared_statement_cache_size": DB_STMT_CACHE_SIZE,
+        "statement_cache_size": DB_STMT_CACHE_SIZE,
+    },
+)
 AsyncSessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
     bind=async_engine, expire_on_commit=False, autoflush=False, autocommit=False
 )
@@ -48,6 +48,16 @@ engine = create_async_engine(
     ASYNC_DATABASE_URL,
     pool_pre_ping=True,
     future=True,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    # prepared-statement / compiled-SQL caches, see app/database.py
+    query_cache_size=int(os.getenv("DB_QUERY_CACHE_SIZE", "1200")),
+    connect_args={
+        "prepared_statement_cache_size": int(os.getenv("DB_STMT_CACHE_SIZE", "256")),
+        "statement_cache_size": int(os.getenv("DB_STMT_CACHE_SIZE", "256")),
+    },
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -57,3 +57,30 @@ async def set_json(key: str, value: Any, ttl: int = 3600) -> None:
         # last resort: store str(value)
         data = str(value)
     await c.set(key, data, ex=ttl)
+
+
+async def get_raw(key: str) -> Optional[str]:
+    """Return the stored string as-is (no JSON decode)."""
+    c = client()
+    return await c.get(key)
+
+
+async def set_raw(key: str, value: str | bytes, ttl: int = 3600) -> None:
+    c = client()
+    await c.set(key, value, ex=ttl)
+
+
+async def delete(*keys: str) -> None:
+    if not keys:
+        return
+    c = client()
+    await c.delete(*keys)
+
+
+async def delete_prefix(prefix: str) -> int:
+    """Delete every key starting with ``prefix`` (SCAN, never KEYS). Returns count."""
+    c = client()
+    keys = [k async for k in c.scan_iter(match=f"{prefix}*", count=500)]
+    if not keys:
+        return 0
+    return await c.delete(*keys)
@@ -0,0 +1,23 @@
+# app/infra/cache_guard.py
+from __future__ import annotations
+
+import os
+from types import ModuleType
+from typing import Optional
+
+
+def have_cache() -> Optional[ModuleType]:
+    """
+    app.infra.cache if Redis is usable, else None.
+
+    Never crashes: the module may fail to import (redis not installed), and
+    without an initialised client or REDIS_URL every call on it would raise,
+    so callers skip the cache instead of logging a failure per request.
+    """
+    try:
+        from app.infra import cache
+    except Exception:
+        return None
+    if not (cache.is_ready() or os.getenv("REDIS_URL")):
+        return None
+    return cache
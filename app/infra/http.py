@@ -0,0 +1,180 @@
+# app/infra/http.py
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Optional
+
+import httpx
+import orjson
+
+from app.infra.cache_guard import have_cache
+
+_tmdb: Optional[httpx.AsyncClient] = None
+
+# One HTTP/2 connection multiplexes many streams, so a handful is plenty.
+TMDB_LIMITS = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+TMDB_TIMEOUT = httpx.Timeout(10.0)
+
+# Validators (+ the body they describe) outlive any caller's fresh TTL: once
+# that copy expires the next GET is conditional, and an unchanged resource
+# costs a bodyless 304 instead of a full download.
+VALIDATOR_TTL_SECONDS = 7 * 24 * 3600
+
+# Rate limits / gateway hiccups are retried a couple of times (honouring
+# Retry-After up to a cap — longer waits aren't worth it on a request path).
+TMDB_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+TMDB_MAX_RETRIES = 2
+TMDB_RETRY_BASE_SECONDS = 0.25
+TMDB_RETRY_AFTER_CAP_SECONDS = 2.0
+
+# After this many consecutive failures TMDb calls fail fast for a while
+# instead of each one sitting out the full timeout.
+TMDB_BREAKER_FAIL_MAX = 20
+TMDB_BREAKER_RESET_SECONDS = 30.0
+
+
+class TMDbUnavailable(httpx.TransportError):
+    """Raised without touching the network while the TMDb breaker is open."""
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    retry_after = response.headers.get("retry-after", "")
+    if retry_after.isdigit():
+        return min(float(retry_after), TMDB_RETRY_AFTER_CAP_SECONDS)
+    return min(TMDB_RETRY_BASE_SECONDS * (2 ** attempt), TMDB_RETRY_AFTER_CAP_SECONDS)
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a transport with retries for TMDB_RETRY_STATUSES on idempotent
+    requests and a consecutive-failure circuit breaker. Once open, requests
+    raise TMDbUnavailable until ``reset_seconds`` pass; the next failure after
+    that re-opens it straight away, a success closes it.
+    """
+
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport,
+        *,
+        max_retries: int = TMDB_MAX_RETRIES,
+        fail_max: int = TMDB_BREAKER_FAIL_MAX,
+        reset_seconds: float = TMDB_BREAKER_RESET_SECONDS,
+    ) -> None:
+        self._inner = inner
+        self.max_retries = max_retries
+        self.fail_max = fail_max
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._open_until = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self._open_until > time.monotonic()
+
+    def _record(self, ok: bool) -> None:
+        if ok:
+            self._failures = 0
+            return
+        self._failures += 1
+        if self._failures >= self.fail_max:
+            self._open_until = time.monotonic() + self.reset_seconds
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.is_open:
+            raise TMDbUnavailable("TMDb circuit breaker open", request=request)
+
+        retries = self.max_retries if request.method in ("GET", "HEAD") else 0
+        attempt = 0
+        while True:
+            try:
+                response = await self._inner.handle_async_request(request)
+            except httpx.TransportError:
+                self._record(False)
+                raise
+            if response.status_code not in TMDB_RETRY_STATUSES or attempt >= retries:
+                break
+            delay = _retry_delay(response, attempt)
+            await response.aclose()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        self._record(response.status_code not in TMDB_RETRY_STATUSES)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def tmdb_client() -> httpx.AsyncClient:
+    """
+    Shared TMDb client. Created lazily on first use so importing a router
+    never opens sockets; HTTP/2 is negotiated via ALPN. Connect errors are
+    retried by the pool, 429/5xx and the breaker by ResilientTransport.
+    """
+    global _tmdb
+    if _tmdb is None or _tmdb.is_closed:
+        _tmdb = httpx.AsyncClient(
+            transport=ResilientTransport(
+                httpx.AsyncHTTPTransport(http2=True, limits=TMDB_LIMITS, retries=2)
+            ),
+            timeout=TMDB_TIMEOUT,
+        )
+    return _tmdb
+
+
+async def aclose() -> None:
+    global _tmdb
+    if _tmdb is not None:
+        await _tmdb.aclose()
+        _tmdb = None
+
+
+async def get_json_revalidated(
+    url: str,
+    *,
+    cache_key: str,
+    params: Optional[dict] = None,
+) -> Optional[Any]:
+    """
+    GET ``url`` on the TMDb client and return the decoded JSON body, or None
+    on a non-200. The last 200 body and its ETag / Last-Modified are kept in
+    Redis under ``cache_key`` (which must not contain secrets such as the
+    api key) and sent back as If-None-Match / If-Modified-Since; a 304
+    returns the stored body. Transport errors propagate.
+    """
+    cache = have_cache()
+    stored = None
+    if cache is not None:
+        try:
+            raw = await cache.get_raw(cache_key)
+            stored = orjson.loads(raw) if raw else None
+        except Exception:
+            stored = None
+
+    headers = {}
+    if stored:
+        if stored.get("etag"):
+            headers["If-None-Match"] = stored["etag"]
+        if stored.get("last_modified"):
+            headers["If-Modified-Since"] = stored["last_modified"]
+
+    r = await tmdb_client().get(url, params=params, headers=headers)
+    if r.status_code == 304 and stored:
+        return stored.get("body")
+    if r.status_code != 200:
+        return None
+
+    body = orjson.loads(r.content)
+    etag = r.headers.get("etag")
+    last_modified = r.headers.get("last-modified")
+    if cache is not None and (etag or last_modified):
+        try:
+            await cache.set_raw(
+                cache_key,
+                orjson.dumps({"etag": etag, "last_modified": last_modified, "body": body}),
+                ttl=VALIDATOR_TTL_SECONDS,
+            )
+        except Exception:
+            pass
+    return body
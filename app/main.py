@@ -1,6 +1,7 @@
 # app/main.py  — full, safe include of all routers under /api
 
 from __future__ import annotations
+import asyncio
 import logging
 from typing import List, Dict, Any
 
@@ -97,6 +98,26 @@ _include("app.routes.admin", name_hint="admin")
 # Attach the /api router once (prevents /api/api duplication)
 app.include_router(api)
 
+
+_background_tasks: List[asyncio.Task] = []
+
+
+@app.on_event("startup")
+async def _start_discover_refresher() -> None:
+    try:
+        from app.routes.discover import run_refresher_forever
+        _background_tasks.append(asyncio.create_task(run_refresher_forever()))
+    except Exception as e:
+        log.warning("Discover refresher not started: %s", e)
+
+
+@app.on_event("shutdown")
+async def _close_http_clients() -> None:
+    for task in _background_tasks:
+        task.cancel()
+    from app.infra import http
+    await http.aclose()
+
 # ---- (Optional) startup tasks kept minimal here; your ensure_schema / reddit boot can live elsewhere ----
 # If you need them, re-add with robust error handling, e.g.:
 # @app.on_event("startup")
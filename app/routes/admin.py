@@ -22,6 +22,7 @@ from app.models_auth import AuthUser
 # Use the SAME sync session as the ingestor to avoid cross-engine mismatches
 from app.database import SessionLocal  # sync session used by ingest
 from app.db_models import RedditPost
+from app.services.ttl_cache import cache_stats
 
 try:
     from app.services.reddit_ingest import ingest_once as _ingest
@@ -229,3 +230,9 @@ async def admin_stats(
         "users_with_favorites": int(users_with_favorites or 0),
         "users_with_ratings": int(users_with_ratings or 0),
     }
+
+
+@router.get("/cache-stats", summary="Hit ratios of the in-process TMDb caches")
+async def admin_cache_stats(_admin: Any = Depends(require_admin)) -> Dict[str, Any]:
+    # Per worker process: each worker keeps its own in-process layer.
+    return {"caches": cache_stats()}
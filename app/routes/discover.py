@@ -3,14 +3,27 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import logging
 import os
 import random
 import time
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
 
 import httpx
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from sqlalchemy import text
+
+from app.database import AsyncSessionLocal
+from app.infra.cache_guard import have_cache
+from app.infra.http import tmdb_client
+
+log = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/discover", tags=["discover"])
 
@@ -53,6 +66,11 @@ class DiscoverResponse(BaseModel):
     family: List[DiscoverShow]
 
 
+# Caps concurrent HTTP/2 streams on the shared client; TMDb resets streams
+# (RST_STREAM) when a single connection carries too many at once.
+_TMDB_STREAMS = asyncio.Semaphore(16)
+
+
 async def _tmdb_get(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     if not TMDB_API_KEY:
         raise HTTPException(status_code=500, detail="TMDB_API_KEY is not configured")
@@ -61,24 +79,69 @@ async def _tmdb_get(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[
     q.setdefault("language", "en-GB")
     q["api_key"] = TMDB_API_KEY
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        resp = await client.get(f"{TMDB_BASE_URL}{path}", params=q)
+    async with _TMDB_STREAMS:
+        resp = await tmdb_client().get(f"{TMDB_BASE_URL}{path}", params=q)
+
+    if resp.status_code == 404:
+        return {}
+
+    try:
+        resp.raise_for_status()
+    except httpx.HTTPStatusError as exc:
+        raise HTTPException(
+            status_code=502, detail=f"TMDb error: {exc.response.text}"
+        ) from exc
+
+    return orjson.loads(resp.content) if resp.content else {}
 
-        if resp.status_code == 404:
-            return {}
 
+# TMDb list feeds update at most hourly; 15 minutes keeps sections fresh enough
+TMDB_CACHE_TTL_SECONDS = 900
+
+
+def _tmdb_cache_key(path: str, params: Optional[Dict[str, Any]]) -> str:
+    qs = urlencode(sorted((params or {}).items()))
+    return "tmdb:" + hashlib.blake2b(f"{path}?{qs}".encode(), digest_size=16).hexdigest()
+
+
+async def _cached_tmdb_get(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    *,
+    ttl: int = TMDB_CACHE_TTL_SECONDS,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    _tmdb_get behind a per-URL Redis layer, so a partial discover miss only
+    re-fetches the sections whose TMDb responses actually expired.
+    ``refresh`` skips the read (always asks TMDb) but still stores the result.
+    """
+    cache = have_cache()
+    key = _tmdb_cache_key(path, params)
+
+    if cache is not None and not refresh:
         try:
-            resp.raise_for_status()
-        except httpx.HTTPStatusError as exc:
-            raise HTTPException(
-                status_code=502, detail=f"TMDb error: {exc.response.text}"
-            ) from exc
+            cached = await cache.get_raw(key)
+            if cached:
+                return orjson.loads(cached)
+        except Exception:
+            # cache not ready / network hiccup → just fall through to TMDb
+            pass
 
-        return resp.json()
+    data = await _tmdb_get(path, params)
+
+    if cache is not None and data:
+        try:
+            await cache.set_raw(key, orjson.dumps(data), ttl=ttl)
+        except Exception:
+            pass
+
+    return data
 
 
 def _map_tmdb_show(item: Dict[str, Any], *, reason: Optional[str] = None) -> DiscoverShow:
-    return DiscoverShow(
+    # TMDb payloads are trusted here: skip per-field validation on the hot map loop
+    return DiscoverShow.model_construct(
         tmdb_id=item.get("id"),
         title=item.get("name") or item.get("original_name") or "",
         name=item.get("name") or item.get("original_name"),
@@ -181,12 +244,29 @@ FEATURED_TITLES: list[str] = [
 FEATURED_MAX_RESULTS = 24
 
 
+# Per-leaf budget on the cold path: one hung TMDb call costs at most this,
+# instead of holding back the whole discover rebuild.
+TMDB_LEAF_TIMEOUT_SECONDS = 3.0
+
+
+async def _with_timeout(coro, t: float = TMDB_LEAF_TIMEOUT_SECONDS, *, label: str = ""):
+    """Await coro with a deadline; None on timeout or error."""
+    try:
+        return await asyncio.wait_for(coro, t)
+    except asyncio.TimeoutError:
+        log.warning("[discover] %s timed out after %.1fs", label or "TMDb call", t)
+    except Exception as e:
+        log.warning("[discover] %s failed: %s", label or "TMDb call", e)
+    return None
+
+
 async def _fetch_featured() -> List[DiscoverShow]:
     """
     Fetch a curated slice of FEATURED_TITLES.
 
     - Randomly samples up to FEATURED_MAX_RESULTS titles from the big list
-    - Fetches them from TMDb IN PARALLEL (asyncio.gather)
+    - Fetches them from TMDb IN PARALLEL (asyncio.gather), each under
+      TMDB_LEAF_TIMEOUT_SECONDS
     """
     if not FEATURED_TITLES:
         return []
@@ -197,18 +277,17 @@ async def _fetch_featured() -> List[DiscoverShow]:
         titles = random.sample(titles, FEATURED_MAX_RESULTS)
 
     tasks = [
-        _tmdb_get("/search/tv", {"query": title})
+        _cached_tmdb_get("/search/tv", {"query": title})
         for title in titles
     ]
 
     results: List[DiscoverShow] = []
-    # gather with return_exceptions so one failure doesn't blow up the whole list
-    data_list = await asyncio.gather(*tasks, return_exceptions=True)
+    # each search gets its own deadline, so one slow/failed title is just dropped
+    data_list = await asyncio.gather(
+        *(_with_timeout(t, label=f"featured search {title!r}") for t, title in zip(tasks, titles))
+    )
 
-    for title, data in zip(titles, data_list):
-        if isinstance(data, Exception):
-            # you could log this if you have a logger
-            continue
+    for data in data_list:
         items = (data or {}).get("results") or []
         if items:
             results.append(_map_tmdb_show(items[0], reason="Curated highlight"))
@@ -216,7 +295,7 @@ async def _fetch_featured() -> List[DiscoverShow]:
     return results
 
 
-async def _fetch_top_decade() -> List[DiscoverShow]:
+async def _fetch_top_decade(*, refresh: bool = False) -> List[DiscoverShow]:
     params = {
         "sort_by": "vote_average.desc",
         "vote_count.gte": 300,
@@ -224,13 +303,13 @@ async def _fetch_top_decade() -> List[DiscoverShow]:
         "include_adult": "false",
         "page": 1,
     }
-    data = await _tmdb_get("/discover/tv", params)
+    data = await _cached_tmdb_get("/discover/tv", params, refresh=refresh)
     items = data.get("results") or []
     return [_map_tmdb_show(i, reason="Top rated 2015–2025") for i in items]
 
 
 async def _fetch_trending() -> List[DiscoverShow]:
-    data = await _tmdb_get("/trending/tv/week")
+    data = await _cached_tmdb_get("/trending/tv/week")
     items = data.get("results") or []
     filtered = [
         i
@@ -252,28 +331,184 @@ GENRES = {
     "family": 10751,
 }
 
-
-async def _fetch_by_genre(genre_id: int, label: str) -> List[DiscoverShow]:
-    params = {
+# (response field, TMDb genre id, label) — in DiscoverResponse field order
+GENRE_SPECS: tuple[tuple[str, int, str], ...] = (
+    ("drama", GENRES["drama"], "Drama"),
+    ("crime", GENRES["crime"], "Crime"),
+    ("documentary", GENRES["documentary"], "Documentary"),
+    ("scifi_fantasy", GENRES["scifi_fantasy"], "Sci-Fi & Fantasy"),
+    ("thriller", GENRES["thriller"], "Thriller"),
+    ("comedy", GENRES["comedy"], "Comedy"),
+    ("action_adventure", GENRES["action_adventure"], "Action & Adventure"),
+    ("animation", GENRES["animation"], "Animation"),
+    ("family", GENRES["family"], "Family"),
+)
+
+# Fixed /discover/tv params shared by every genre row (read-only)
+_GENRE_PARAMS_BASE = MappingProxyType(
+    {
         "sort_by": "vote_average.desc",
         "vote_count.gte": 200,
         "first_air_date.gte": "2015-01-01",
         "include_adult": "false",
-        "with_genres": str(genre_id),
         "page": 1,
     }
-    data = await _tmdb_get("/discover/tv", params)
+)
+
+# Genre rows change slowly, so they outlive the whole-payload cache
+GENRE_CACHE_TTL_SECONDS = 3600
+
+
+async def _fetch_by_genre(genre_id: int, label: str, *, refresh: bool = False) -> List[DiscoverShow]:
+    params = {**_GENRE_PARAMS_BASE, "with_genres": str(genre_id)}
+    data = await _cached_tmdb_get(
+        "/discover/tv", params, ttl=GENRE_CACHE_TTL_SECONDS, refresh=refresh
+    )
     items = data.get("results") or []
     return [_map_tmdb_show(i, reason=f"Top {label}") for i in items]
 
 
-@router.get("", response_model=DiscoverResponse)
+# ---- materialized sections (refreshed off the request path) ----
+# top_decade and the genre rows are deterministic TMDb queries, so a
+# background task snapshots them into Postgres and get_discover reads
+# the snapshot instead of fanning out to TMDb.
+
+DISCOVER_REFRESH_MINUTES = int(os.getenv("DISCOVER_REFRESH_MINUTES", "30"))
+
+# Every worker / replica runs the refresher; a transaction-scoped advisory
+# lock lets one of them rewrite the snapshot at a time, and a snapshot
+# younger than half a period is left alone, so N workers still refresh
+# about once per period.
+_REFRESH_LOCK_KEY = 0x64697363  # "disc"
+
+_SQL_TRY_REFRESH_LOCK = text("SELECT pg_try_advisory_xact_lock(:key)")
+
+_SQL_SNAPSHOT_IS_FRESH = text(
+    """
+    SELECT COALESCE(max(refreshed_at) > now() - make_interval(secs => :secs), false)
+    FROM discover_section_rows
+    """
+)
+
+_SQL_SECTION_ROWS = text(
+    """
+    SELECT section, payload::text AS payload
+    FROM discover_section_rows
+    ORDER BY section, rank
+    """
+)
+
+_SQL_DELETE_SECTION = text("DELETE FROM discover_section_rows WHERE section = :section")
+
+_SQL_INSERT_ROW = text(
+    """
+    INSERT INTO discover_section_rows (section, rank, tmdb_id, payload, refreshed_at)
+    VALUES (:section, :rank, :tmdb_id, CAST(:payload AS JSONB), now())
+    """
+)
+
+
+async def _load_materialized_sections() -> Dict[str, List[DiscoverShow]]:
+    """Section name -> rows from the last refresh; empty if never refreshed."""
+    try:
+        async with AsyncSessionLocal() as db:
+            res = await db.execute(_SQL_SECTION_ROWS)
+            rows = res.all()
+    except Exception as e:
+        log.warning("[discover] materialized read failed, using TMDb: %s", e)
+        return {}
+
+    out: Dict[str, List[DiscoverShow]] = {}
+    for section, payload in rows:
+        out.setdefault(section, []).append(DiscoverShow.model_construct(**orjson.loads(payload)))
+    return out
+
+
+async def refresh_materialized_sections() -> None:
+    """
+    Fetch top_decade + genre rows from TMDb and replace their snapshots,
+    unless another worker holds the refresh lock or refreshed recently.
+
+    Only this worker's in-process payload is dropped; other workers pick up
+    the new snapshot when their own copy expires (DISCOVER_CACHE_TTL_SECONDS)
+    or on their next refresher tick, whichever comes first.
+    """
+    try:
+        await _refresh_materialized_sections()
+    finally:
+        _DISCOVER_CACHE.pop(_DISCOVER_CACHE_KEY, None)
+
+
+async def _refresh_materialized_sections() -> None:
+    fields = ["top_decade", *(field for field, _, _ in GENRE_SPECS)]
+
+    async with AsyncSessionLocal() as db:
+        locked = (await db.execute(_SQL_TRY_REFRESH_LOCK, {"key": _REFRESH_LOCK_KEY})).scalar()
+        if not locked:
+            log.info("[discover] refresh skipped: another worker is refreshing")
+            return
+        fresh = (
+            await db.execute(_SQL_SNAPSHOT_IS_FRESH, {"secs": DISCOVER_REFRESH_MINUTES * 30.0})
+        ).scalar()
+        if fresh:
+            return
+
+        # bypass the per-URL Redis layer: a snapshot of cached rows could be
+        # up to GENRE_CACHE_TTL_SECONDS older than the refresh itself
+        results = await asyncio.gather(
+            _fetch_top_decade(refresh=True),
+            *(
+                _fetch_by_genre(genre_id, label, refresh=True)
+                for _, genre_id, label in GENRE_SPECS
+            ),
+            return_exceptions=True,
+        )
+
+        for section, shows in zip(fields, results):
+            # keep the previous snapshot if TMDb failed or returned nothing
+            if isinstance(shows, BaseException) or not shows:
+                log.warning("[discover] refresh skipped section=%s: %r", section, shows)
+                continue
+            await db.execute(_SQL_DELETE_SECTION, {"section": section})
+            await db.execute(
+                _SQL_INSERT_ROW,
+                [
+                    {
+                        "section": section,
+                        "rank": rank,
+                        "tmdb_id": s.tmdb_id,
+                        "payload": orjson.dumps(s.model_dump()).decode(),
+                    }
+                    for rank, s in enumerate(shows)
+                ],
+            )
+        # commit also releases the advisory lock
+        await db.commit()
+
+
+async def run_refresher_forever() -> None:
+    period = max(1, DISCOVER_REFRESH_MINUTES)
+    log.info("[discover] section refresher started. period=%s min", period)
+    while True:
+        try:
+            await refresh_materialized_sections()
+        except Exception as e:
+            log.warning("[discover] section refresh failed: %s", e)
+        try:
+            await asyncio.sleep(period * 60)
+        except asyncio.CancelledError:
+            break
+    log.info("[discover] section refresher stopped.")
+
+
+@router.get("", response_model=DiscoverResponse, response_class=ORJSONResponse)
 async def get_discover() -> DiscoverResponse:
     """
     Main Discover endpoint.
 
     - Returns cached payload if it's still fresh (fast path)
-    - Otherwise fetches all sections from TMDb, then caches the result
+    - Otherwise reads the materialized sections from Postgres, fetches the
+      live ones (featured, trending) from TMDb, then caches the result
     """
 
     # ---- FAST PATH: return cached if fresh ----
@@ -285,50 +520,43 @@ async def get_discover() -> DiscoverResponse:
             return payload
 
     # ---- SLOW PATH: build the payload once ----
-    (
-        featured,
-        top_decade,
-        trending,
-        drama,
-        crime,
-        documentary,
-        scifi_fantasy,
-        thriller,
-        comedy,
-        action_adventure,
-        animation,
-        family,
-    ) = await asyncio.gather(
+    # featured is a random sample and trending moves daily, so both stay live;
+    # everything else comes from the materialized snapshot.
+    # Each live section is bounded by the leaf timeout; a section that misses
+    # it ships empty rather than delaying the rest of the payload.
+    featured, trending, stored = await asyncio.gather(
         _fetch_featured(),
-        _fetch_top_decade(),
-        _fetch_trending(),
-        _fetch_by_genre(GENRES["drama"], "Drama"),
-        _fetch_by_genre(GENRES["crime"], "Crime"),
-        _fetch_by_genre(GENRES["documentary"], "Documentary"),
-        _fetch_by_genre(GENRES["scifi_fantasy"], "Sci-Fi & Fantasy"),
-        _fetch_by_genre(GENRES["thriller"], "Thriller"),
-        _fetch_by_genre(GENRES["comedy"], "Comedy"),
-        _fetch_by_genre(GENRES["action_adventure"], "Action & Adventure"),
-        _fetch_by_genre(GENRES["animation"], "Animation"),
-        _fetch_by_genre(GENRES["family"], "Family"),
+        _with_timeout(_fetch_trending(), label="trending"),
+        _load_materialized_sections(),
     )
+    degraded = trending is None
+    trending = trending or []
+
+    # first boot / refresher not run yet → fetch the missing sections directly
+    missing = [f for f in ("top_decade", *(field for field, _, _ in GENRE_SPECS)) if not stored.get(f)]
+    if missing:
+        specs = {field: (genre_id, label) for field, genre_id, label in GENRE_SPECS}
+        fetched = await asyncio.gather(
+            *(
+                _with_timeout(
+                    _fetch_top_decade() if f == "top_decade" else _fetch_by_genre(*specs[f]),
+                    label=f,
+                )
+                for f in missing
+            )
+        )
+        degraded = degraded or any(rows is None for rows in fetched)
+        stored.update((f, rows or []) for f, rows in zip(missing, fetched))
 
     payload = DiscoverResponse(
         featured=featured,
-        top_decade=top_decade,
         trending=trending,
-        drama=drama,
-        crime=crime,
-        documentary=documentary,
-        scifi_fantasy=scifi_fantasy,
-        thriller=thriller,
-        comedy=comedy,
-        action_adventure=action_adventure,
-        animation=animation,
-        family=family,
+        top_decade=stored["top_decade"],
+        **{field: stored[field] for field, _, _ in GENRE_SPECS},
     )
 
-    # store in cache
-    _DISCOVER_CACHE[_DISCOVER_CACHE_KEY] = (now, payload)
+    # store in cache — unless a section timed out, so the next call retries it
+    if not degraded:
+        _DISCOVER_CACHE[_DISCOVER_CACHE_KEY] = (now, payload)
 
     return payload
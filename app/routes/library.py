@@ -3,7 +3,9 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+import orjson
 from fastapi import APIRouter, Depends, Query, Path, Body
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, Field
 from sqlalchemy import select, and_, delete, distinct
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,6 +14,7 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert  # PG UPSERT
 from app.database import get_async_db
 from app.db_models import UserRating, FavoriteTmdb, NotInterested, Show
 from app.security import require_user
+from app.services import user_cache
 
 router = APIRouter(prefix="/library", tags=["library"])
 
@@ -69,7 +72,7 @@ class FavoriteBody(BaseModel):
 # Ratings (path style preferred)
 # ──────────────────────────────────────────────────────────────────────
 
-@router.get("/{user_id}/ratings", response_model=RatingsResponse)
+@router.get("/{user_id}/ratings", response_model=RatingsResponse, response_class=ORJSONResponse)
 async def list_ratings_for_user(
     user_id: int = Path(ge=1),
     _: Any = Depends(require_user),
@@ -121,6 +124,7 @@ async def upsert_rating_path(
         ))
 
     await db.commit()
+    await user_cache.invalidate_recs(user_id)
     return {"ok": True}
 
 # ──────────────────────────────────────────────────────────────────────
@@ -147,18 +151,24 @@ async def upsert_rating_body(
 # Favorites (user-scoped, path style; idempotent + distinct, now with tmdb_id)
 # ──────────────────────────────────────────────────────────────────────
 
-@router.get("/{user_id}/favorites")
+@router.get("/{user_id}/favorites", response_class=ORJSONResponse)
 async def list_favorites_for_user(
     user_id: int = Path(ge=1),
     _: Any = Depends(require_user),
     db: AsyncSession = Depends(get_async_db),
 ) -> List[dict]:
+    # Warm path: the whole response body is cached per user (dropped on favourite writes)
+    cached = await user_cache.get_favorites_payload(user_id)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+
     # Unique tmdb ids first (avoid join dupes)
     fav_ids = (await db.execute(
         select(distinct(FavoriteTmdb.tmdb_id)).where(FavoriteTmdb.user_id == user_id)
     )).scalars().all()
 
     if not fav_ids:
+        await user_cache.set_favorites_payload(user_id, b"[]")
         return []
 
     # Try to enrich using Show.external_id (string)
@@ -187,7 +197,10 @@ async def list_favorites_for_user(
                 "poster_url": None,
                 "external_id": int(tmdb_id),
             })
-    return out
+
+    body = orjson.dumps(out)
+    await user_cache.set_favorites_payload(user_id, body)
+    return Response(body, media_type="application/json")
 
 @router.post("/{user_id}/favorites/{tmdb_id}")
 async def add_favorite_path(
@@ -205,6 +218,8 @@ async def add_favorite_path(
     )
     await db.execute(ins)
     await db.commit()
+    await user_cache.invalidate_favorites(user_id)
+    await user_cache.invalidate_recs(user_id)
     return {"ok": True}
 
 @router.delete("/{user_id}/favorites/{tmdb_id}")
@@ -220,6 +235,8 @@ async def remove_favorite_path(
         )
     )
     await db.commit()
+    await user_cache.invalidate_favorites(user_id)
+    await user_cache.invalidate_recs(user_id)
     return {"ok": True}
 
 # ──────────────────────────────────────────────────────────────────────
@@ -233,14 +250,16 @@ async def hide_show_path(
     _: Any = Depends(require_user),
     db: AsyncSession = Depends(get_async_db),
 ) -> dict:
-    exists = (await db.execute(
-        select(NotInterested).where(
-            and_(NotInterested.user_id == user_id, NotInterested.tmdb_id == tmdb_id)
-        )
-    )).scalar_one_or_none()
-    if not exists:
-        db.add(NotInterested(user_id=user_id, tmdb_id=tmdb_id))
-        await db.commit()
+    ins = pg_insert(NotInterested.__table__).values(
+        user_id=user_id,
+        tmdb_id=tmdb_id,
+    ).on_conflict_do_nothing(
+        index_elements=["user_id", "tmdb_id"]
+    )
+    await db.execute(ins)
+    await db.commit()
+    await user_cache.invalidate_not_interested(user_id)
+    await user_cache.invalidate_recs(user_id)
     return {"ok": True}
 
 @router.get("/{user_id}/not_interested")
@@ -5,11 +5,13 @@ from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, Path
 from pydantic import BaseModel
 from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_db
 from app.security import require_user, require_user_match
 from app.db_models import NotInterested  # added in step 1
+from app.services import user_cache
 
 router = APIRouter(prefix="/users", tags=["Not Interested"])
 
@@ -34,17 +36,17 @@ async def add_not_interested(
     _: Any = Depends(require_user_match),
     db: AsyncSession = Depends(get_async_db),
 ):
-    # upsert-ish: if exists, do nothing (idempotent)
-    exists = (await db.execute(
-        select(NotInterested).where(
-            NotInterested.user_id == user_id,
-            NotInterested.tmdb_id == tmdb_id
-        )
-    )).scalar_one_or_none()
-    if exists:
-        return {"ok": True}
-    db.add(NotInterested(user_id=user_id, tmdb_id=tmdb_id))
+    # idempotent upsert: ON CONFLICT (user_id, tmdb_id) DO NOTHING
+    ins = pg_insert(NotInterested.__table__).values(
+        user_id=user_id,
+        tmdb_id=tmdb_id,
+    ).on_conflict_do_nothing(
+        index_elements=["user_id", "tmdb_id"]
+    )
+    await db.execute(ins)
     await db.commit()
+    await user_cache.invalidate_not_interested(user_id)
+    await user_cache.invalidate_recs(user_id)
     return {"ok": True}
 
 @router.delete("/{user_id}/not-interested/{tmdb_id}", status_code=204)
@@ -61,3 +63,5 @@ async def remove_not_interested(
         )
     )
     await db.commit()
+    await user_cache.invalidate_not_interested(user_id)
+    await user_cache.invalidate_recs(user_id)
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_async_db
 from app.db_models import UserRating as Rating  # <- alias to match your model name
 from app.security import require_user
+from app.services import user_cache
 
 router = APIRouter(prefix="/ratings", tags=["ratings"])
 
@@ -82,4 +83,5 @@ async def upsert_rating(
         await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+    await user_cache.invalidate_recs(payload.user_id)
     return {"ok": True}
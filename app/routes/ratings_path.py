@@ -2,14 +2,17 @@
 from __future__ import annotations
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Path, Body
+from fastapi import APIRouter, Depends, Path, Body, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import and_, select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # DB/session + models
 from app.database import get_async_db
 from app.db_models import UserRating
+from app.services import user_cache
 
 # Auth dependency (use whatever you already use elsewhere)
 try:
@@ -40,31 +43,50 @@ class RatingOut(BaseModel):
 class RatingsResponse(BaseModel):
     user_id: int
     ratings: List[RatingOut]
+    # id to pass as after_id for the next page; None on the last page
+    next_cursor: Optional[int] = None
 
 # ── Endpoints ─────────────────────────────────────────────────────────
 
-@router.get("/{user_id}/ratings", response_model=RatingsResponse, summary="List ratings for a user (path style)")
+@router.get("/{user_id}/ratings", response_model=RatingsResponse, response_class=ORJSONResponse, summary="List ratings for a user (path style)")
 async def list_ratings_for_user(
     user_id: int = Path(ge=1),
+    after_id: Optional[int] = Query(None, ge=1, description="Cursor: next_cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit for all ratings"),
     _: Any = Depends(require_user_match),
     db: AsyncSession = Depends(get_async_db),
 ):
-    rows = (await db.execute(
-        select(UserRating).where(UserRating.user_id == user_id)
-    )).scalars().all()
+    # Keyset pagination over (user_id, id DESC): each page is an index range scan
+    # Only the response columns: plain tuples, no ORM identity-map tracking
+    q = select(
+        UserRating.id,
+        UserRating.tmdb_id,
+        UserRating.rating,
+        UserRating.title,
+        UserRating.seasons_completed,
+        UserRating.notes,
+    ).where(UserRating.user_id == user_id)
+    if after_id is not None:
+        q = q.where(UserRating.id < after_id)
+    q = q.order_by(UserRating.id.desc())
+    if limit is not None:
+        q = q.limit(limit)
+    rows = (await db.execute(q)).all()
 
     return {
         "user_id": user_id,
         "ratings": [
-            RatingOut(
-                tmdb_id=r.tmdb_id,
-                rating=float(r.rating),
-                title=r.title,
-                seasons_completed=r.seasons_completed,
-                notes=r.notes,
+            # trusted DB rows: skip per-field validation
+            RatingOut.model_construct(
+                tmdb_id=tmdb_id,
+                rating=float(rating),
+                title=title,
+                seasons_completed=seasons_completed,
+                notes=notes,
             )
-            for r in rows
+            for _, tmdb_id, rating, title, seasons_completed, notes in rows
         ],
+        "next_cursor": rows[-1][0] if limit is not None and len(rows) == limit else None,
     }
 
 @router.post("/{user_id}/ratings", summary="Upsert a rating for a user (path style)")
@@ -74,26 +96,28 @@ async def upsert_rating_for_user(
     _: Any = Depends(require_user_match),
     db: AsyncSession = Depends(get_async_db),
 ) -> Dict[str, Any]:
-    existing = (await db.execute(
-        select(UserRating).where(
-            and_(UserRating.user_id == user_id, UserRating.tmdb_id == payload.tmdb_id)
-        )
-    )).scalar_one_or_none()
-
-    if existing:
-        existing.rating = payload.rating
-        existing.title = payload.title
-        existing.seasons_completed = payload.seasons_completed
-        existing.notes = payload.notes
-    else:
-        db.add(UserRating(
-            user_id=user_id,
-            tmdb_id=payload.tmdb_id,
-            rating=payload.rating,
-            title=payload.title,
-            seasons_completed=payload.seasons_completed,
-            notes=payload.notes,
-        ))
+    # Single atomic upsert on uq_rating_user_tmdb: no read-then-write race
+    stmt = pg_insert(UserRating).values(
+        user_id=user_id,
+        tmdb_id=payload.tmdb_id,
+        rating=payload.rating,
+        title=payload.title,
+        seasons_completed=payload.seasons_completed,
+        notes=payload.notes,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserRating.user_id, UserRating.tmdb_id],
+        set_={
+            "rating": stmt.excluded.rating,
+            "title": stmt.excluded.title,
+            "seasons_completed": stmt.excluded.seasons_completed,
+            "notes": stmt.excluded.notes,
+            # column onupdate doesn't fire for ON CONFLICT, set it explicitly
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt)
 
     await db.commit()
+    await user_cache.invalidate_recs(user_id)
     return {"ok": True}
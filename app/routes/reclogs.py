@@ -3,13 +3,15 @@ from __future__ import annotations
 
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import Column, Integer, Boolean, Text, DateTime, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import Base, get_async_db
 from app.security import require_user
+from app.services import user_cache
 
 router = APIRouter(prefix="/recs", tags=["Feedback / Logs"])
 
@@ -73,33 +75,46 @@ async def create_feedback(
     )
     db.add(rec)
     await db.commit()
+    await user_cache.invalidate_recs(user_id)
     return {"ok": True}
 
 
-@router.get("/{user_id}/feedback", response_model=List[FeedbackOut])
+@router.get("/{user_id}/feedback", response_model=List[FeedbackOut], response_class=ORJSONResponse)
 async def list_feedback(
     user_id: int,
+    response: Response,
     limit: int = Query(50, ge=1, le=500),
+    after_id: Optional[int] = Query(None, ge=1, description="Cursor: X-Next-Cursor from the previous page"),
     _: Any = Depends(require_user),  # ✅ same ownership check
     db: AsyncSession = Depends(get_async_db),
 ):
+    # Keyset pagination over (user_id, id DESC); the body stays a plain list
+    # and the next cursor travels in a header so existing clients are unaffected.
+    q = select(
+        RecFeedback.id,
+        RecFeedback.show_id,
+        RecFeedback.useful,
+        RecFeedback.notes,
+        RecFeedback.created_at,
+    ).where(RecFeedback.user_id == user_id)
+    if after_id is not None:
+        q = q.where(RecFeedback.id < after_id)
     rows = (
-        await db.execute(
-            select(RecFeedback)
-            .where(RecFeedback.user_id == user_id)
-            .order_by(RecFeedback.id.desc())
-            .limit(limit)
-        )
-    ).scalars().all()
+        await db.execute(q.order_by(RecFeedback.id.desc()).limit(limit))
+    ).all()
+
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1][0])
 
+    # trusted DB rows: skip per-field validation (FeedbackIn still validates writes)
     return [
-        FeedbackOut(
-            id=r.id,
-            user_id=r.user_id,
-            show_id=r.show_id,
-            useful=r.useful,
-            notes=r.notes,
-            created_at=r.created_at.isoformat() if r.created_at else None,
+        FeedbackOut.model_construct(
+            id=fid,
+            user_id=user_id,
+            show_id=show_id,
+            useful=useful,
+            notes=notes,
+            created_at=created_at.isoformat() if created_at else None,
         )
-        for r in rows
+        for fid, show_id, useful, notes, created_at in rows
     ]
@@ -6,9 +6,15 @@ import os
 from math import inf
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-import httpx
-from fastapi import APIRouter, Query
-from sqlalchemy import select, text
+import numpy as np
+import orjson
+from fastapi import APIRouter, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+
+from app.infra.http import tmdb_client
+from app.services import user_cache
+from app.services.ttl_cache import AsyncTTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +34,6 @@ except Exception as e:  # pragma: no cover
     hybrid_recommendations_for_user_async = None  # type: ignore[assignment]
     _adapter_mmr_diversify = None  # type: ignore[assignment]
 
-# Optional ORM model for favorites if present
-try:
-    from app.db_models import FavoriteTmdb  # type: ignore
-except Exception:
-    FavoriteTmdb = None  # type: ignore
-
 # ========== Types ==========
 JsonItem = Dict[str, Any]
 AnyItem = Union[JsonItem, int, str, Tuple[Any, ...], List[Any]]
@@ -57,6 +57,9 @@ def _coerce_item(it: AnyItem) -> Optional[JsonItem]:
     Accepts dicts, ints / numeric strings, or (id[,score]) tuples.
     """
     if isinstance(it, dict):
+        # common path: already coerced (e.g. by an earlier pass) → no copy
+        if type(it.get("tmdb_id")) is int and type(it.get("score")) is float:
+            return it
         tmdb_id = _to_int_or_none(it.get("tmdb_id"))
         if tmdb_id is None:
             tmdb_id = _to_int_or_none(it.get("id"))
@@ -101,41 +104,105 @@ def _default_sim(a: JsonItem, b: JsonItem) -> float:
         return 0.0
     return len(at & bt) / max(1, len(at | bt))
 
+def _title_jaccard_matrix(items: List[JsonItem]) -> np.ndarray:
+    """All-pairs _default_sim as one matrix: token incidence B, |a∩b| = B·Bᵀ."""
+    vocab: Dict[str, int] = {}
+    token_cols = [
+        {vocab.setdefault(t, len(vocab)) for t in str(it.get("title", "")).lower().split()}
+        for it in items
+    ]
+    B = np.zeros((len(items), max(1, len(vocab))), dtype=np.float64)
+    for i, cols in enumerate(token_cols):
+        if cols:
+            B[i, list(cols)] = 1.0
+    inter = B @ B.T
+    sizes = B.sum(axis=1)
+    union = sizes[:, None] + sizes[None, :] - inter
+    # empty titles have zero intersections, so they score 0.0 like _default_sim
+    return inter / np.maximum(union, 1.0)
+
+
 def _local_mmr_dict_items(
     items: List[JsonItem],
     lambda_: float = 0.3,
     k: Optional[int] = None,
     sim: Optional[Callable[[JsonItem, JsonItem], float]] = None,
 ) -> List[JsonItem]:
+    # items must already be coerced — mmr_diversify does that once up front
     if not items:
         return items
     if k is None:
         k = len(items)
-    sim = sim or _default_sim
 
-    items = _coerce_items(items)
+    if lambda_ >= 1.0:
+        # no diversity term: MMR degenerates to a stable top-k by score
+        return sorted(items, key=lambda it: -float(it.get("score", 0.0)))[:k]
+    if sim is None:
+        return _local_mmr_vectorized(items, lambda_=lambda_, k=k)
+
     scored = [(float(it.get("score", 0.0)), it) for it in items]
     scored.sort(key=lambda x: x[0], reverse=True)
-    selected: List[JsonItem] = []
-    candidates: List[JsonItem] = [it for _, it in scored]
-
-    while candidates and len(selected) < k:
-        best_item: Optional[JsonItem] = None
+    cands: List[JsonItem] = [it for _, it in scored]
+    rels = [rel for rel, _ in scored]
+
+    # Index-mask selection: chosen[i] marks picks, max_sim[i] tracks i's max
+    # similarity to the selected set (updated once per pick, no list rebuilds)
+    n = len(cands)
+    chosen = bytearray(n)
+    max_sim = [-inf] * n
+    sel_idx: List[int] = []
+
+    while len(sel_idx) < min(k, n):
+        best_i = -1
         best_val = -inf
-        for c in candidates:
-            rel = float(c.get("score", 0.0))
-            div_penalty = max((sim(c, s) for s in selected), default=0.0)
-            val = lambda_ * rel - (1.0 - lambda_) * div_penalty
+        for i in range(n):
+            if chosen[i]:
+                continue
+            div_penalty = max_sim[i] if sel_idx else 0.0
+            val = lambda_ * rels[i] - (1.0 - lambda_) * div_penalty
             if val > best_val:
                 best_val = val
-                best_item = c
-        if best_item is None:  # safety
+                best_i = i
+        if best_i < 0:  # safety
             break
-        selected.append(best_item)
-        candidates = [x for x in candidates if x is not best_item]
+        chosen[best_i] = 1
+        sel_idx.append(best_i)
+        for i in range(n):
+            if not chosen[i]:
+                s = sim(cands[i], cands[best_i])
+                if s > max_sim[i]:
+                    max_sim[i] = s
+
+    return [cands[i] for i in sel_idx]
+
+
+def _local_mmr_vectorized(items: List[JsonItem], lambda_: float, k: int) -> List[JsonItem]:
+    """
+    Same selection as the pairwise loop with the default title similarity,
+    but the similarity matrix is built once and the running max-similarity
+    to the selected set is updated incrementally: O(k·n) numpy per call.
+    """
+    rel = np.fromiter((float(it.get("score", 0.0)) for it in items), dtype=np.float64, count=len(items))
+    # stable descending order == list.sort(reverse=True) tie handling
+    order = np.argsort(-rel, kind="stable")
+    items = [items[i] for i in order]
+    rel = rel[order]
+
+    sim = _title_jaccard_matrix(items)
+    max_sim = np.zeros(len(items), dtype=np.float64)
+    alive = np.ones(len(items), dtype=bool)
+    selected: List[JsonItem] = []
+
+    for _ in range(min(k, len(items))):
+        vals = np.where(alive, lambda_ * rel - (1.0 - lambda_) * max_sim, -inf)
+        best = int(np.argmax(vals))  # first max wins, as in the loop
+        selected.append(items[best])
+        alive[best] = False
+        np.maximum(max_sim, sim[best], out=max_sim)
 
     return selected
 
+
 def mmr_lambda_sane(x: float) -> float:
     try:
         xf = float(x)
@@ -169,37 +236,56 @@ def mmr_diversify(
     return _local_mmr_dict_items(items_dict, lambda_=mmr_lambda_sane(lambda_), k=k, sim=sim)
 
 # ========== TMDb enrichment ==========
+# Show metadata is quasi-static: keep it a day, in-process + shared via Redis.
+TMDB_DETAILS_TTL_SECONDS = 24 * 3600
+_TMDB_DETAILS_CACHE = AsyncTTLCache(TMDB_DETAILS_TTL_SECONDS, redis_prefix="recs:tmdb:tv:")
+
+# Process-wide cap on outbound detail calls (TMDb rate-limits per key);
+# only real fetches take a slot, cache hits never wait on it.
+TMDB_MAX_CONCURRENCY = int(os.getenv("TMDB_MAX_CONCURRENCY", "8"))
+_TMDB_SEM = asyncio.Semaphore(TMDB_MAX_CONCURRENCY)
+
+
 async def _tmdb_details(tmdb_id: int) -> Dict[str, Any]:
+    return await _TMDB_DETAILS_CACHE.get_or_fetch(
+        int(tmdb_id),
+        lambda: _fetch_tmdb_details(tmdb_id),
+        # the bare {"tmdb_id": ...} fallback means TMDb failed — don't pin it
+        cacheable=lambda d: bool(d.get("name")),
+    )
+
+
+async def _fetch_tmdb_details(tmdb_id: int) -> Dict[str, Any]:
     api_key = os.environ.get("TMDB_API_KEY") or os.environ.get("TMDB_KEY") or os.environ.get("TMDB_API")
     if not api_key:
         return {"tmdb_id": tmdb_id}
-    url = f"{TMDB_API}/tv/{tmdb_id}?api_key={api_key}"
-    async with httpx.AsyncClient(timeout=10) as client:
-        r = await client.get(url)
-        if r.status_code != 200:
-            return {"tmdb_id": tmdb_id}
-        data = r.json()
-        poster_path = (data.get("poster_path") or "").lstrip("/")
-        poster_url = f"{TMDB_IMG}/{poster_path}" if poster_path else None
-
-        # NEW: get genres (names + ids)
-        genres_arr = data.get("genres") or []
-        genre_names = [str(g.get("name")).strip() for g in genres_arr if g and g.get("name")]
-        genre_ids = [int(g.get("id")) for g in genres_arr if g and isinstance(g.get("id"), int)]
-
-        return {
-            "tmdb_id": tmdb_id,
-            "name": data.get("name") or data.get("original_name"),
-            "title": data.get("name") or data.get("original_name"),
-            "overview": data.get("overview"),
-            "poster_path": data.get("poster_path"),
-            "poster_url": poster_url,
-            "first_air_date": data.get("first_air_date"),
-            "origin_country": data.get("origin_country"),
-            "original_language": data.get("original_language"),
-            "genres": genre_names,      # <-- names
-            "genre_ids": genre_ids,     # <-- ids
-        }
+    # shared pooled client: the 40-way enrichment fan-out reuses warm connections
+    async with _TMDB_SEM:
+        r = await tmdb_client().get(f"{TMDB_API}/tv/{tmdb_id}", params={"api_key": api_key})
+    if r.status_code != 200:
+        return {"tmdb_id": tmdb_id}
+    data = orjson.loads(r.content)
+    poster_path = (data.get("poster_path") or "").lstrip("/")
+    poster_url = f"{TMDB_IMG}/{poster_path}" if poster_path else None
+
+    # NEW: get genres (names + ids)
+    genres_arr = data.get("genres") or []
+    genre_names = [str(g.get("name")).strip() for g in genres_arr if g and g.get("name")]
+    genre_ids = [int(g.get("id")) for g in genres_arr if g and isinstance(g.get("id"), int)]
+
+    return {
+        "tmdb_id": tmdb_id,
+        "name": data.get("name") or data.get("original_name"),
+        "title": data.get("name") or data.get("original_name"),
+        "overview": data.get("overview"),
+        "poster_path": data.get("poster_path"),
+        "poster_url": poster_url,
+        "first_air_date": data.get("first_air_date"),
+        "origin_country": data.get("origin_country"),
+        "original_language": data.get("original_language"),
+        "genres": genre_names,      # <-- names
+        "genre_ids": genre_ids,     # <-- ids
+    }
 
 async def _enrich_with_tmdb(items: List[JsonItem]) -> List[JsonItem]:
     ids: List[int] = []
@@ -228,7 +314,15 @@ async def _enrich_with_tmdb(items: List[JsonItem]) -> List[JsonItem]:
     return enriched
 
 # ========== Endpoint ==========
-@router.get("/{user_id}")
+_SQL_EXCLUSION_IDS = text(
+    """
+    SELECT 'f' AS kind, tmdb_id FROM user_favorites WHERE user_id = :uid
+    UNION ALL
+    SELECT 'n' AS kind, tmdb_id FROM not_interested WHERE user_id = :uid
+    """
+)
+
+@router.get("/{user_id}", response_class=ORJSONResponse)
 async def get_recommendations(
     user_id: int,
     limit: int = Query(24, ge=1, le=200),
@@ -242,14 +336,33 @@ async def get_recommendations(
     flat: int = Query(1, ge=0, le=1, description="If 1: plain list (frontend default). If 0: include meta."),
 ) -> Any:
     """Hybrid recommendations for a user, with MMR diversification and TMDb enrichment."""
+    # Output is deterministic in these params between the user's writes, which
+    # drop every recs:{user_id}:* key (see user_cache.invalidate_recs).
+    ckey = user_cache.recs_key(
+        user_id, limit, w_tmdb, w_reddit, w_pair, mmr_lambda, orig_lang,
+        sorted(genres) if genres else None,
+    )
+    cached = None if debug else await user_cache.get_recs_payload(ckey)
+    if cached is not None:
+        if flat:
+            # stored bytes are exactly the flat response body
+            return Response(cached, media_type="application/json")
+        items = orjson.loads(cached)
+        return {"items": items, "meta": _recs_meta(
+            items, w_tmdb, w_reddit, w_pair, mmr_lambda, orig_lang, genres
+        )}
+
     if hybrid_recommendations_for_user_async is None:
         items: List[JsonItem] = []
         return items if flat else {"items": items, "meta": {"reason": "adapter_unavailable"}}
 
+    # Over-fetch when filters can drop candidates, so the top-off below can backfill
+    fetch_n = limit * 2 if (orig_lang or genres) else limit
+
     try:
         resp: Dict[str, Any] = await hybrid_recommendations_for_user_async(
             user_id=user_id,
-            limit=limit,
+            limit=fetch_n,
             w_tmdb=w_tmdb,
             w_reddit=w_reddit,
             w_pair=w_pair,
@@ -264,95 +377,104 @@ async def get_recommendations(
         return items if flat else {"items": items, "meta": {"reason": "adapter_error", "detail": str(e)}}
 
     # MMR diversify
-    items = mmr_diversify(items, lambda_=mmr_lambda_sane(mmr_lambda), k=limit)
+    items = mmr_diversify(items, lambda_=mmr_lambda_sane(mmr_lambda), k=fetch_n)
 
-    # Exclude user's favorites
+    # Exclude user's favorites + "not interested" list: per-user Redis sets
+    # (dropped on every write), one UNION ALL round trip on a miss
     try:
-        if FavoriteTmdb is not None:
-            from app.database import get_async_db  # type: ignore
-            async for db in get_async_db():
-                res = await db.execute(
-                    select(FavoriteTmdb.tmdb_id).where(FavoriteTmdb.user_id == user_id)  # type: ignore
-                )
-                fav_ids = {int(row[0]) for row in res.fetchall()}
-                items = [x for x in items if int(x.get("tmdb_id", -1)) not in fav_ids]
-                break
+        sets = await user_cache.get_exclusion_sets(user_id)
+        if sets is None:
+            from app.database import AsyncSessionLocal  # type: ignore
+            fav_ids: set[int] = set()
+            blocked_ids: set[int] = set()
+            async with AsyncSessionLocal() as db:
+                res = await db.execute(_SQL_EXCLUSION_IDS, {"uid": user_id})
+                for kind, tid in res.all():
+                    (fav_ids if kind == "f" else blocked_ids).add(int(tid))
+            await user_cache.set_exclusion_sets(user_id, fav_ids, blocked_ids)
         else:
-            from app.database import get_async_db  # type: ignore
-            async for db in get_async_db():
-                res = await db.execute(
-                    text("SELECT tmdb_id FROM user_favorites WHERE user_id = :uid"),
-                    {"uid": user_id},
-                )
-                fav_ids = {int(row[0]) for row in res.fetchall()}
-                items = [x for x in items if int(x.get("tmdb_id", -1)) not in fav_ids]
-                break
+            fav_ids, blocked_ids = sets
+        excluded = fav_ids | blocked_ids
+        if excluded:
+            items = [x for x in items if int(x.get("tmdb_id", -1)) not in excluded]
     except Exception as e:  # pragma: no cover
-        logger.warning("Favorite filter skipped: %s", e)
+        logger.warning("Favorite / not-interested filter skipped: %s", e)
 
-    # Exclude user's "not interested" list
-    try:
-        from app.database import get_async_db  # type: ignore
-        async for db in get_async_db():
-            res = await db.execute(
-                text("SELECT tmdb_id FROM not_interested WHERE user_id = :uid"),
-                {"uid": user_id},
-            )
-            blocked_ids = {int(row[0]) for row in res.fetchall()}
-            if blocked_ids:
-                items = [x for x in items if int(x.get("tmdb_id", -1)) not in blocked_ids]
-            break
-    except Exception as e:  # pragma: no cover
-        logger.warning("Not-interested filter skipped: %s", e)
-
-    # Enrich (adds genres/genre_ids)
-    try:
-        items = await _enrich_with_tmdb(items)
-    except Exception as e:  # pragma: no cover
-        logger.warning("TMDb enrichment failed: %s", e)
+    # Filters: whatever the candidate already knows (language / genres from
+    # the adapter) is checked before enrichment, so TMDb is only asked about
+    # survivors; enrichment then runs in limit-sized batches until `limit`
+    # items pass the strict post-enrichment check or candidates run out.
+    ol = str(orig_lang).lower() if orig_lang else None
+    want = {str(g).strip().lower() for g in genres if g} if genres else set()
+    if ol or want:
+        items = [x for x in items if _passes_filters(x, ol, want, strict=False)]
 
-    # Local language filter (fallback)
-    if orig_lang:
-        try:
-            ol = str(orig_lang).lower()
-            items = [x for x in items if str(x.get("original_language", "")).lower() == ol]
-        except Exception:
-            pass
-
-    # NEW: Local genre filter (OR-match by genre names)
-    if genres:
+    out: List[JsonItem] = []
+    pos = 0
+    while len(out) < limit and pos < len(items):
+        batch = items[pos:pos + limit]
+        pos += limit
+        # Enrich (adds genres/genre_ids)
         try:
-            want = {str(g).strip().lower() for g in genres if g}
-            if want:
-                filtered: List[JsonItem] = []
-                for it in items:
-                    names = it.get("genres") or []
-                    if isinstance(names, list):
-                        names_l = {str(n).strip().lower() for n in names if n}
-                    else:
-                        names_l = set()
-                    if names_l & want:
-                        filtered.append(it)
-                items = filtered
-        except Exception as e:
-            logger.warning("Genre filter skipped: %s", e)
+            batch = await _enrich_with_tmdb(batch)
+        except Exception as e:  # pragma: no cover
+            logger.warning("TMDb enrichment failed: %s", e)
+        out.extend(x for x in batch if _passes_filters(x, ol, want, strict=True))
+    items = out
 
     items = items[:limit]
 
+    if not debug:
+        await user_cache.set_recs_payload(ckey, orjson.dumps(items))
+
     if flat:
         return items
 
     return {
         "items": items,
-        "meta": {
-            "count": len(items),
-            "w_tmdb": w_tmdb,
-            "w_reddit": w_reddit,
-            "w_pair": w_pair,
-            "mmr_lambda": mmr_lambda_sane(mmr_lambda),
-            "applied_orig_lang": orig_lang or None,
-            "applied_genres": genres or None,   # <-- NEW
-            "filtered_favorites": True,
-            "filtered_not_interested": True,
-        },
+        "meta": _recs_meta(items, w_tmdb, w_reddit, w_pair, mmr_lambda, orig_lang, genres),
+    }
+
+
+def _passes_filters(it: JsonItem, ol: Optional[str], want: set[str], *, strict: bool) -> bool:
+    """
+    Language / genre (OR-match by name) filter. With strict=False a field the
+    item doesn't carry yet passes (it may after enrichment); strict=True drops it.
+    """
+    if ol:
+        lang = it.get("original_language")
+        if lang:
+            if str(lang).lower() != ol:
+                return False
+        elif strict:
+            return False
+    if want:
+        names = it.get("genres")
+        if isinstance(names, list) and names:
+            if not {str(n).strip().lower() for n in names if n} & want:
+                return False
+        elif strict:
+            return False
+    return True
+
+
+def _recs_meta(
+    items: List[JsonItem],
+    w_tmdb: float,
+    w_reddit: float,
+    w_pair: float,
+    mmr_lambda: float,
+    orig_lang: Optional[str],
+    genres: Optional[List[str]],
+) -> Dict[str, Any]:
+    return {
+        "count": len(items),
+        "w_tmdb": w_tmdb,
+        "w_reddit": w_reddit,
+        "w_pair": w_pair,
+        "mmr_lambda": mmr_lambda_sane(mmr_lambda),
+        "applied_orig_lang": orig_lang or None,
+        "applied_genres": genres or None,   # <-- NEW
+        "filtered_favorites": True,
+        "filtered_not_interested": True,
     }
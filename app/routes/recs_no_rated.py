@@ -8,7 +8,8 @@ from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import httpx
 from fastapi import APIRouter, Query
-from sqlalchemy import select, text
+
+from app.services.exclusions import filter_excluded
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +29,6 @@ except Exception as e:  # pragma: no cover
     hybrid_recommendations_for_user_async = None  # type: ignore[assignment]
     _adapter_mmr_diversify = None  # type: ignore[assignment]
 
-# Optional ORM model for favorites if present
-try:
-    from app.db_models import FavoriteTmdb  # type: ignore
-except Exception:
-    FavoriteTmdb = None  # type: ignore
-
 # ========== Types ==========
 JsonItem = Dict[str, Any]
 AnyItem = Union[JsonItem, int, str, Tuple[Any, ...], List[Any]]
@@ -60,6 +55,9 @@ def _coerce_item(it: AnyItem) -> Optional[JsonItem]:
     Accepts dicts, ints / numeric strings, or (id[,score]) tuples.
     """
     if isinstance(it, dict):
+        # common path: already coerced (e.g. by an earlier pass) → no copy
+        if type(it.get("tmdb_id")) is int and type(it.get("score")) is float:
+            return it
         tmdb_id = _to_int_or_none(it.get("tmdb_id"))
         if tmdb_id is None:
             tmdb_id = _to_int_or_none(it.get("id"))
@@ -107,40 +105,84 @@ def _default_sim(a: JsonItem, b: JsonItem) -> float:
     return len(at & bt) / max(1, len(at | bt))
 
 
+def _title_token_sets(items: List[JsonItem]) -> List[frozenset]:
+    return [frozenset(str(it.get("title", "")).lower().split()) for it in items]
+
+
+def _bloom64(tokens: frozenset) -> int:
+    """64-bit token signature: disjoint signatures ⇒ disjoint token sets."""
+    sig = 0
+    for t in tokens:
+        sig |= 1 << (hash(t) & 63)
+    return sig
+
+
 def _local_mmr_dict_items(
     items: List[JsonItem],
     lambda_: float = 0.3,
     k: Optional[int] = None,
     sim: Optional[Callable[[JsonItem, JsonItem], float]] = None,
 ) -> List[JsonItem]:
+    # items must already be coerced — mmr_diversify does that once up front
     if not items:
         return items
     if k is None:
         k = len(items)
-    sim = sim or _default_sim
 
-    items = _coerce_items(items)
+    if lambda_ >= 1.0:
+        # no diversity term: MMR degenerates to a stable top-k by score
+        return sorted(items, key=lambda it: -float(it.get("score", 0.0)))[:k]
     scored = [(float(it.get("score", 0.0)), it) for it in items]
     scored.sort(key=lambda x: x[0], reverse=True)
-    selected: List[JsonItem] = []
-    candidates: List[JsonItem] = [it for _, it in scored]
-
-    while candidates and len(selected) < k:
-        best_item: Optional[JsonItem] = None
+    cands: List[JsonItem] = [it for _, it in scored]
+    rels = [rel for rel, _ in scored]
+
+    if sim is None:
+        # _default_sim with each title tokenised once up front, not per pair
+        toks = _title_token_sets(cands)
+        sigs = [_bloom64(t) for t in toks]
+
+        def pair_sim(i: int, j: int) -> float:
+            # one int AND rejects most pairs (no shared bit ⇒ no shared token);
+            # only possible overlaps pay for the exact set intersection
+            if not sigs[i] & sigs[j]:
+                return 0.0
+            a, b = toks[i], toks[j]
+            inter = len(a & b)
+            return inter / (len(a) + len(b) - inter)
+    else:
+        def pair_sim(i: int, j: int) -> float:
+            return sim(cands[i], cands[j])
+
+    # chosen[i] marks selected candidates; max_sim[i] is i's max similarity to
+    # the selected set, updated once per pick instead of rescanned per pair
+    n = len(cands)
+    chosen = bytearray(n)
+    max_sim = [-inf] * n
+    sel_idx: List[int] = []
+
+    while len(sel_idx) < min(k, n):
+        best_i = -1
         best_val = -inf
-        for c in candidates:
-            rel = float(c.get("score", 0.0))
-            div_penalty = max((sim(c, s) for s in selected), default=0.0)
-            val = lambda_ * rel - (1.0 - lambda_) * div_penalty
+        for i in range(n):
+            if chosen[i]:
+                continue
+            div_penalty = max_sim[i] if sel_idx else 0.0
+            val = lambda_ * rels[i] - (1.0 - lambda_) * div_penalty
             if val > best_val:
                 best_val = val
-                best_item = c
-        if best_item is None:  # safety
+                best_i = i
+        if best_i < 0:  # safety
             break
-        selected.append(best_item)
-        candidates = [x for x in candidates if x is not best_item]
+        chosen[best_i] = 1
+        sel_idx.append(best_i)
+        for i in range(n):
+            if not chosen[i]:
+                s = pair_sim(i, best_i)
+                if s > max_sim[i]:
+                    max_sim[i] = s
 
-    return selected
+    return [cands[i] for i in sel_idx]
 
 
 def mmr_lambda_sane(x: float) -> float:
@@ -268,45 +310,14 @@ async def get_recommendations(
     # MMR diversify
     items = mmr_diversify(items, lambda_=mmr_lambda_sane(mmr_lambda), k=limit)
 
-    # Exclude user's favorites (ORM if available; else direct SQL against user_favorites)
-    try:
-        # Preferred ORM path if present
-        if FavoriteTmdb is not None:
-            from app.database import get_async_db  # type: ignore
-            async for db in get_async_db():  # get generator-based session
-                res = await db.execute(
-                    select(FavoriteTmdb.tmdb_id).where(FavoriteTmdb.user_id == user_id)  # type: ignore
-                )
-                fav_ids = {int(row[0]) for row in res.fetchall()}
-                items = [x for x in items if int(x.get("tmdb_id", -1)) not in fav_ids]
-                break
-        else:
-            from app.database import get_async_db  # type: ignore
-            async for db in get_async_db():
-                res = await db.execute(
-                    text("SELECT tmdb_id FROM user_favorites WHERE user_id = :uid"),
-                    {"uid": user_id},
-                )
-                fav_ids = {int(row[0]) for row in res.fetchall()}
-                items = [x for x in items if int(x.get("tmdb_id", -1)) not in fav_ids]
-                break
-    except Exception as e:  # pragma: no cover
-        logger.warning("Favorite filter skipped: %s", e)
-
-    # Exclude user's "not interested" list
+    # Exclude user's favorites + "not interested" list (one session, anti-join in SQL)
     try:
-        from app.database import get_async_db  # type: ignore
-        async for db in get_async_db():
-            res = await db.execute(
-                text("SELECT tmdb_id FROM not_interested WHERE user_id = :uid"),
-                {"uid": user_id},
-            )
-            blocked_ids = {int(row[0]) for row in res.fetchall()}
-            if blocked_ids:
-                items = [x for x in items if int(x.get("tmdb_id", -1)) not in blocked_ids]
-            break
+        from app.database import AsyncSessionLocal  # type: ignore
+        async with AsyncSessionLocal() as db:
+            keep = await filter_excluded(db, user_id, (x["tmdb_id"] for x in items))
+        items = [x for x in items if int(x.get("tmdb_id", -1)) in keep]
     except Exception as e:  # pragma: no cover
-        logger.warning("Not-interested filter skipped: %s", e)
+        logger.warning("Favorite / not-interested filter skipped: %s", e)
 
     # Enrich
     try:
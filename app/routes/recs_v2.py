@@ -1,15 +1,24 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 import os
-from typing import Any, Dict, List, AsyncIterator
+from datetime import date
+from typing import Any, Dict, List, AsyncIterator, Tuple
 
-import httpx
+import numpy as np
+import orjson
 from fastapi import APIRouter, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
 
+from app.infra.http import tmdb_client
+from app.services.ttl_cache import AsyncTTLCache
+
+log = logging.getLogger(__name__)
+
 # ---------------------------------------------------------------------------
 # DB session wiring
 # ---------------------------------------------------------------------------
@@ -57,24 +66,50 @@ def _get_tmdb_api_key() -> str | None:
     )
 
 
+# Resolved once at import (like the other routers' TMDB_KEY); None disables
+# TMDb calls for the process instead of re-reading env on every detail fetch.
+_TMDB_KEY = _get_tmdb_api_key()
+_TMDB_PARAMS: Dict[str, str] | None = (
+    {"api_key": _TMDB_KEY, "language": "en-US"} if _TMDB_KEY else None
+)
+_TMDB_TV_URL = TMDB_API + "/tv/%d"
+
+
+# TMDb show metadata is near-static; popular ids are shared across users.
+TMDB_DETAILS_TTL_SECONDS = 6 * 3600
+_TMDB_DETAILS_CACHE = AsyncTTLCache(TMDB_DETAILS_TTL_SECONDS, name="recs2:tmdb:tv")
+
+# Cap on concurrent outbound detail calls so a limit=200 request doesn't
+# fire 200 GETs at once (TMDb answers that with 429s). Cache hits skip it.
+TMDB_MAX_CONCURRENCY = int(os.getenv("TMDB_V2_MAX_CONCURRENCY", "16"))
+_TMDB_SEM = asyncio.Semaphore(TMDB_MAX_CONCURRENCY)
+
+
 async def _tmdb_details(tmdb_id: int) -> Dict[str, Any]:
     """
-    Fetch details for a single TMDb TV show.
+    Fetch details for a single TMDb TV show (cached, deduped in flight).
     Returns a dict including poster_url, genres, etc.
     Falls back gracefully if TMDb key is missing or request fails.
     """
-    api_key = _get_tmdb_api_key()
-    base: Dict[str, Any] = {"tmdb_id": tmdb_id}
-
-    if not api_key:
+    if _TMDB_PARAMS is None:
         # No TMDb key configured – return barebones info
-        return base
+        return {"tmdb_id": tmdb_id}
+    return await _TMDB_DETAILS_CACHE.get_or_fetch(
+        int(tmdb_id),
+        lambda: _fetch_tmdb_details(tmdb_id),
+        # the barebones {"tmdb_id": ...} fallback means TMDb failed — don't pin it
+        cacheable=lambda d: bool(d.get("name")),
+    )
 
-    url = f"{TMDB_API}/tv/{tmdb_id}?api_key={api_key}"
+
+async def _fetch_tmdb_details(tmdb_id: int) -> Dict[str, Any]:
+    base: Dict[str, Any] = {"tmdb_id": tmdb_id}
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url)
+        # shared HTTP/2 client: no per-call TCP/TLS setup, and the bulk
+        # fan-out below multiplexes over the same connection
+        async with _TMDB_SEM:
+            r = await tmdb_client().get(_TMDB_TV_URL % tmdb_id, params=_TMDB_PARAMS)
     except Exception:
         # Network/timeout issues: just return barebones
         return base
@@ -82,23 +117,28 @@ async def _tmdb_details(tmdb_id: int) -> Dict[str, Any]:
     if r.status_code != 200:
         return base
 
-    data = r.json()
+    try:
+        # orjson straight off the bytes; the payload is mostly seasons /
+        # networks / companies we never read
+        data = orjson.loads(r.content)
+    except orjson.JSONDecodeError:
+        return base
 
     poster_path = (data.get("poster_path") or "").lstrip("/")
     poster_url = f"{TMDB_IMG}/{poster_path}" if poster_path else None
 
     # Genres
-    genres_arr = data.get("genres") or []
-    genre_names = [
-        str(g.get("name")).strip()
-        for g in genres_arr
-        if g and g.get("name")
-    ]
-    genre_ids = [
-        int(g.get("id"))
-        for g in genres_arr
-        if g and isinstance(g.get("id"), int)
-    ]
+    genre_names: List[str] = []
+    genre_ids: List[int] = []
+    for g in data.get("genres") or []:
+        if not g:
+            continue
+        name = g.get("name")
+        if name:
+            genre_names.append(str(name).strip())
+        gid = g.get("id")
+        if isinstance(gid, int):
+            genre_ids.append(gid)
 
     # Enriched payload (very similar to v1)
     enriched: Dict[str, Any] = {
@@ -132,7 +172,7 @@ async def _tmdb_bulk_details(tmdb_ids: List[int]) -> Dict[int, Dict[str, Any]]:
     if not unique_ids:
         return {}
 
-    # basic parallelism
+    # parallel, but outbound calls are bounded by _TMDB_SEM
     tasks = [asyncio.create_task(_tmdb_details(tid)) for tid in unique_ids]
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -160,6 +200,29 @@ SQL_USER_PAIRS = text(
     """
 )
 
+# Candidates straight from user_reddit_pairs: favourites / hidden removed by
+# anti-join and weights normalised to [0,1] by the top weight, all in SQL.
+SQL_USER_CANDIDATES = text(
+    """
+    SELECT
+        p.suggested_tmdb_id,
+        p.weight,
+        COALESCE(p.weight / NULLIF(MAX(p.weight) OVER (), 0), p.weight) AS score
+    FROM user_reddit_pairs p
+    WHERE p.user_id = :uid
+      AND NOT EXISTS (
+          SELECT 1 FROM user_favorites f
+          WHERE f.user_id = :uid AND f.tmdb_id = p.suggested_tmdb_id
+      )
+      AND NOT EXISTS (
+          SELECT 1 FROM not_interested n
+          WHERE n.user_id = :uid AND n.tmdb_id = p.suggested_tmdb_id
+      )
+    ORDER BY p.weight DESC
+    LIMIT :limit
+    """
+)
+
 # Fallback: build from raw reddit_pairs + favorites if user_reddit_pairs empty
 SQL_FALLBACK_AGG = text(
     """
@@ -168,36 +231,204 @@ SQL_FALLBACK_AGG = text(
         FROM user_favorites
         WHERE user_id = :uid
     ),
-    both_dirs AS (
-        SELECT rp.tmdb_id_b AS suggested, rp.pair_weight AS w
-        FROM reddit_pairs rp
-        JOIN seeds s ON s.tmdb_id = rp.tmdb_id_a
-        UNION ALL
-        SELECT rp.tmdb_id_a AS suggested, rp.pair_weight AS w
-        FROM reddit_pairs rp
-        JOIN seeds s ON s.tmdb_id = rp.tmdb_id_b
-    ),
     agg AS (
-        SELECT suggested, SUM(w) AS w
-        FROM both_dirs
-        GROUP BY suggested
+        SELECT ps.other_id AS suggested, SUM(ps.pair_weight) AS w
+        FROM reddit_pairs_sym ps
+        JOIN seeds s ON s.tmdb_id = ps.tmdb_id
+        GROUP BY ps.other_id
     )
-    SELECT suggested AS suggested_tmdb_id, w
-    FROM agg
-    ORDER BY w DESC
+    SELECT
+        a.suggested AS suggested_tmdb_id,
+        a.w,
+        COALESCE(a.w / NULLIF(MAX(a.w) OVER (), 0), a.w) AS score
+    FROM agg a
+    WHERE NOT EXISTS (SELECT 1 FROM seeds s WHERE s.tmdb_id = a.suggested)
+      AND NOT EXISTS (
+          SELECT 1 FROM not_interested n
+          WHERE n.user_id = :uid AND n.tmdb_id = a.suggested
+      )
+    ORDER BY a.w DESC
     LIMIT :limit
     """
 )
 
-SQL_FAVORITES = text(
-    "SELECT tmdb_id FROM user_favorites WHERE user_id = :uid"
+
+# Local metadata for candidate ids (shows.show_id is the TMDb id).
+SQL_SHOWS_LITE = text(
+    """
+    SELECT show_id, title, overview, poster_path, poster_url, genres, first_air_date,
+           vote_average, vote_count, popularity
+    FROM shows
+    WHERE show_id = ANY(CAST(:ids AS integer[]))
+    """
 )
 
-SQL_NOT_INTERESTED = text(
-    "SELECT tmdb_id FROM not_interested WHERE user_id = :uid"
+# Write TMDb results back so the next request is a local hit.
+SQL_UPSERT_SHOW = text(
+    """
+    INSERT INTO shows (
+        show_id, external_id, title, year, poster_path, poster_url, overview,
+        genres, first_air_date, vote_average, vote_count, popularity
+    )
+    VALUES (
+        :show_id, :external_id, :title, :year, :poster_path, :poster_url, :overview,
+        :genres, :first_air_date, :vote_average, :vote_count, :popularity
+    )
+    ON CONFLICT (show_id) DO UPDATE SET
+        title          = EXCLUDED.title,
+        year           = COALESCE(EXCLUDED.year, shows.year),
+        poster_path    = COALESCE(EXCLUDED.poster_path, shows.poster_path),
+        poster_url     = COALESCE(EXCLUDED.poster_url, shows.poster_url),
+        overview       = COALESCE(EXCLUDED.overview, shows.overview),
+        genres         = COALESCE(EXCLUDED.genres, shows.genres),
+        first_air_date = COALESCE(EXCLUDED.first_air_date, shows.first_air_date),
+        vote_average   = COALESCE(EXCLUDED.vote_average, shows.vote_average),
+        vote_count     = COALESCE(EXCLUDED.vote_count, shows.vote_count),
+        popularity     = COALESCE(EXCLUDED.popularity, shows.popularity)
+    """
 )
 
 
+def _details_from_show_row(r: Any) -> Dict[str, Any] | None:
+    """Same shape as _tmdb_details, or None if the row lacks fields we need."""
+    if not (r.title and r.overview and r.poster_path and r.genres):
+        return None
+    # poster_url is stored normalised at ingest; only derive it for old rows
+    poster_url = r.poster_url or f"{TMDB_IMG}/{r.poster_path.lstrip('/')}"
+    first_air = r.first_air_date.isoformat() if r.first_air_date else None
+    return {
+        "tmdb_id": int(r.show_id),
+        "name": r.title,
+        "title": r.title,
+        "overview": r.overview,
+        "poster_path": r.poster_path,
+        "poster_url": poster_url,
+        "first_air_date": first_air,
+        # not stored locally
+        "origin_country": None,
+        "original_language": None,
+        "genres": list(r.genres),
+        "genre_ids": [],
+        "vote_average": r.vote_average,
+        "vote_count": r.vote_count,
+        "popularity": r.popularity,
+    }
+
+
+def _show_row_params(d: Dict[str, Any]) -> Dict[str, Any]:
+    first_air = d.get("first_air_date") or ""
+    try:
+        air_date = date.fromisoformat(first_air) if first_air else None
+    except ValueError:
+        air_date = None
+    return {
+        "show_id": int(d["tmdb_id"]),
+        "external_id": str(d["tmdb_id"]),
+        "title": d.get("name"),
+        "year": air_date.year if air_date else None,
+        "poster_path": d.get("poster_path"),
+        "poster_url": d.get("poster_url"),
+        "overview": d.get("overview") or None,
+        "genres": d.get("genres") or None,
+        "first_air_date": air_date,
+        "vote_average": d.get("vote_average"),
+        "vote_count": d.get("vote_count"),
+        "popularity": d.get("popularity"),
+    }
+
+
+async def _hydrate_details(session: AsyncSession, tmdb_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Details for many ids: one indexed read of the local shows table, TMDb
+    (bounded, cached) only for ids that are missing or incomplete there, and
+    the fetched rows upserted back into shows.
+    """
+    out: Dict[int, Dict[str, Any]] = {}
+    try:
+        rows = (await session.execute(SQL_SHOWS_LITE, {"ids": tmdb_ids})).all()
+    except Exception:
+        log.exception("shows lookup failed; falling back to TMDb for all ids")
+        # clear the aborted transaction so the write-back below can run
+        await session.rollback()
+        rows = []
+    for r in rows:
+        d = _details_from_show_row(r)
+        if d is not None:
+            out[d["tmdb_id"]] = d
+
+    missing = [tid for tid in tmdb_ids if tid not in out]
+    if not missing:
+        return out
+
+    fetched = await _tmdb_bulk_details(missing)
+    out.update(fetched)
+
+    # Only full TMDb answers go back into shows (the fallback has no name).
+    upserts = [_show_row_params(d) for d in fetched.values() if d.get("name")]
+    if upserts:
+        try:
+            await session.execute(SQL_UPSERT_SHOW, upserts)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            log.exception("shows write-back failed for %d ids", len(upserts))
+    return out
+
+
+def _columns(result: Any) -> Tuple[List[int], List[float], List[float]]:
+    """
+    Split (tmdb_id, weight, score) rows into parallel lists, so the hot path
+    carries three flat lists instead of a dict per candidate.
+    """
+    tmdb_ids: List[int] = []
+    weights: List[float] = []
+    scores: List[float] = []
+    for tid, w, score in result:
+        tmdb_ids.append(int(tid))
+        weights.append(float(w))
+        scores.append(float(score))
+    return tmdb_ids, weights, scores
+
+
+def _genre_cosine_matrix(genres: List[List[str]]) -> np.ndarray:
+    """Pairwise cosine of multi-hot genre vectors; rows without genres are 0."""
+    vocab: Dict[str, int] = {}
+    for gs in genres:
+        for g in gs:
+            vocab.setdefault(g, len(vocab))
+    G = np.zeros((len(genres), max(len(vocab), 1)), dtype=np.float32)
+    for i, gs in enumerate(genres):
+        for g in gs:
+            G[i, vocab[g]] = 1.0
+    norms = np.linalg.norm(G, axis=1)
+    norms[norms == 0.0] = 1.0
+    G /= norms[:, None]
+    return G @ G.T
+
+
+def _mmr_order(rel: List[float], genres: List[List[str]], lambda_: float) -> List[int]:
+    """
+    Greedy MMR over all candidates, returning indices in pick order.
+    The running max-similarity to the picked set is updated incrementally,
+    so each step is one vectorised pass over n.
+    """
+    n = len(rel)
+    r = np.asarray(rel, dtype=np.float64)
+    sim = _genre_cosine_matrix(genres).astype(np.float64)
+    max_sim = np.zeros(n, dtype=np.float64)
+    alive = np.ones(n, dtype=bool)
+    order: List[int] = []
+
+    for _ in range(n):
+        vals = np.where(alive, lambda_ * r - (1.0 - lambda_) * max_sim, -np.inf)
+        best = int(np.argmax(vals))  # first max wins → ties keep SQL order
+        order.append(best)
+        alive[best] = False
+        np.maximum(max_sim, sim[best], out=max_sim)
+
+    return order
+
+
 # ---------------------------------------------------------------------------
 # Router
 # ---------------------------------------------------------------------------
@@ -218,15 +449,15 @@ async def _diag_v1(user_id: int, limit: int = 20) -> Dict[str, Any]:
     Helpful when diagnosing behaviour.
     """
     async with session_scope() as session:
-        rows = (await session.execute(SQL_USER_PAIRS, {"uid": user_id, "limit": limit})).all()
+        result = await session.execute(SQL_USER_PAIRS, {"uid": user_id, "limit": limit})
         items = [
-            {"tmdb_id": int(r[0]), "weight": float(r[1])}
-            for r in rows
+            {"tmdb_id": int(tid), "weight": float(w)}
+            for tid, w in result
         ]
     return {"user_id": user_id, "items": items}
 
 
-@router.get("/{user_id}")
+@router.get("/{user_id}", response_class=ORJSONResponse)
 async def get_recs_v2(
     user_id: int,
     limit: int = Query(36, ge=1, le=200),
@@ -237,82 +468,56 @@ async def get_recs_v2(
     v2 – Reddit-based personalised recommendations.
 
     Steps:
-      1) Read favourites + not_interested for this user.
-      2) Pull top suggestions from user_reddit_pairs (precomputed).
+      1) Pull top suggestions from user_reddit_pairs (precomputed).
          - If empty, fall back to aggregating reddit_pairs live.
-      3) Filter out favourites + not_interested.
-      4) Normalise weights into [0,1] as `score`.
-      5) Fetch TMDb details (title, overview, poster, genres, etc.)
-      6) Return enriched items, ready for smarter scoring / MMR later.
+      2) Filter out favourites + not_interested (anti-join in SQL).
+      3) Normalise weights into [0,1] as `score` (window MAX in SQL).
+      4) Fetch details (title, overview, poster, genres, etc.) from the
+         local shows table, TMDb only for ids missing there
+      5) MMR re-rank: `mmr_lambda` * score - (1 - `mmr_lambda`) * max genre
+         cosine to the already-picked items.
+      6) Return enriched items.
     """
     async with session_scope() as session:
         # ------------------------------------------------------------------
-        # 1) load favourites + hidden
+        # 1+2) primary source: user_reddit_pairs, already filtered against
+        #      favourites / hidden and normalised in SQL
         # ------------------------------------------------------------------
-        fav_rows = (await session.execute(SQL_FAVORITES, {"uid": user_id})).all()
-        hide_rows = (await session.execute(SQL_NOT_INTERESTED, {"uid": user_id})).all()
-
-        favorite_ids = {int(r[0]) for r in fav_rows}
-        hidden_ids = {int(r[0]) for r in hide_rows}
+        params = {"uid": user_id, "limit": limit}
+        tmdb_ids, weights, scores = _columns(await session.execute(SQL_USER_CANDIDATES, params))
 
-        # ------------------------------------------------------------------
-        # 2) primary source: user_reddit_pairs
-        #    we oversample a bit so we can drop fav/hidden and still have `limit`
-        # ------------------------------------------------------------------
-        oversample = limit * 3
-        rows = (await session.execute(
-            SQL_USER_PAIRS,
-            {"uid": user_id, "limit": oversample},
-        )).all()
-
-        if not rows:
+        if not tmdb_ids:
             # ------------------------------------------------------------------
             # 3) fallback: build from raw reddit_pairs + favourites
             # ------------------------------------------------------------------
-            rows = (await session.execute(
-                SQL_FALLBACK_AGG,
-                {"uid": user_id, "limit": oversample},
-            )).all()
-
-        # rows: [(suggested_tmdb_id, weight), ...]
-        candidates: List[Dict[str, Any]] = []
-        for suggested_tmdb_id, w in rows:
-            tid = int(suggested_tmdb_id)
-            if tid in favorite_ids or tid in hidden_ids:
-                continue
-            candidates.append({"tmdb_id": tid, "score_raw": float(w)})
-            if len(candidates) >= limit:
-                break
-
-        if not candidates:
+            tmdb_ids, weights, scores = _columns(await session.execute(SQL_FALLBACK_AGG, params))
+
+        if not tmdb_ids:
             # Nothing to recommend
             return [] if flat else {"items": [], "meta": {"engine": "v2", "user_id": user_id}}
 
         # ------------------------------------------------------------------
-        # 4) normalise weights into [0,1] as score (MMR-ready)
+        # 4) fetch details (local shows first, then TMDb)
         # ------------------------------------------------------------------
-        max_w = max(c["score_raw"] for c in candidates) or 1.0
-        for c in candidates:
-            c["score"] = c["score_raw"] / max_w
-
-        # NOTE: `mmr_lambda` is accepted here so we can later plug real
-        # MMR re-ranking in without changing the API. For now, we simply
-        # keep the Reddit ordering and expose the normalised `score`.
+        details_map = await _hydrate_details(session, tmdb_ids)
 
         # ------------------------------------------------------------------
-        # 5) fetch TMDb details
+        # 5) MMR re-rank on genre overlap (lambda=1 keeps the Reddit order)
         # ------------------------------------------------------------------
-        tmdb_ids = [c["tmdb_id"] for c in candidates]
-        details_map = await _tmdb_bulk_details(tmdb_ids)
+        order = range(len(tmdb_ids))
+        if mmr_lambda < 1.0:
+            genres = [details_map.get(tid, {}).get("genres") or [] for tid in tmdb_ids]
+            order = _mmr_order(scores, genres, mmr_lambda)
 
+        # Output dicts are only built here, once per item.
         items: List[Dict[str, Any]] = []
-        for c in candidates:
-            tid = c["tmdb_id"]
+        for i in order:
+            tid, score_raw, score = tmdb_ids[i], weights[i], scores[i]
             meta = details_map.get(tid, {"tmdb_id": tid})
             combined = {
                 **meta,
-                "score": c["score"],
-                "score_raw": c["score_raw"],
+                "score": score,
+                "score_raw": score_raw,
                 "source": "reddit_v2",
             }
             # Ensure we always have a `title` field for the UI
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import itertools
 import logging
 import math
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional
 
-import httpx
+import numpy as np
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_async_session
+from app.infra.http import get_json_revalidated, tmdb_client
+from app.services.ttl_cache import AsyncTTLCache
 from app.security import require_user_match
+from app.services import user_cache
 
 TMDB_API = os.environ.get("TMDB_API", "https://api.themoviedb.org/3")
 TMDB_IMG = "https://image.tmdb.org/t/p/w500"
@@ -37,21 +44,63 @@ def _tmdb_api_key() -> str | None:
     return os.environ.get("TMDB_API_KEY") or os.environ.get("TMDB_KEY")
 
 
+# TMDb detail payloads are near-static and shared across users (one user's
+# favourites are another's candidates); trending moves a little faster.
+# Recommendation and trending lists are also shared across processes via
+# Redis, and refreshed with conditional GETs once they expire.
+TMDB_DETAILS_TTL_SECONDS = 6 * 3600
+TMDB_RECS_TTL_SECONDS = 6 * 3600
+TMDB_TRENDING_TTL_SECONDS = 3600
+_TMDB_DETAILS_CACHE = AsyncTTLCache(TMDB_DETAILS_TTL_SECONDS, maxsize=10_000, name="recs3:tmdb:tv")
+_TMDB_RECS_CACHE = AsyncTTLCache(
+    TMDB_RECS_TTL_SECONDS, maxsize=2_000, redis_prefix="recs3:tmdb:recs:"
+)
+_TMDB_TRENDING_CACHE = AsyncTTLCache(
+    TMDB_TRENDING_TTL_SECONDS, maxsize=4, redis_prefix="recs3:tmdb:trending:"
+)
+# keyed by the profile's discover filters, so similar users share entries
+_TMDB_DISCOVER_CACHE = AsyncTTLCache(
+    TMDB_TRENDING_TTL_SECONDS, maxsize=1_000, redis_prefix="recs3:tmdb:discover:"
+)
+
+# A/B switch: with it on, a user whose favourites give a usable genre +
+# language profile gets one /discover/tv call plus /recommendations for only
+# their DISCOVER_RECS_FAVS most on-profile favourites, instead of
+# /recommendations for up to 10 favourites.
+RECS_V3_TMDB_DISCOVER = os.getenv("RECS_V3_TMDB_DISCOVER", "0") == "1"
+DISCOVER_RECS_FAVS = 3
+DISCOVER_MAX_GENRES = 3
+
+# Process-wide cap on outbound TMDb calls: a recs request fans out over
+# hundreds of candidates, and TMDb answers unbounded bursts with 429s.
+# Only real fetches take a slot; cache hits never wait on it.
+TMDB_MAX_CONCURRENCY = int(os.getenv("TMDB_MAX_CONCURRENCY", "10"))
+_TMDB_SEM = asyncio.Semaphore(TMDB_MAX_CONCURRENCY)
+
+
 async def _tmdb_details(tmdb_id: int) -> Dict[str, Any]:
     """
-    Fetch TV details for a tmdb_id from TMDB.
+    Fetch TV details for a tmdb_id from TMDB (cached; concurrent callers for
+    the same id share one request).
     Returns a dict with the same shape v1/v2 use:
       tmdb_id, name/title, overview, poster_path/url, genres, genre_ids, etc.
     """
+    return await _TMDB_DETAILS_CACHE.get_or_fetch(
+        int(tmdb_id),
+        lambda: _fetch_tmdb_details(tmdb_id),
+        # the minimal {"tmdb_id": ...} fallback means TMDb failed — don't pin it
+        cacheable=lambda d: bool(d.get("name")),
+    )
+
+
+async def _fetch_tmdb_details(tmdb_id: int) -> Dict[str, Any]:
     api_key = _tmdb_api_key()
     if not api_key:
         return {"tmdb_id": tmdb_id}
 
-    url = f"{TMDB_API}/tv/{tmdb_id}?api_key={api_key}"
-
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url)
+        async with _TMDB_SEM:
+            r = await tmdb_client().get(f"{TMDB_API}/tv/{tmdb_id}", params={"api_key": api_key})
     except Exception:
         # Network error – return minimal
         return {"tmdb_id": tmdb_id}
@@ -59,7 +108,7 @@ async def _tmdb_details(tmdb_id: int) -> Dict[str, Any]:
     if r.status_code != 200:
         return {"tmdb_id": tmdb_id}
 
-    data = r.json() or {}
+    data = orjson.loads(r.content or b"{}") or {}
 
     poster_path = (data.get("poster_path") or "").lstrip("/")
     poster_url = f"{TMDB_IMG}/{poster_path}" if poster_path else None
@@ -94,91 +143,185 @@ async def _tmdb_details(tmdb_id: int) -> Dict[str, Any]:
     }
 
 
-async def _tmdb_recommendations_for_fav(tmdb_id: int, api_key: str, max_n: int = 20) -> List[int]:
+def _slim_list_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields recs v3 reads from a TMDB list result (what gets cached)."""
+    return {
+        "id": row["id"],
+        "original_language": row.get("original_language"),
+        "genre_ids": row.get("genre_ids") or [],
+        "popularity": row.get("popularity"),
+    }
+
+
+async def _tmdb_recommendations_for_fav(tmdb_id: int, api_key: str, max_n: int = 20) -> List[Dict[str, Any]]:
     """
-    Fetch TMDB recommendations for a single favourite show.
-    Returns a list of recommended tmdb_ids (TV).
+    Fetch TMDB recommendations for a single favourite show (cached).
+    Returns the recommended TV results (each has an int ``id``), which also
+    carry original_language + genre_ids.
     """
-    url = f"{TMDB_API}/tv/{tmdb_id}/recommendations?api_key={api_key}"
+    rows = await _TMDB_RECS_CACHE.get_or_fetch(
+        int(tmdb_id), lambda: _fetch_tmdb_recommendations(int(tmdb_id), api_key)
+    )
+    return rows[:max_n]
+
+
+async def _fetch_tmdb_recommendations(tmdb_id: int, api_key: str) -> List[Dict[str, Any]]:
+    """Slimmed /tv/{id}/recommendations results ([] on any failure, which isn't cached)."""
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url)
+        async with _TMDB_SEM:
+            data = await get_json_revalidated(
+                f"{TMDB_API}/tv/{tmdb_id}/recommendations",
+                cache_key=f"recs3:tmdb:recs:v:{tmdb_id}",
+                params={"api_key": api_key},
+            )
     except Exception:
         return []
 
-    if r.status_code != 200:
-        return []
-
-    data = r.json() or {}
-    results = data.get("results") or []
-    out: List[int] = []
-    for row in results[:max_n]:
-        tid = row.get("id")
-        if isinstance(tid, int):
-            out.append(tid)
-    return out
+    results = (data or {}).get("results") or []
+    return [_slim_list_row(row) for row in results if isinstance(row.get("id"), int)]
 
 
-async def _fetch_tmdb_candidates(fav_ids: List[int], block_ids: set[int], limit: int) -> List[Dict[str, Any]]:
+async def _fetch_tmdb_candidates(
+    fav_ids: List[int],
+    block_ids: set[int],
+    limit: int,
+    max_favs: int = 10,
+) -> List[Dict[str, Any]]:
     """
     Build TMDB-based candidate list from favourites using /tv/{id}/recommendations.
-    Returns [{ tmdb_id, score_raw, source="tmdb_recs" }, ...].
+    Returns [{ tmdb_id, score_raw, source="tmdb_recs", original_language, genre_ids }, ...].
     """
     api_key = _tmdb_api_key()
     if not api_key or not fav_ids:
         return []
 
     # Limit how many favourites we query to avoid spamming TMDB
-    fav_slice = fav_ids[: min(len(fav_ids), 10)]
+    fav_slice = fav_ids[: min(len(fav_ids), max_favs)]
 
     tasks = [_tmdb_recommendations_for_fav(fid, api_key, max_n=20) for fid in fav_slice]
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
-    tmdb_ids: set[int] = set()
+    # first-seen order: favourite order, then TMDB's own ranking
+    rows: Dict[int, Dict[str, Any]] = {}
     for res in results:
         if isinstance(res, Exception):
             continue
-        for tid in res:
-            if not isinstance(tid, int):
+        for row in res:
+            tid = row["id"]
+            if tid in block_ids or tid in rows:
                 continue
-            if tid in block_ids:
-                continue
-            tmdb_ids.add(tid)
+            rows[tid] = row
 
     items: List[Dict[str, Any]] = []
-    for tid in list(tmdb_ids)[: max(limit * 3, limit)]:
-        items.append({"tmdb_id": tid, "score_raw": 1.0, "source": "tmdb_recs"})
+    for tid, row in list(rows.items())[: max(limit * 3, limit)]:
+        items.append({
+            "tmdb_id": tid,
+            "score_raw": 1.0,
+            "source": "tmdb_recs",
+            "original_language": row.get("original_language"),
+            "genre_ids": row.get("genre_ids") or [],
+        })
     return items
 
 
-async def _fetch_tmdb_trending_candidates(
+def _discover_params(allowed_langs: set[str], fav_genre_counts: Dict[int, int]) -> Dict[str, str]:
+    """/discover/tv filters for a taste profile: top genres OR'd, its languages OR'd."""
+    top_genres = sorted(fav_genre_counts, key=lambda g: (-fav_genre_counts[g], g))[:DISCOVER_MAX_GENRES]
+    return {
+        "sort_by": "popularity.desc",
+        "with_genres": "|".join(str(g) for g in top_genres),
+        "with_original_language": "|".join(sorted(allowed_langs)),
+        "without_genres": ",".join(str(g) for g in sorted(_TALK_SOAP_IDS)),
+        "page": "1",
+    }
+
+
+async def _fetch_tmdb_discover(params: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Slimmed /discover/tv results ([] on any failure, which isn't cached)."""
+    api_key = _tmdb_api_key()
+    if not api_key:
+        return []
+
+    query = "&".join(f"{k}={v}" for k, v in params.items())
+    try:
+        async with _TMDB_SEM:
+            data = await get_json_revalidated(
+                f"{TMDB_API}/discover/tv",
+                cache_key=f"recs3:tmdb:discover:v:{query}",
+                params={"api_key": api_key, **params},
+            )
+    except Exception:
+        return []
+
+    results = (data or {}).get("results") or []
+    return [_slim_list_row(row) for row in results if isinstance(row.get("id"), int)]
+
+
+async def _fetch_tmdb_discover_candidates(
     allowed_langs: set[str],
-    fav_genres: set[int],
+    fav_genre_counts: Dict[int, int],
     block_ids: set[int],
     limit: int,
 ) -> List[Dict[str, Any]]:
     """
-    Build candidate list from TMDB /trending/tv/week, filtered by
-    user's languages + favourite genres.
+    One /discover/tv call driven by the favourites' genre + language
+    profile, standing in for most per-favourite /recommendations calls.
 
-    Returns [{ tmdb_id, score_raw, source="tmdb_trending" }, ...].
+    Returns [{ tmdb_id, score_raw, source="tmdb_discover", original_language, genre_ids }, ...].
     """
+    params = _discover_params(allowed_langs, fav_genre_counts)
+    cache_key = "&".join(f"{k}={v}" for k, v in params.items())
+    results = await _TMDB_DISCOVER_CACHE.get_or_fetch(cache_key, lambda: _fetch_tmdb_discover(params))
+
+    items: List[Dict[str, Any]] = []
+    for row in results:
+        if row["id"] in block_ids:
+            continue
+        items.append({
+            "tmdb_id": row["id"],
+            "score_raw": 1.0,
+            "source": "tmdb_discover",
+            "original_language": row.get("original_language"),
+            "genre_ids": row.get("genre_ids") or [],
+        })
+        if len(items) >= max(limit * 3, limit):
+            break
+    return items
+
+
+async def _fetch_tmdb_trending_week() -> List[Dict[str, Any]]:
+    """Slimmed /trending/tv/week results ([] on any failure, which isn't cached)."""
     api_key = _tmdb_api_key()
     if not api_key:
         return []
 
-    url = f"{TMDB_API}/trending/tv/week?api_key={api_key}"
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url)
+        async with _TMDB_SEM:
+            data = await get_json_revalidated(
+                f"{TMDB_API}/trending/tv/week",
+                cache_key="recs3:tmdb:trending:v:week",
+                params={"api_key": api_key},
+            )
     except Exception:
         return []
 
-    if r.status_code != 200:
-        return []
+    results = (data or {}).get("results") or []
+    return [_slim_list_row(row) for row in results if isinstance(row.get("id"), int)]
+
+
+async def _fetch_tmdb_trending_candidates(
+    allowed_langs: set[str],
+    fav_genres: set[int],
+    block_ids: set[int],
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """
+    Build candidate list from TMDB /trending/tv/week, filtered by
+    user's languages + favourite genres.
 
-    data = r.json() or {}
-    results = data.get("results") or []
+    Returns [{ tmdb_id, score_raw, source="tmdb_trending", original_language, genre_ids }, ...].
+    """
+    results = await _TMDB_TRENDING_CACHE.get_or_fetch("week", _fetch_tmdb_trending_week)
 
     items: List[Dict[str, Any]] = []
     max_items = max(limit * 3, limit)
@@ -194,11 +337,10 @@ async def _fetch_tmdb_trending_candidates(
         if allowed_langs and lang not in allowed_langs:
             continue
 
-        genre_ids = row.get("genre_ids") or []
-        gid_set = set(int(g) for g in genre_ids if isinstance(g, int))
+        gid_set = frozenset(g for g in row.get("genre_ids") or () if isinstance(g, int))
 
         # Drop Talk / Soap
-        if 10767 in gid_set or 10766 in gid_set:
+        if not gid_set.isdisjoint(_TALK_SOAP_IDS):
             continue
 
         # Require at least one overlapping genre if we have a profile
@@ -214,7 +356,13 @@ async def _fetch_tmdb_trending_candidates(
         base = math.log10(1.0 + max(pop, 0.0))
         score_raw = 0.3 + 0.4 * base  # trending should be a nudge
 
-        items.append({"tmdb_id": tid, "score_raw": score_raw, "source": "tmdb_trending"})
+        items.append({
+            "tmdb_id": tid,
+            "score_raw": score_raw,
+            "source": "tmdb_trending",
+            "original_language": lang,
+            "genre_ids": row.get("genre_ids") or [],
+        })
         if len(items) >= max_items:
             break
 
@@ -225,26 +373,36 @@ async def _fetch_tmdb_trending_candidates(
 # DB helpers
 # ---------------------------------------------------------------------------
 
+_SQL_EXCLUSION_IDS = text(
+    """
+    SELECT 'f' AS kind, tmdb_id FROM user_favorites WHERE user_id = :uid
+    UNION ALL
+    SELECT 'n' AS kind, tmdb_id FROM not_interested WHERE user_id = :uid
+    """
+)
+
+
 async def _get_block_ids(session: AsyncSession, user_id: int) -> set[int]:
     """
     IDs we must NOT recommend:
       - user_favorites.tmdb_id
       - not_interested.tmdb_id
+
+    Served from the per-user Redis id sets (dropped on every favourite /
+    not-interested write) when present; the DB is only read on a miss.
     """
-    sql = text(
-        """
-        SELECT tmdb_id
-        FROM user_favorites
-        WHERE user_id = :uid
-        UNION
-        SELECT tmdb_id
-        FROM not_interested
-        WHERE user_id = :uid
-        """
-    )
-    res = await session.execute(sql, {"uid": user_id})
-    rows = res.mappings().all()
-    return {int(r["tmdb_id"]) for r in rows if r.get("tmdb_id") is not None}
+    sets = await user_cache.get_exclusion_sets(user_id)
+    if sets is not None:
+        fav_ids, blocked_ids = sets
+        return fav_ids | blocked_ids
+
+    fav_ids, blocked_ids = set(), set()
+    res = await session.execute(_SQL_EXCLUSION_IDS, {"uid": user_id})
+    for kind, tid in res.all():
+        if tid is not None:
+            (fav_ids if kind == "f" else blocked_ids).add(int(tid))
+    await user_cache.set_exclusion_sets(user_id, fav_ids, blocked_ids)
+    return fav_ids | blocked_ids
 
 
 async def _fetch_user_favorites(session: AsyncSession, user_id: int) -> List[int]:
@@ -277,8 +435,9 @@ async def _fetch_reddit_candidates_from_pairs(
     block_ids: set[int],
 ) -> List[Dict[str, Any]]:
     """
-    Build reddit candidates using the existing global reddit_pairs table,
-    using the user's favourites as anchors.
+    Build reddit candidates using the existing global reddit_pairs table
+    (read through its symmetric mirror reddit_pairs_sym), using the user's
+    favourites as anchors.
 
     This replaces the old user_reddit_pairs dependency (which may not exist).
     """
@@ -288,27 +447,31 @@ async def _fetch_reddit_candidates_from_pairs(
     raw_limit = max(limit * 6, limit * 3, limit)
 
     # We use expanding IN (...) params to avoid asyncpg ARRAY/ANY edge cases.
+    # Blocked ids and non-positive weights are dropped before the LIMIT, so
+    # only rows we actually keep cross the wire.
     sql = text(
         """
-        SELECT
-            CASE
-                WHEN rp.tmdb_id_a IN (:favs) THEN rp.tmdb_id_b
-                ELSE rp.tmdb_id_a
-            END AS tmdb_id,
-            SUM(rp.pair_weight) AS weight
-        FROM reddit_pairs rp
-        WHERE (rp.tmdb_id_a IN (:favs) OR rp.tmdb_id_b IN (:favs))
+        SELECT ps.other_id AS tmdb_id, SUM(ps.pair_weight) AS weight
+        FROM reddit_pairs_sym ps
+        WHERE ps.tmdb_id IN (:favs)
+          AND ps.other_id NOT IN (:exclude)
         GROUP BY 1
-        ORDER BY weight DESC NULLS LAST
+        HAVING SUM(ps.pair_weight) > 0
+        ORDER BY weight DESC
         LIMIT :limit
         """
     ).bindparams(
         bindparam("favs", expanding=True),
+        bindparam("exclude", expanding=True),
         bindparam("limit"),
     )
 
     try:
-        res = await session.execute(sql, {"favs": fav_ids, "limit": raw_limit})
+        res = await session.execute(
+            sql,
+            # deduped + sorted so the planner gets one value per id
+            {"favs": sorted(set(fav_ids)), "exclude": sorted(block_ids), "limit": raw_limit},
+        )
     except Exception:
         # If table doesn't exist or SQL error, just skip reddit influence
         try:
@@ -318,84 +481,181 @@ async def _fetch_reddit_candidates_from_pairs(
         log.exception("reddit_pairs query failed; skipping reddit candidates")
         return []
 
-    rows = res.mappings().all()
-    items: List[Dict[str, Any]] = []
+    items: List[Dict[str, Any]] = [
+        {"tmdb_id": int(tid), "score_raw": float(w), "source": "reddit_pairs"}
+        for tid, w in res.all()
+    ]
+    return items
 
-    for r in rows:
-        tid = r.get("tmdb_id")
-        if tid is None:
-            continue
-        try:
-            tid_i = int(tid)
-        except Exception:
-            continue
-        if tid_i in block_ids:
-            continue
-        w = r.get("weight") or 0.0
-        try:
-            w_f = float(w)
-        except Exception:
-            w_f = 0.0
-        if w_f <= 0:
-            continue
 
-        items.append({"tmdb_id": tid_i, "score_raw": w_f, "source": "reddit_pairs"})
 
-        if len(items) >= raw_limit:
-            break
+# Favourites (in id order), not-interested ids and the reddit candidates in
+# one round trip; `seq` carries each part's order through the UNION ALL.
+_SQL_USER_BUNDLE = text(
+    """
+    WITH favs AS (
+        SELECT id, tmdb_id FROM user_favorites WHERE user_id = :uid
+    ),
+    hidden AS (
+        SELECT tmdb_id FROM not_interested WHERE user_id = :uid
+    ),
+    reddit AS (
+        SELECT ps.other_id AS tmdb_id, SUM(ps.pair_weight) AS weight
+        FROM reddit_pairs_sym ps
+        WHERE ps.tmdb_id IN (SELECT tmdb_id FROM favs)
+          AND NOT EXISTS (SELECT 1 FROM favs f WHERE f.tmdb_id = ps.other_id)
+          AND NOT EXISTS (SELECT 1 FROM hidden h WHERE h.tmdb_id = ps.other_id)
+        GROUP BY 1
+        HAVING SUM(ps.pair_weight) > 0
+        ORDER BY weight DESC
+        LIMIT :limit
+    )
+    SELECT kind, tmdb_id, w FROM (
+        SELECT 'f' AS kind, tmdb_id, NULL::double precision AS w, id AS seq FROM favs
+        UNION ALL
+        SELECT 'n', tmdb_id, NULL, 0 FROM hidden
+        UNION ALL
+        SELECT 'r', tmdb_id, weight, ROW_NUMBER() OVER (ORDER BY weight DESC) FROM reddit
+    ) u
+    ORDER BY kind, seq
+    """
+)
 
-    return items
+# Same, for when the exclusion sets are already cached: the not-interested
+# ids come from Redis (bound as :exclude) instead of being read back.
+_SQL_USER_FAVS_REDDIT = text(
+    """
+    WITH favs AS (
+        SELECT id, tmdb_id FROM user_favorites WHERE user_id = :uid
+    ),
+    reddit AS (
+        SELECT ps.other_id AS tmdb_id, SUM(ps.pair_weight) AS weight
+        FROM reddit_pairs_sym ps
+        WHERE ps.tmdb_id IN (SELECT tmdb_id FROM favs)
+          AND NOT EXISTS (SELECT 1 FROM favs f WHERE f.tmdb_id = ps.other_id)
+          AND ps.other_id NOT IN (:exclude)
+        GROUP BY 1
+        HAVING SUM(ps.pair_weight) > 0
+        ORDER BY weight DESC
+        LIMIT :limit
+    )
+    SELECT kind, tmdb_id, w FROM (
+        SELECT 'f' AS kind, tmdb_id, NULL::double precision AS w, id AS seq FROM favs
+        UNION ALL
+        SELECT 'r', tmdb_id, weight, ROW_NUMBER() OVER (ORDER BY weight DESC) FROM reddit
+    ) u
+    ORDER BY kind, seq
+    """
+).bindparams(bindparam("exclude", expanding=True))
+
+
+async def _load_user_bundle(
+    session: AsyncSession,
+    user_id: int,
+    limit: int,
+) -> tuple[List[int], set[int], List[Dict[str, Any]]]:
+    """
+    (favourite ids, block ids, reddit candidates) for get_recs_v3.
+
+    One statement instead of block ids → favourites → reddit pairs. The
+    not-interested ids come from the cached exclusion sets when present
+    (only read from the DB, and cached, on a miss). If the statement fails
+    (e.g. the pairs mirror isn't migrated yet) fall back to the separate
+    helpers, which skip reddit candidates on error.
+    """
+    sets = await user_cache.get_exclusion_sets(user_id)
+    try:
+        if sets is None:
+            res = await session.execute(_SQL_USER_BUNDLE, {"uid": user_id, "limit": limit * 6})
+        else:
+            res = await session.execute(
+                _SQL_USER_FAVS_REDDIT,
+                {"uid": user_id, "limit": limit * 6, "exclude": sorted(sets[1])},
+            )
+        fav_ids: List[int] = []
+        hidden_ids: set[int] = set()
+        reddit: List[Dict[str, Any]] = []
+        for kind, tid, w in res:
+            if tid is None:
+                continue
+            if kind == "r":
+                reddit.append({"tmdb_id": int(tid), "score_raw": float(w), "source": "reddit_pairs"})
+            elif kind == "f":
+                fav_ids.append(int(tid))
+            else:
+                hidden_ids.add(int(tid))
+    except Exception:
+        log.exception("recs v3 user bundle query failed; using separate queries")
+        await session.rollback()
+    else:
+        if sets is None:
+            await user_cache.set_exclusion_sets(user_id, fav_ids, hidden_ids)
+        else:
+            hidden_ids = sets[0] | sets[1]
+        return fav_ids, set(fav_ids) | hidden_ids, reddit
+
+    block_ids = await _get_block_ids(session, user_id)
+    fav_ids = await _fetch_user_favorites(session, user_id)
+    reddit = await _fetch_reddit_candidates_from_pairs(session, fav_ids, limit, block_ids)
+    return fav_ids, block_ids, reddit
 
 
 # ---------------------------------------------------------------------------
 # Scoring & MMR
 # ---------------------------------------------------------------------------
 
-def _normalise(vals: List[float]) -> List[float]:
-    if not vals:
-        return []
-    vmax = max(vals)
+def _normalise(vals: np.ndarray) -> np.ndarray:
+    """Scale by the max into [0, 1], negatives clamped to 0; all zeros if nothing is positive."""
+    if not vals.size:
+        return vals
+    vmax = vals.max()
     if vmax <= 0:
-        return [0.0 for _ in vals]
-    return [v / vmax for v in vals]
+        return np.zeros_like(vals)
+    # one output array: clamp into it, then scale in place
+    out = np.maximum(vals, 0.0)
+    out /= vmax
+    return out
 
 
-def _tmdb_quality(item: Dict[str, Any]) -> float:
+def _float_column(items: List[Dict[str, Any]], key: str) -> np.ndarray:
+    """items[*][key] as float64; missing / unparseable / NaN values become 0.0."""
+    raw = [it.get(key) or 0.0 for it in items]
+    try:
+        col = np.asarray(raw, dtype=np.float64)
+    except (TypeError, ValueError):
+        # odd payload (e.g. a non-numeric string): coerce one by one
+        col = np.empty(len(raw), dtype=np.float64)
+        for i, x in enumerate(raw):
+            try:
+                col[i] = float(x)
+            except Exception:
+                col[i] = 0.0
+    return np.nan_to_num(col, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _tmdb_quality_batch(items: List[Dict[str, Any]]) -> np.ndarray:
     """
-    TMDB quality heuristic.
+    TMDB quality heuristic for a batch of items.
 
     - confidence-adjusted rating (vote_average + vote_count)
     - plus log-squashed popularity bonus
     """
-    va = item.get("vote_average") or 0.0
-    vc = item.get("vote_count") or 0
-    pop = item.get("popularity") or 0.0
-
-    try:
-        va = float(va)
-    except Exception:
-        va = 0.0
-    try:
-        vc = float(vc)
-    except Exception:
-        vc = 0.0
-    try:
-        pop = float(pop)
-    except Exception:
-        pop = 0.0
+    R = np.maximum(_float_column(items, "vote_average"), 0.0)
+    v = np.maximum(_float_column(items, "vote_count"), 0.0)
+    pop = np.maximum(_float_column(items, "popularity"), 0.0)
 
     C = 6.5
     m = 50.0
-    v = max(vc, 0.0)
-    R = max(va, 0.0)
+    rating_conf = np.where(v > 0, (v / (v + m)) * R + (m / (v + m)) * C, 0.0)
+
+    return rating_conf + 0.5 * np.log10(1.0 + pop)
 
-    if v <= 0:
-        rating_conf = 0.0
-    else:
-        rating_conf = (v / (v + m)) * R + (m / (v + m)) * C
 
-    pop_term = math.log10(1.0 + max(pop, 0.0))
-    return float(rating_conf + 0.5 * pop_term)
+def _and_join(items: List[str]) -> str:
+    """["A"] → "A", ["A", "B", "C"] → "A, B and C"."""
+    if len(items) == 1:
+        return items[0]
+    return " and ".join((", ".join(items[:-1]), items[-1]))
 
 
 def _similarity(a: Dict[str, Any], b: Dict[str, Any]) -> float:
@@ -427,37 +687,234 @@ def _similarity(a: Dict[str, Any], b: Dict[str, Any]) -> float:
     return float(max(0.0, min(base, 1.0)))
 
 
-def _mmr_diversify(items: List[Dict[str, Any]], k: int, mmr_lambda: float) -> List[Dict[str, Any]]:
+# Candidate merge priority when sources overlap on a tmdb_id (higher wins).
+_SOURCE_PRIORITY = {"tmdb_trending": 0, "tmdb_discover": 1, "tmdb_recs": 2, "reddit_pairs": 3}
+
+# Talk and Soap: never recommended. They own the first two bits of every
+# genre bit map (see _new_genre_bits), so the drop is a single AND.
+_TALK_SOAP_IDS = frozenset({10767, 10766})
+_TALK_SOAP_MASK = 0b11
+
+
+def _new_genre_bits() -> Dict[Any, int]:
+    """Fresh genre id → bit map, with Talk/Soap pre-assigned to _TALK_SOAP_MASK."""
+    return {10767: 0, 10766: 1}
+
+
+def _listing_filtered_out(meta: Dict[str, Any], allowed_langs: set[str]) -> bool:
+    """
+    Step 9's language + Talk/Soap filter applied to a TMDB list row
+    (recommendations / trending), which already carries original_language
+    and genre_ids — lets a candidate be dropped before its details fetch.
+    """
+    if allowed_langs and meta.get("original_language") not in allowed_langs:
+        return True
+    return not _TALK_SOAP_IDS.isdisjoint(meta.get("genre_ids") or ())
+
+
+def _genre_mask(genre_ids: Iterable[Any], bits: Dict[Any, int]) -> int:
+    """
+    Encode genre ids as an int bitmask. ``bits`` maps genre id → bit
+    position and is extended in place, so masks built with the same dict
+    are comparable.
+    """
+    m = 0
+    for g in genre_ids:
+        b = bits.get(g)
+        if b is None:
+            b = bits[g] = len(bits)
+        m |= 1 << b
+    return m
+
+
+def _genre_masks(items: List[Dict[str, Any]], bits: Dict[Any, int]) -> List[int]:
+    """_genre_mask of each item's genre_ids."""
+    return [_genre_mask(it.get("genre_ids") or (), bits) for it in items]
+
+
+def _mask_similarity(ma: int, mb: int, la: Any, lb: Any) -> float:
+    """_similarity on precomputed genre bitmasks + languages (same result)."""
+    if not ma or not mb:
+        base = 0.0
+    else:
+        inter = (ma & mb).bit_count()
+        union = (ma | mb).bit_count() or 1
+        base = inter / union
+
+        # Penalise very weak matches (only 1 overlapping genre)
+        if inter == 1:
+            base *= 0.6
+        elif inter >= 3:
+            base *= 1.1
+
+    if la and lb and la == lb:
+        base += 0.1
+
+    return float(max(0.0, min(base, 1.0)))
+
+
+def _mmr_diversify(
+    items: List[Dict[str, Any]],
+    k: int,
+    mmr_lambda: float,
+    masks: Optional[List[int]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Greedy MMR: rel = item score, penalty = max _similarity to the picked set.
+    Pass ``masks`` (parallel to ``items``) to reuse masks the caller built.
+    """
     if not items or k <= 0:
         return []
+    if masks is None:
+        masks = _genre_masks(items, {})
+    order = _mmr_select(
+        [float(it.get("score", 0.0)) for it in items],
+        masks,
+        [it.get("original_language") for it in items],
+        k,
+        mmr_lambda,
+    )
+    return [items[i] for i in order]
+
 
-    remaining = list(items)
-    selected: List[Dict[str, Any]] = []
+def _mmr_select(
+    rels: List[float],
+    masks: List[int],
+    langs: List[Any],
+    k: int,
+    mmr_lambda: float,
+) -> List[int]:
+    """
+    _mmr_diversify on parallel columns (relevance, genre bitmask, language);
+    returns the picked indices in order.
 
-    while remaining and len(selected) < k:
-        best_item = None
-        best_score = None
+    Each candidate's max similarity to the selected set is updated only
+    against the item just picked, so a run is O(k·n) cheap int ops instead
+    of O(k²·n) set-building calls. The next pick comes off a lazily
+    re-scored heap instead of a full rescan.
+    """
+    n = len(rels)
+    # similarities are clamped to [0, 1], so 0.0 == "nothing selected yet"
+    best_sim = [0.0] * n
+    alive = bytearray(b"\x01") * n
+    selected: List[int] = []
+    keep = 1.0 - mmr_lambda
+
+    # Max-heap of (-mmr score, index, best_sim it was scored with). Scores
+    # only ever drop, so an entry whose best_sim is current is the true max;
+    # stale ones are re-scored when they surface (lazy deletion). Ties pop
+    # the lowest index first, same as the old first-max-wins scan.
+    heap = [(-mmr_lambda * rels[i], i, 0.0) for i in range(n)]
+    heapq.heapify(heap)
+
+    while heap and len(selected) < k:
+        _, best_i, sim_at = heapq.heappop(heap)
+        if not alive[best_i]:
+            continue
+        if sim_at != best_sim[best_i]:
+            sim_now = best_sim[best_i]
+            heapq.heappush(heap, (-(mmr_lambda * rels[best_i] - keep * sim_now), best_i, sim_now))
+            continue
 
-        for cand in remaining:
-            rel = float(cand.get("score", 0.0))
-            if not selected:
-                div_penalty = 0.0
-            else:
-                div_penalty = max(_similarity(cand, s) for s in selected)
+        selected.append(best_i)
+        alive[best_i] = 0
 
-            mmr_score = mmr_lambda * rel - (1.0 - mmr_lambda) * div_penalty
+        mj, lj = masks[best_i], langs[best_i]
+        for i in range(n):
+            if alive[i]:
+                sim = _mask_similarity(masks[i], mj, langs[i], lj)
+                if sim > best_sim[i]:
+                    best_sim[i] = sim
 
-            if best_score is None or mmr_score > best_score:
-                best_score = mmr_score
-                best_item = cand
+    return selected
 
-        if best_item is None:
-            break
 
-        selected.append(best_item)
-        remaining = [c for c in remaining if c["tmdb_id"] != best_item["tmdb_id"]]
+def _score_and_diversify(
+    items: List[Dict[str, Any]],
+    item_gsets: List[frozenset],
+    item_masks: List[int],
+    fav_details: List[Dict[str, Any]],
+    genre_bits: Dict[Any, int],
+    fav_genre_counts: Dict[int, int],
+    fav_genre_norm: float,
+    score_weights: Dict[str, float],
+    limit: int,
+    mmr_lambda: float,
+) -> List[Dict[str, Any]]:
+    """
+    Steps 10 + 12 of get_recs_v3: reddit / TMDB / personal score vectors,
+    the weighted combination and MMR (or plain top-N). Synchronous and
+    CPU-only so it can run via asyncio.to_thread; ``items`` aren't mutated.
+    """
+    # 10) Build Reddit + TMDB score vectors and personalisation. Per-item
+    # fields are read into columns once; everything below scans by index.
+    n = len(items)
+    langs = [it.get("original_language") for it in items]
+    # preallocated, filled by index
+    fav_sim_vals = [0.0] * n
+    taste_sim_vals = [0.0] * n
+
+    # Favourite genres as bitmasks once (same bit map as the candidates),
+    # so favourite-similarity is a few int ops per pair, not set builds.
+    fav_sigs = list(zip(
+        _genre_masks(fav_details, genre_bits),
+        [f.get("original_language") for f in fav_details],
+    ))
+
+    for i, (cand_lang, cand_gset, cand_mask) in enumerate(zip(langs, item_gsets, item_masks)):
+        # Personalisation:
+        #  (a) max similarity to any favourite
+        if fav_sigs:
+            best_sim = max(_mask_similarity(cand_mask, fm, cand_lang, fl) for fm, fl in fav_sigs)
+        else:
+            best_sim = 0.0
 
-    return selected
+        #  (b) taste-vector similarity (genre profile vs candidate genres)
+        if fav_genre_counts and cand_gset:
+            num = sum(fav_genre_counts.get(g, 0) for g in cand_gset)
+            denom = fav_genre_norm * math.sqrt(len(cand_gset))
+            taste_sim = num / denom if denom > 0 else 0.0
+        else:
+            taste_sim = 0.0
+
+        fav_sim_vals[i] = best_sim
+        taste_sim_vals[i] = float(max(0.0, min(taste_sim, 1.0)))
+
+    # Reddit score: log-squashed score_raw
+    reddit_norm = _normalise(np.log10(1.0 + np.maximum(_float_column(items, "score_raw"), 0.0)))
+    # TMDB quality, one vector expression over the whole batch
+    tmdb_norm = _normalise(_tmdb_quality_batch(items))
+    personal_raw = 0.7 * np.asarray(fav_sim_vals, dtype=np.float64) + 0.3 * np.asarray(
+        taste_sim_vals, dtype=np.float64
+    )
+    personal_norm = _normalise(personal_raw)
+
+    w_tmdb_eff = score_weights["tmdb"]
+    w_reddit_eff = score_weights["reddit"]
+    w_personal_eff = score_weights["personal"]
+    scores = (w_reddit_eff * reddit_norm) + (w_tmdb_eff * tmdb_norm) + (w_personal_eff * personal_norm)
+
+    # output dicts are only built for the winners
+    def _enriched(i: int) -> Dict[str, Any]:
+        enriched = dict(items[i])
+        enriched["fav_similarity"] = fav_sim_vals[i]
+        enriched["taste_profile_sim"] = taste_sim_vals[i]
+        enriched["score_reddit"] = float(reddit_norm[i])
+        enriched["score_tmdb"] = float(tmdb_norm[i])
+        enriched["score_personal"] = float(personal_norm[i])
+        enriched["score"] = float(scores[i])
+        enriched["score_weights"] = dict(score_weights)
+        return enriched
+
+    # 12) Diversity (MMR) + final top-N. MMR picks and orders the items when
+    # there are more candidates than slots; a pool that fits in `limit` skips
+    # MMR and is returned in plain score order instead of diversified order.
+    if 0.0 < mmr_lambda < 1.0 and len(items) > limit:
+        top = _mmr_select(scores.tolist(), item_masks, langs, limit, mmr_lambda)
+    else:
+        # stable descending order == sorted(..., reverse=True)[:limit]
+        top = np.argsort(-scores, kind="stable")[:limit]
+    return [_enriched(int(i)) for i in top]
 
 
 # ---------------------------------------------------------------------------
@@ -469,7 +926,7 @@ async def diag_ez() -> Dict[str, Any]:
     return {"ok": True, "who": "recs_v3"}
 
 
-@router.get("/{user_id}")
+@router.get("/{user_id}", response_class=ORJSONResponse)
 async def get_recs_v3(
     user_id: int,
     limit: int = Query(36, ge=1, le=200),
@@ -497,11 +954,11 @@ async def get_recs_v3(
       - combine with weights + optional MMR diversity
     """
     try:
-        # 1) Blocked IDs (favourites + not-interested)
-        block_ids = await _get_block_ids(session, user_id)
-
-        # 2) User favourites (for personalisation + TMDB recs/profile)
-        fav_ids = await _fetch_user_favorites(session, user_id)
+        # 1) Blocked IDs (favourites + not-interested),
+        # 2) user favourites (for personalisation + TMDB recs/profile) and
+        # 3) reddit candidates (global reddit_pairs anchored on favourites),
+        #    all in one DB round trip
+        fav_ids, block_ids, reddit_base = await _load_user_bundle(session, user_id, limit)
 
         # ---- Gate: require a minimum number of favourites ----
         if len(fav_ids) < MIN_FAVORITES:
@@ -522,11 +979,19 @@ async def get_recs_v3(
                 },
             }
 
-        # 3) Reddit candidates (from global reddit_pairs anchored on favourites)
-        reddit_base = await _fetch_reddit_candidates_from_pairs(session, fav_ids, limit, block_ids)
-
-        # 4) Favourite details for language/genre profile
-        fav_details: List[Dict[str, Any]] = await asyncio.gather(*[_tmdb_details(fid) for fid in fav_ids])
+        # 4) Favourite details for the language/genre profile and
+        # 5) TMDB recs from favourites don't depend on each other: two TMDb
+        #    fan-outs, awaited together. With RECS_V3_TMDB_DISCOVER on, the
+        #    recs depend on the profile and move to step 6.
+        fav_details_coro = asyncio.gather(*[_tmdb_details(fid) for fid in fav_ids])
+        if RECS_V3_TMDB_DISCOVER:
+            fav_details = await fav_details_coro
+            tmdb_base: List[Dict[str, Any]] = []
+        else:
+            fav_details, tmdb_base = await asyncio.gather(
+                fav_details_coro,
+                _fetch_tmdb_candidates(fav_ids, block_ids, limit),
+            )
 
         # Language profile
         allowed_langs = {d.get("original_language") for d in fav_details if d.get("original_language")}
@@ -543,28 +1008,47 @@ async def get_recs_v3(
         fav_genres_all = set(fav_genre_counts.keys())
         fav_genre_norm = math.sqrt(sum(c * c for c in fav_genre_counts.values())) or 1.0
 
-        # 5) TMDB recs from favourites
-        tmdb_base = await _fetch_tmdb_candidates(fav_ids, block_ids, limit)
-
-        # 6) TMDB trending, filtered by taste
-        trending_base = await _fetch_tmdb_trending_candidates(
+        # 6) TMDB trending, filtered by taste (+ discover / recs under the flag)
+        discover_base: List[Dict[str, Any]] = []
+        trending_coro = _fetch_tmdb_trending_candidates(
             allowed_langs=allowed_langs,
             fav_genres=fav_genres_all,
             block_ids=block_ids,
             limit=limit,
         )
+        if not RECS_V3_TMDB_DISCOVER:
+            trending_base = await trending_coro
+        elif fav_genre_counts and allowed_langs:
+            # usable profile: one discover call + recs for the favourites
+            # whose genres best match it
+            on_profile = sorted(
+                range(len(fav_ids)),
+                key=lambda i: -sum(fav_genre_counts.get(g, 0) for g in fav_details[i].get("genre_ids") or ()),
+            )
+            top_favs = [fav_ids[i] for i in on_profile[:DISCOVER_RECS_FAVS]]
+            trending_base, discover_base, tmdb_base = await asyncio.gather(
+                trending_coro,
+                _fetch_tmdb_discover_candidates(allowed_langs, fav_genre_counts, block_ids, limit),
+                _fetch_tmdb_candidates(top_favs, block_ids, limit),
+            )
+        else:
+            # thin profile: discover has nothing to go on, keep per-fav recs
+            trending_base, tmdb_base = await asyncio.gather(
+                trending_coro,
+                _fetch_tmdb_candidates(fav_ids, block_ids, limit),
+            )
 
-        # 7) Merge & dedupe by tmdb_id (priority: reddit > tmdb recs > trending)
-        by_id: Dict[int, Dict[str, Any]] = {}
-
-        for item in trending_base:
-            by_id[item["tmdb_id"]] = item
-        for item in tmdb_base:
-            by_id[item["tmdb_id"]] = item
-        for item in reddit_base:
-            by_id[item["tmdb_id"]] = item
-
-        base = list(by_id.values())
+        # 7) Merge & dedupe by tmdb_id (priority: reddit > tmdb recs > discover > trending)
+        # in one pass; first-seen order, same-or-higher priority replaces
+        # (exactly what overwriting list by list used to produce)
+        by_id: Dict[int, tuple[int, Dict[str, Any]]] = {}
+        for item in itertools.chain(trending_base, discover_base, tmdb_base, reddit_base):
+            prio = _SOURCE_PRIORITY[item["source"]]
+            cur = by_id.get(item["tmdb_id"])
+            if cur is None or prio >= cur[0]:
+                by_id[item["tmdb_id"]] = (prio, item)
+
+        base = [item for _, item in by_id.values()]
         if not base:
             if flat:
                 return []
@@ -582,13 +1066,37 @@ async def get_recs_v3(
                 },
             }
 
-        # 8) Fetch TMDB details for candidates
-        tmdb_ids = [b["tmdb_id"] for b in base]
-        details_list = await asyncio.gather(*[_tmdb_details(tid) for tid in tmdb_ids])
+        # 8) Fetch TMDB details for candidates. Candidates whose TMDB list
+        # row (their own, or the trending/recs row for a reddit candidate)
+        # already fails step 9's filters are held back: they only get
+        # details if the unfiltered fallback below needs them.
+        listing: Dict[int, Dict[str, Any]] = {
+            row["id"]: row
+            for row in _TMDB_TRENDING_CACHE.get("week") or ()
+            if isinstance(row.get("id"), int)
+        }
+        for item in itertools.chain(discover_base, tmdb_base):
+            listing[item["tmdb_id"]] = item
+
+        fetch_base: List[Dict[str, Any]] = []
+        held_base: List[Dict[str, Any]] = []
+        for b in base:
+            meta = b if "genre_ids" in b else listing.get(b["tmdb_id"])
+            if meta is not None and _listing_filtered_out(meta, allowed_langs):
+                held_base.append(b)
+            else:
+                fetch_base.append(b)
 
-        # 9) Merge base scores + details, applying language + genre filters
+        details_list = await asyncio.gather(*[_tmdb_details(b["tmdb_id"]) for b in fetch_base])
+
+        # 9) Merge base scores + details, applying language + genre filters.
+        # Each candidate's genres are normalised once here (frozenset for the
+        # taste profile, bitmask for similarity / MMR) and reused below.
+        genre_bits = _new_genre_bits()
         items: List[Dict[str, Any]] = []
-        for base_item, det in zip(base, details_list):
+        item_gsets: List[frozenset] = []
+        item_masks: List[int] = []
+        for base_item, det in zip(fetch_base, details_list):
             merged = dict(det or {})
             merged.setdefault("tmdb_id", base_item["tmdb_id"])
             merged["score_raw"] = float(base_item.get("score_raw") or 0.0)
@@ -598,68 +1106,34 @@ async def get_recs_v3(
             if allowed_langs and lang not in allowed_langs:
                 continue
 
-            genre_ids = merged.get("genre_ids") or []
-            gid_set = set(int(g) for g in genre_ids if isinstance(g, int))
+            gset = frozenset(merged.get("genre_ids") or ())
+            mask = _genre_mask(gset, genre_bits)
 
             # Drop Talk (10767) and Soap (10766)
-            if 10767 in gid_set or 10766 in gid_set:
+            if mask & _TALK_SOAP_MASK:
                 continue
 
             items.append(merged)
+            item_gsets.append(gset)
+            item_masks.append(mask)
 
         # If filters removed everything, fall back to unfiltered merged candidates
         if not items:
-            for base_item, det in zip(base, details_list):
+            held_details = await asyncio.gather(*[_tmdb_details(b["tmdb_id"]) for b in held_base])
+            det_by_id = {
+                b["tmdb_id"]: det
+                for b, det in zip(fetch_base + held_base, list(details_list) + list(held_details))
+            }
+            for base_item in base:
+                det = det_by_id[base_item["tmdb_id"]]
                 merged = dict(det or {})
                 merged.setdefault("tmdb_id", base_item["tmdb_id"])
                 merged["score_raw"] = float(base_item.get("score_raw") or 0.0)
                 merged["source"] = base_item.get("source", "reddit_pairs")
+                gset = frozenset(merged.get("genre_ids") or ())
                 items.append(merged)
-
-        # 10) Build Reddit + TMDB score vectors and personalisation
-        reddit_vals: List[float] = []
-        tmdb_vals: List[float] = []
-        personal_raw_vals: List[float] = []
-
-        for it in items:
-            # Reddit score: log-squashed score_raw
-            try:
-                raw = float(it.get("score_raw") or 0.0)
-            except Exception:
-                raw = 0.0
-            reddit_vals.append(math.log10(1.0 + max(raw, 0.0)))
-
-            # TMDB quality
-            tmdb_vals.append(_tmdb_quality(it))
-
-            # Personalisation:
-            #  (a) max similarity to any favourite
-            if fav_details:
-                best_sim = max(_similarity(it, f) for f in fav_details)
-            else:
-                best_sim = 0.0
-
-            #  (b) taste-vector similarity (genre profile vs candidate genres)
-            genre_ids = it.get("genre_ids") or []
-            cand_gids = [int(g) for g in genre_ids if isinstance(g, int)]
-            if fav_genre_counts and cand_gids:
-                num = sum(fav_genre_counts.get(g, 0) for g in cand_gids)
-                denom = fav_genre_norm * math.sqrt(len(cand_gids) or 1)
-                taste_sim = num / denom if denom > 0 else 0.0
-            else:
-                taste_sim = 0.0
-
-            taste_sim = float(max(0.0, min(taste_sim, 1.0)))
-            personal_raw = 0.7 * best_sim + 0.3 * taste_sim
-
-            it["fav_similarity"] = best_sim
-            it["taste_profile_sim"] = taste_sim
-
-            personal_raw_vals.append(personal_raw)
-
-        reddit_norm = _normalise(reddit_vals)
-        tmdb_norm = _normalise(tmdb_vals)
-        personal_norm = _normalise(personal_raw_vals)
+                item_gsets.append(gset)
+                item_masks.append(_genre_mask(gset, genre_bits))
 
         # 11) Weighting
         total_w = w_tmdb + w_reddit + w_personal
@@ -670,31 +1144,24 @@ async def get_recs_v3(
             total_w = 1.0
 
         scale = 1.0 / total_w
-        w_tmdb_eff = w_tmdb * scale
-        w_reddit_eff = w_reddit * scale
-        w_personal_eff = w_personal * scale
-
-        combined_items: List[Dict[str, Any]] = []
-        for it, r_n, t_n, p_n in zip(items, reddit_norm, tmdb_norm, personal_norm):
-            score_reddit = r_n
-            score_tmdb = t_n
-            score_personal = p_n
-
-            score = (w_reddit_eff * score_reddit) + (w_tmdb_eff * score_tmdb) + (w_personal_eff * score_personal)
-
-            enriched = dict(it)
-            enriched["score_reddit"] = score_reddit
-            enriched["score_tmdb"] = score_tmdb
-            enriched["score_personal"] = score_personal
-            enriched["score"] = score
-            enriched["score_weights"] = {"tmdb": w_tmdb_eff, "reddit": w_reddit_eff, "personal": w_personal_eff}
-            combined_items.append(enriched)
-
-        # 12) Diversity (MMR) + final top-N
-        if 0.0 < mmr_lambda < 1.0:
-            diversified = _mmr_diversify(combined_items, k=limit, mmr_lambda=mmr_lambda)
-        else:
-            diversified = sorted(combined_items, key=lambda x: float(x.get("score", 0.0)), reverse=True)[:limit]
+        score_weights = {"tmdb": w_tmdb * scale, "reddit": w_reddit * scale, "personal": w_personal * scale}
+
+        # 10) + 12) Score vectors, personalisation and MMR are pure CPU: run
+        # them on a worker thread so the event loop keeps serving other
+        # requests' TMDb / DB I/O meanwhile.
+        diversified = await asyncio.to_thread(
+            _score_and_diversify,
+            items,
+            item_gsets,
+            item_masks,
+            fav_details,
+            genre_bits,
+            fav_genre_counts,
+            fav_genre_norm,
+            score_weights,
+            limit,
+            mmr_lambda,
+        )
 
         if flat:
             return diversified
@@ -724,7 +1191,7 @@ async def get_recs_v3(
         raise HTTPException(status_code=500, detail="Internal error in recs_v3")
 
 
-@router.get("/explain/{user_id}/{tmdb_id}")
+@router.get("/explain/{user_id}/{tmdb_id}", response_class=ORJSONResponse)
 async def explain_recs_v3_for_show(
     user_id: int,
     tmdb_id: int,
@@ -769,14 +1236,9 @@ async def explain_recs_v3_for_show(
         # Pull all reddit_pairs rows that involve this tmdb_id, then intersect with favourites.
         sql = text(
             """
-            SELECT
-                CASE
-                    WHEN tmdb_id_a = :tid THEN tmdb_id_b
-                    ELSE tmdb_id_a
-                END AS other_id,
-                pair_weight
-            FROM reddit_pairs
-            WHERE tmdb_id_a = :tid OR tmdb_id_b = :tid
+            SELECT other_id, pair_weight
+            FROM reddit_pairs_sym
+            WHERE tmdb_id = :tid
             """
         )
         res = await session.execute(sql, {"tid": tmdb_id})
@@ -804,6 +1266,10 @@ async def explain_recs_v3_for_show(
         results = await asyncio.gather(*[_tmdb_details(fid) for fid in fav_subset], return_exceptions=True)
 
         anchors: List[Dict[str, Any]] = []
+        # ranking key per anchor (70% TMDb similarity, 30% damped reddit pair
+        # weight), computed once alongside the anchor rather than in a sort key
+        anchor_scores: List[float] = []
+        _log10 = math.log10
         for fav_id, det in zip(fav_subset, results):
             if isinstance(det, Exception):
                 continue
@@ -833,6 +1299,7 @@ async def explain_recs_v3_for_show(
                     "shared_genres": shared_genres,
                 }
             )
+            anchor_scores.append(0.7 * float(sim) + 0.3 * _log10(1.0 + max(float(pair_w), 0.0)))
 
         if not anchors:
             lines: List[str] = []
@@ -857,51 +1324,52 @@ async def explain_recs_v3_for_show(
                 "summary_lines": lines,
             }
 
-        def _combined_score(a: Dict[str, Any]) -> float:
-            sim_val = float(a.get("similarity") or 0.0)
-            pw_val = float(a.get("pair_weight") or 0.0)
-            pw_term = math.log10(1.0 + max(pw_val, 0.0))
-            return 0.7 * sim_val + 0.3 * pw_term
-
-        anchors_sorted = sorted(anchors, key=_combined_score, reverse=True)
-        top_anchors = anchors_sorted[:3]
+        top_anchors = [
+            anchors[i] for i in heapq.nlargest(3, range(len(anchors)), key=anchor_scores.__getitem__)
+        ]
 
+        # one pass over the anchors: genres, titles and running max/sum/count
         shared_genres_set: set[str] = set()
-        sims_top: List[float] = []
-        pair_top: List[float] = []
+        anchor_titles: List[str] = []
+        sim_max = sim_sum = 0.0
+        pw_max = pw_sum = 0.0
+        pw_n = 0
 
         for a in top_anchors:
             for g in a.get("shared_genres") or []:
                 if isinstance(g, str) and g:
                     shared_genres_set.add(g)
-            sims_top.append(float(a.get("similarity") or 0.0))
+            if a.get("title"):
+                anchor_titles.append(str(a.get("title")).strip())
+            sim_val = float(a.get("similarity") or 0.0)
+            sim_sum += sim_val
+            if sim_val > sim_max:
+                sim_max = sim_val
             pw_val = float(a.get("pair_weight") or 0.0)
             if pw_val > 0.0:
-                pair_top.append(pw_val)
+                pw_n += 1
+                pw_sum += pw_val
+                if pw_val > pw_max:
+                    pw_max = pw_val
 
         shared_genres = sorted(shared_genres_set)
 
+        sim_n = len(top_anchors)
         tmdb_meta = {
-            "count": len(sims_top),
-            "max": max(sims_top) if sims_top else 0.0,
-            "avg": (sum(sims_top) / len(sims_top)) if sims_top else 0.0,
+            "count": sim_n,
+            "max": sim_max,
+            "avg": (sim_sum / sim_n) if sim_n else 0.0,
         }
         reddit_meta = {
-            "count": len(pair_top),
-            "max": max(pair_top) if pair_top else 0.0,
-            "avg": (sum(pair_top) / len(pair_top)) if pair_top else 0.0,
+            "count": pw_n,
+            "max": pw_max,
+            "avg": (pw_sum / pw_n) if pw_n else 0.0,
         }
 
         summary_lines: List[str] = []
-        anchor_titles = [str(a.get("title")).strip() for a in top_anchors if a.get("title")]
 
         if anchor_titles:
-            if len(anchor_titles) == 1:
-                summary_lines.append(f"Because you liked {anchor_titles[0]}.")
-            elif len(anchor_titles) == 2:
-                summary_lines.append(f"Because you liked {anchor_titles[0]} and {anchor_titles[1]}.")
-            else:
-                summary_lines.append(f"Because you liked {anchor_titles[0]}, {anchor_titles[1]} and {anchor_titles[2]}.")
+            summary_lines.append(f"Because you liked {_and_join(anchor_titles)}.")
 
         if shared_genres:
             if len(shared_genres) == 1:
@@ -940,7 +1408,7 @@ async def explain_recs_v3_for_show(
         raise HTTPException(status_code=500, detail="Internal error in explanation engine")
 
 
-@router.get("/smart-similar/{tmdb_id}")
+@router.get("/smart-similar/{tmdb_id}", response_class=ORJSONResponse)
 async def get_smart_similar_for_show(
     tmdb_id: int,
     limit: int = Query(20, ge=1, le=50),
@@ -954,15 +1422,14 @@ async def get_smart_similar_for_show(
         return []
 
     try:
-        rec_ids = await _tmdb_recommendations_for_fav(tmdb_id, api_key, max_n=limit * 2)
-        if not rec_ids:
+        rec_rows = await _tmdb_recommendations_for_fav(tmdb_id, api_key, max_n=limit * 2)
+        if not rec_rows:
             return []
 
         seen: set[int] = set()
         ordered_ids: list[int] = []
-        for rid in rec_ids:
-            if not isinstance(rid, int):
-                continue
+        for row in rec_rows:
+            rid = row["id"]
             if rid == tmdb_id:
                 continue
             if rid in seen:
@@ -972,17 +1439,10 @@ async def get_smart_similar_for_show(
             if len(ordered_ids) >= limit * 2:
                 break
 
-        items: list[dict[str, Any]] = []
-        for rid in ordered_ids:
-            details = await _tmdb_details(rid)
-            title = details.get("title") or details.get("name")
-            if not title:
-                continue
-            items.append(details)
-            if len(items) >= limit:
-                break
-
-        return items
+        # One concurrent batch; real fetches are still capped by _TMDB_SEM
+        # and cached ids never touch the network.
+        details_list = await asyncio.gather(*[_tmdb_details(rid) for rid in ordered_ids])
+        return [d for d in details_list if d.get("title") or d.get("name")][:limit]
 
     except HTTPException:
         raise
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
+import asyncio
 import logging
 import os
 
 from fastapi import APIRouter, Depends, Query, Path, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_db
 from app.db_models import Show, RedditPost
+from app.infra.http import tmdb_client
+from app.services.ttl_cache import AsyncTTLCache
 
-import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/shows", tags=["Shows"])
@@ -64,20 +68,82 @@ def _serialize_post(p: RedditPost) -> Dict[str, Any]:
 # TMDB HELPERS
 # ---------------------------------------------------------
 
+# TMDb show payloads change on the scale of hours. Each sub-resource gets a
+# read-through cache (in-process LRU + shared Redis layer); the _fetch
+# variants below are the uncached calls. Error fallbacks aren't cached.
+TMDB_SHOW_TTL_SECONDS = 6 * 3600
+# Streaming availability changes over days: the coldest sub-resource.
+TMDB_PROVIDERS_TTL_SECONDS = 24 * 3600
+_DETAILS_CACHE = AsyncTTLCache(TMDB_SHOW_TTL_SECONDS, redis_prefix="shows:tmdb:tv:")
+_PROVIDERS_CACHE = AsyncTTLCache(
+    TMDB_PROVIDERS_TTL_SECONDS, maxsize=8192, redis_prefix="shows:tmdb:providers:"
+)
+_SIMILAR_CACHE = AsyncTTLCache(TMDB_SHOW_TTL_SECONDS, redis_prefix="shows:tmdb:similar:")
+_VIDEOS_CACHE = AsyncTTLCache(TMDB_SHOW_TTL_SECONDS, redis_prefix="shows:tmdb:videos:")
+# Holds the bounded credits below; the prefix moved so no unbounded entry
+# written before the limits were applied is ever served.
+_CREDITS_CACHE = AsyncTTLCache(TMDB_SHOW_TTL_SECONDS, redis_prefix="shows:tmdb:credits:v2:")
+
+# The cast tab shows the top-billed cast only (the front-end can still
+# slice further) and, of the crew, just the key creative roles.
+DETAILS_CAST_LIMIT = 12
+DETAILS_CREW_JOBS = frozenset({"Director", "Creator", "Executive Producer"})
+
+
 async def tmdb_fetch_details(tmdb_id: int) -> Dict[str, Any]:
     """
-    Fetch full show details from TMDB.
+    Fetch full show details from TMDB (cached).
     Used when our DB does not yet contain full metadata.
     """
+    return await _DETAILS_CACHE.get_or_fetch(
+        int(tmdb_id),
+        lambda: _tmdb_fetch_details(tmdb_id),
+        # the minimal {"tmdb_id": ...} fallback means TMDB failed
+        cacheable=lambda d: bool(d.get("title")),
+    )
+
+
+async def tmdb_fetch_watch_providers(tmdb_id: int) -> Dict[str, List[str]]:
+    """Watch providers for TMDB_REGION (cached 24h); see _tmdb_fetch_watch_providers."""
+    return await _PROVIDERS_CACHE.get_or_fetch(
+        f"{TMDB_REGION}:{int(tmdb_id)}", lambda: _tmdb_fetch_watch_providers(tmdb_id)
+    )
+
+
+async def tmdb_fetch_similar(tmdb_id: int, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Fetch similar TV shows from TMDB (cached).
+    Returns lightweight TMDB items suitable for ShowCard.
+    """
+    rows = await _SIMILAR_CACHE.get_or_fetch(int(tmdb_id), lambda: _tmdb_fetch_similar(tmdb_id))
+    return rows[:limit]
+
+
+async def tmdb_fetch_videos(tmdb_id: int) -> List[Dict[str, Any]]:
+    """TMDB videos for a show (cached); see _tmdb_fetch_videos."""
+    return await _VIDEOS_CACHE.get_or_fetch(int(tmdb_id), lambda: _tmdb_fetch_videos(tmdb_id))
+
+
+async def tmdb_fetch_credits(tmdb_id: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Top-billed cast and key crew for a show (cached); see _tmdb_fetch_credits."""
+    return await _CREDITS_CACHE.get_or_fetch(
+        int(tmdb_id),
+        lambda: _tmdb_fetch_credits(tmdb_id),
+        cacheable=lambda c: bool(c.get("cast") or c.get("crew")),
+    )
+
+
+async def _tmdb_fetch_details(tmdb_id: int) -> Dict[str, Any]:
+    """
+    Fetch full show details from TMDB (uncached).
+    Returns {"tmdb_id": ...} alone if TMDB can't be reached.
+    """
 
     if not API_KEY:
         return {"tmdb_id": tmdb_id}
 
-    url = f"{TMDB_API}/tv/{tmdb_id}?api_key={API_KEY}"
-
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url)
+        r = await tmdb_client().get(f"{TMDB_API}/tv/{tmdb_id}", params={"api_key": API_KEY})
     except Exception as e:
         logger.error(f"TMDB fetch failed for {tmdb_id}: {e}")
         return {"tmdb_id": tmdb_id}
@@ -86,8 +152,11 @@ async def tmdb_fetch_details(tmdb_id: int) -> Dict[str, Any]:
         logger.warning(f"TMDB details {tmdb_id} -> HTTP {r.status_code}")
         return {"tmdb_id": tmdb_id}
 
-    data = r.json() or {}
+    return _parse_details(tmdb_id, orjson.loads(r.content or b"{}") or {})
 
+
+def _parse_details(tmdb_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+    """TMDB /tv/{id} payload → our details dict."""
     poster_path = (data.get("poster_path") or "").lstrip("/")
     poster_url = f"{TMDB_IMG}/{poster_path}" if poster_path else None
 
@@ -117,7 +186,7 @@ async def tmdb_fetch_details(tmdb_id: int) -> Dict[str, Any]:
     }
 
 
-async def tmdb_fetch_watch_providers(tmdb_id: int) -> Dict[str, List[str]]:
+async def _tmdb_fetch_watch_providers(tmdb_id: int) -> Dict[str, List[str]]:
     """
     Fetch watch providers (where to watch) from TMDB.
 
@@ -131,11 +200,8 @@ async def tmdb_fetch_watch_providers(tmdb_id: int) -> Dict[str, List[str]]:
     if not API_KEY:
         return {}
 
-    url = f"{TMDB_API}/tv/{tmdb_id}/watch/providers?api_key={API_KEY}"
-
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url)
+        r = await tmdb_client().get(f"{TMDB_API}/tv/{tmdb_id}/watch/providers", params={"api_key": API_KEY})
     except Exception as e:
         logger.error(f"TMDB watch providers failed for {tmdb_id}: {e}")
         return {}
@@ -144,7 +210,11 @@ async def tmdb_fetch_watch_providers(tmdb_id: int) -> Dict[str, List[str]]:
         logger.warning(f"TMDB watch providers {tmdb_id} -> HTTP {r.status_code}")
         return {}
 
-    data = r.json() or {}
+    return _parse_watch_providers(orjson.loads(r.content or b"{}") or {})
+
+
+def _parse_watch_providers(data: Dict[str, Any]) -> Dict[str, List[str]]:
+    """TMDB watch/providers payload → provider names for TMDB_REGION (or US)."""
     results = data.get("results") or {}
 
     # Prefer configured region (e.g. GB), then fall back to US if present
@@ -163,19 +233,16 @@ async def tmdb_fetch_watch_providers(tmdb_id: int) -> Dict[str, List[str]]:
     }
 
 
-async def tmdb_fetch_similar(tmdb_id: int, limit: int = 20) -> List[Dict[str, Any]]:
+async def _tmdb_fetch_similar(tmdb_id: int) -> List[Dict[str, Any]]:
     """
-    Fetch similar TV shows from TMDB.
+    Fetch similar TV shows from TMDB (uncached, first page in full).
     Returns lightweight TMDB items suitable for ShowCard.
     """
     if not API_KEY:
         return []
 
-    url = f"{TMDB_API}/tv/{tmdb_id}/similar?api_key={API_KEY}"
-
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url)
+        r = await tmdb_client().get(f"{TMDB_API}/tv/{tmdb_id}/similar", params={"api_key": API_KEY})
     except Exception as e:
         logger.error(f"TMDB similar failed for {tmdb_id}: {e}")
         return []
@@ -184,11 +251,15 @@ async def tmdb_fetch_similar(tmdb_id: int, limit: int = 20) -> List[Dict[str, An
         logger.warning(f"TMDB similar {tmdb_id} -> HTTP {r.status_code}")
         return []
 
-    data = r.json() or {}
+    return _parse_similar(orjson.loads(r.content or b"{}") or {})
+
+
+def _parse_similar(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """TMDB similar payload → ShowCard-sized items."""
     results = data.get("results") or []
 
     out: List[Dict[str, Any]] = []
-    for row in results[:limit]:
+    for row in results:
         tid = row.get("id")
         if not isinstance(tid, int):
             continue
@@ -210,7 +281,7 @@ async def tmdb_fetch_similar(tmdb_id: int, limit: int = 20) -> List[Dict[str, An
     return out
 
 
-async def tmdb_fetch_videos(tmdb_id: int) -> List[Dict[str, Any]]:
+async def _tmdb_fetch_videos(tmdb_id: int) -> List[Dict[str, Any]]:
     """
     Fetch TMDB videos (trailers, teasers, etc.) for a show.
     Returns a cleaned list of video objects.
@@ -218,11 +289,8 @@ async def tmdb_fetch_videos(tmdb_id: int) -> List[Dict[str, Any]]:
     if not API_KEY:
         return []
 
-    url = f"{TMDB_API}/tv/{tmdb_id}/videos?api_key={API_KEY}"
-
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url)
+        r = await tmdb_client().get(f"{TMDB_API}/tv/{tmdb_id}/videos", params={"api_key": API_KEY})
     except Exception as e:
         logger.error(f"TMDB videos failed for {tmdb_id}: {e}")
         return []
@@ -231,7 +299,11 @@ async def tmdb_fetch_videos(tmdb_id: int) -> List[Dict[str, Any]]:
         logger.warning(f"TMDB videos {tmdb_id} -> HTTP {r.status_code}")
         return []
 
-    data = r.json() or {}
+    return _parse_videos(orjson.loads(r.content or b"{}") or {})
+
+
+def _parse_videos(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """TMDB videos payload → cleaned video objects."""
     results = data.get("results") or []
 
     videos: List[Dict[str, Any]] = []
@@ -256,19 +328,34 @@ async def tmdb_fetch_videos(tmdb_id: int) -> List[Dict[str, Any]]:
     return videos
 
 
-async def tmdb_fetch_credits(tmdb_id: int) -> Dict[str, List[Dict[str, Any]]]:
+_TRAILER_TYPES = frozenset({"Trailer", "Teaser"})
+_TRAILER_RANK_NONE = 3
+
+
+def _trailer_rank(v: Dict[str, Any]) -> int:
+    """
+    0 official YouTube trailer, 1 YouTube trailer/teaser, 2 any YouTube video,
+    3 not usable as the primary trailer.
+    """
+    if v.get("site") != "YouTube":
+        return _TRAILER_RANK_NONE
+    vtype = v.get("type")
+    if vtype == "Trailer" and v.get("official"):
+        return 0
+    return 1 if vtype in _TRAILER_TYPES else 2
+
+
+async def _tmdb_fetch_credits(tmdb_id: int) -> Dict[str, List[Dict[str, Any]]]:
     """
     Fetch cast and crew from TMDB.
-    Returns a dict with 'cast' and 'crew' lists.
+    Returns a dict with 'cast' and 'crew' lists, bounded to the first
+    DETAILS_CAST_LIMIT cast members and the DETAILS_CREW_JOBS crew.
     """
     if not API_KEY:
         return {"cast": [], "crew": []}
 
-    url = f"{TMDB_API}/tv/{tmdb_id}/credits?api_key={API_KEY}"
-
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url)
+        r = await tmdb_client().get(f"{TMDB_API}/tv/{tmdb_id}/credits", params={"api_key": API_KEY})
     except Exception as e:
         logger.error(f"TMDB credits failed for {tmdb_id}: {e}")
         return {"cast": [], "crew": []}
@@ -277,12 +364,32 @@ async def tmdb_fetch_credits(tmdb_id: int) -> Dict[str, List[Dict[str, Any]]]:
         logger.warning(f"TMDB credits {tmdb_id} -> HTTP {r.status_code}")
         return {"cast": [], "crew": []}
 
-    data = r.json() or {}
+    return _parse_credits(
+        orjson.loads(r.content or b"{}") or {},
+        cast_limit=DETAILS_CAST_LIMIT,
+        crew_jobs=DETAILS_CREW_JOBS,
+    )
+
+
+def _parse_credits(
+    data: Dict[str, Any],
+    cast_limit: Optional[int] = None,
+    crew_jobs: Optional[frozenset] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    TMDB credits payload → {"cast": [...], "crew": [...]}.
+
+    ``cast_limit`` keeps the first N named cast members (TMDB's billing
+    order) and ``crew_jobs`` keeps only crew with those jobs; the rest are
+    skipped before any dict is built.
+    """
     cast_raw = data.get("cast") or []
     crew_raw = data.get("crew") or []
 
     cast: List[Dict[str, Any]] = []
     for c in cast_raw:
+        if cast_limit is not None and len(cast) >= cast_limit:
+            break
         name = c.get("name")
         if not name:
             continue
@@ -306,6 +413,8 @@ async def tmdb_fetch_credits(tmdb_id: int) -> Dict[str, List[Dict[str, Any]]]:
         name = m.get("name")
         if not name:
             continue
+        if crew_jobs is not None and m.get("job") not in crew_jobs:
+            continue
         crew.append(
             {
                 "id": m.get("id"),
@@ -318,6 +427,14 @@ async def tmdb_fetch_credits(tmdb_id: int) -> Dict[str, List[Dict[str, Any]]]:
     return {"cast": cast, "crew": crew}
 
 
+def _result_or_default(res: Any, default: Any, tmdb_id: int) -> Any:
+    """asyncio.gather(return_exceptions=True) result, or ``default`` if it raised."""
+    if isinstance(res, BaseException):
+        logger.warning(f"TMDB fetch for {tmdb_id} raised: {res!r}")
+        return default
+    return res
+
+
 # ---------------------------------------------------------
 # ROUTES
 # ---------------------------------------------------------
@@ -332,6 +449,7 @@ async def search_shows(
     Simple substring search from local DB (orders by title).
     """
     try:
+        # substring match; served by the pg_trgm GIN index ix_shows_title_trgm
         stmt = (
             select(Show)
             .where(Show.title.ilike(f"%{q}%"))
@@ -377,7 +495,11 @@ async def show_posts(
     return [_serialize_post(p) for p in posts]
 
 
-@router.get("/details/{tmdb_id}", summary="Full details for a show")
+# Show columns that may fill gaps in the TMDB details payload.
+_LOCAL_DETAIL_KEYS = ("tmdb_id", "title", "year", "poster_url")
+
+
+@router.get("/details/{tmdb_id}", summary="Full details for a show", response_class=ORJSONResponse)
 async def show_details(
     tmdb_id: int = Path(..., ge=1),
     db: AsyncSession = Depends(get_async_db),
@@ -389,8 +511,10 @@ async def show_details(
     1. Try to load from local DB (poster_url, year, etc.)
     2. Fetch full TMDB details
     3. Fetch watch providers (where to watch)
-    4. Fetch videos (trailers) and credits (cast)
-    5. Merge everything into one JSON
+    4. Merge everything into one JSON
+
+    Videos / trailer and cast are fetched on demand from
+    /{tmdb_id}/videos and /{tmdb_id}/credits.
     """
 
     # --- Step 1: Try local database ---
@@ -400,75 +524,40 @@ async def show_details(
     except Exception:
         row = None
 
-    local: Dict[str, Any] = {}
-    if row:
-        local = {
-            "tmdb_id": row.tmdb_id,
-            "title": row.title,
-            "year": row.year,
-            "poster_url": row.poster_url,
-        }
-
-    # --- Step 2: TMDB details ---
-    tmdb = await tmdb_fetch_details(tmdb_id)
+    # --- Steps 2-3: TMDB details + watch providers ---
+    # Separate cached calls so providers keep their longer TTL; a failed
+    # fetch degrades to its empty result instead of failing the page.
+    details_res, providers_res = await asyncio.gather(
+        tmdb_fetch_details(tmdb_id),
+        tmdb_fetch_watch_providers(tmdb_id),
+        return_exceptions=True,
+    )
+    tmdb = _result_or_default(details_res, {"tmdb_id": tmdb_id}, tmdb_id)
+    watch_providers = _result_or_default(providers_res, {}, tmdb_id)
 
-    # --- Step 3: watch providers ---
-    watch_providers = await tmdb_fetch_watch_providers(tmdb_id)
+    # --- Step 4: Merge ---
+    out: Dict[str, Any] = dict(tmdb)
 
-    # --- Step 4: videos + credits ---
-    videos = await tmdb_fetch_videos(tmdb_id)
-    credits = await tmdb_fetch_credits(tmdb_id)
-    cast = credits.get("cast", [])
-
-    # Pick a primary trailer: prefer official YouTube trailers, then any YouTube video
-    primary_trailer: Dict[str, Any] | None = None
-    if videos:
-        # official YouTube trailers
-        candidates = [
-            v
-            for v in videos
-            if v.get("site") == "YouTube"
-            and (v.get("type") == "Trailer")
-            and v.get("official")
-        ]
-        if not candidates:
-            # any YouTube trailer/teaser
-            candidates = [
-                v
-                for v in videos
-                if v.get("site") == "YouTube"
-                and v.get("type") in {"Trailer", "Teaser"}
-            ]
-        if not candidates:
-            candidates = [v for v in videos if v.get("site") == "YouTube"]
-
-        if candidates:
-            primary_trailer = candidates[0]
-
-    # --- Step 5: Merge ---
-    out: Dict[str, Any] = {}
-    out.update(tmdb)
-
-    # Local overrides / fills gaps if TMDB missing
-    for k, v in local.items():
-        if v is not None and not out.get(k):
-            out[k] = v
+    # Local row fills gaps if TMDB missing
+    if row is not None:
+        for k in _LOCAL_DETAIL_KEYS:
+            v = getattr(row, k)
+            if v is not None and not out.get(k):
+                out[k] = v
 
     # Attach providers and query_title helper
     out["watch_providers"] = watch_providers
     out["query_title"] = out.get("title")
 
-    # Attach videos / trailer / cast
-    out["videos"] = videos
-    out["primary_trailer"] = primary_trailer
-    # keep cast small(ish) by default; front-end can still slice
-    out["cast"] = cast[:12] if cast else []
-
     return out
 
 
 # Alias so frontend /api/shows/{tmdb_id} works
-@router.get("/{tmdb_id}", summary="Full details for a show (alias for /details/{tmdb_id})")
+@router.get(
+    "/{tmdb_id}",
+    summary="Full details for a show (alias for /details/{tmdb_id})",
+    response_class=ORJSONResponse,
+)
 async def show_details_alias(
     tmdb_id: int = Path(..., ge=1),
     db: AsyncSession = Depends(get_async_db),
@@ -482,6 +571,36 @@ async def show_details_alias(
     return await show_details(tmdb_id=tmdb_id, db=db)
 
 
+@router.get("/{tmdb_id}/videos", summary="TMDB videos for a show", response_class=ORJSONResponse)
+async def show_videos(
+    tmdb_id: int = Path(..., ge=1),
+) -> Dict[str, Any]:
+    """
+    Videos for the trailer modal, fetched lazily by the details page.
+    ``results`` keeps TMDB's shape; ``primary_trailer`` prefers official
+    YouTube trailers, then any YouTube trailer/teaser, then any YouTube video.
+    """
+    videos = await tmdb_fetch_videos(tmdb_id)
+
+    # min keeps the first of equally ranked videos, i.e. TMDB order
+    primary_trailer: Dict[str, Any] | None = min(videos, key=_trailer_rank, default=None)
+    if primary_trailer is not None and _trailer_rank(primary_trailer) >= _TRAILER_RANK_NONE:
+        primary_trailer = None
+
+    return {"results": videos, "primary_trailer": primary_trailer}
+
+
+@router.get("/{tmdb_id}/credits", summary="TMDB cast and crew for a show", response_class=ORJSONResponse)
+async def show_credits(
+    tmdb_id: int = Path(..., ge=1),
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Top-billed cast (TMDB billing order) and key creative crew, fetched
+    lazily by the cast tab.
+    """
+    return await tmdb_fetch_credits(tmdb_id)
+
+
 @router.get("/{tmdb_id}/similar", summary="Similar shows from TMDB")
 async def similar_shows(
     tmdb_id: int = Path(..., ge=1),
@@ -504,20 +623,20 @@ async def reddit_similar(
 ) -> List[Dict[str, Any]]:
     """
     Returns shows that are strongly co-mentioned with this show on Reddit.
-    Uses reddit_pairs table, then hydrates each TMDB id with TMDB details
-    so the front-end has title/poster/overview etc for ShowCard.
+    Uses reddit_pairs, enriched from the local shows table in the same
+    query; only shows we don't hold in full (no title, overview or poster)
+    are hydrated from TMDB, in one concurrent batch, so the front-end has
+    title/poster/overview etc for ShowCard.
     """
 
     sql = text("""
-        SELECT
-            CASE
-                WHEN tmdb_id_a = :tid THEN tmdb_id_b
-                ELSE tmdb_id_a
-            END AS other_id,
-            pair_weight
-        FROM reddit_pairs
-        WHERE tmdb_id_a = :tid OR tmdb_id_b = :tid
-        ORDER BY pair_weight DESC
+        SELECT p.other_id, p.pair_weight,
+               s.title, s.overview, s.poster_url, s.vote_average, s.vote_count,
+               s.first_air_date, s.genres
+        FROM reddit_pairs_sym p
+        LEFT JOIN shows s ON s.show_id = p.other_id
+        WHERE p.tmdb_id = :tid
+        ORDER BY p.pair_weight DESC
         LIMIT :limit
     """)
 
@@ -525,14 +644,49 @@ async def reddit_similar(
     if not rows:
         return []
 
+    # sparse local rows (e.g. from /tmdb/search: title/year/poster only) are
+    # hydrated from TMDB too, so the card still gets overview and votes
+    missing = [
+        int(r["other_id"]) for r in rows
+        if not (r["title"] and r["overview"] and r["poster_url"])
+    ]
+    # one Redis MGET for the shared details cache, then TMDB for the rest
+    await _DETAILS_CACHE.prefetch(missing)
+    fetched = await asyncio.gather(
+        *[tmdb_fetch_details(tid) for tid in missing],
+        return_exceptions=True,
+    )
+    tmdb_by_id = {
+        tid: _result_or_default(res, {"tmdb_id": tid}, tid)
+        for tid, res in zip(missing, fetched)
+    }
+
     out: List[Dict[str, Any]] = []
 
     for r in rows:
         other_id = int(r["other_id"])
         pair_weight = float(r["pair_weight"])
 
-        # Fetch TMDB details for each related show
-        details = await tmdb_fetch_details(other_id)
+        details = tmdb_by_id.get(other_id)
+        if details is None:
+            # local row; the shows table keeps no genre ids (recs_v2 sends [] too)
+            poster_url = r["poster_url"]
+            first_air = r["first_air_date"]
+            details = {
+                "title": r["title"],
+                "overview": r["overview"],
+                "poster_path": (
+                    "/" + poster_url[len(TMDB_IMG) + 1:]
+                    if poster_url and poster_url.startswith(TMDB_IMG + "/")
+                    else None
+                ),
+                "poster_url": poster_url,
+                "vote_average": r["vote_average"],
+                "vote_count": r["vote_count"],
+                "first_air_date": first_air.isoformat() if first_air else None,
+                "genres": list(r["genres"]) if r["genres"] is not None else None,
+                "genre_ids": [],
+            }
 
         out.append(
             {
@@ -1,18 +1,22 @@
 # app/routes/tmdb.py
 from __future__ import annotations
 
-import json
 import logging
 import os
 from typing import Any, Optional
 
 import httpx
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
-from sqlalchemy import select
+from fastapi.responses import Response
+from sqlalchemy import bindparam, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_db
 from app.db_models import Show
+from app.infra.cache_guard import have_cache
+from app.infra.http import tmdb_client
 
 router = APIRouter(prefix="/tmdb", tags=["tmdb"])
 log = logging.getLogger("tmdb")
@@ -21,12 +25,14 @@ TMDB_API_KEY = os.getenv("TMDB_API_KEY") or ""
 TMDB_BASE = "https://api.themoviedb.org/3"
 TMDB_IMG_W500 = "https://image.tmdb.org/t/p/w500"
 
-# Optional Redis cache
-REDIS_URL = os.getenv("REDIS_URL", "")
-try:
-    from redis.asyncio import from_url as redis_from_url  # type: ignore
-except Exception:
-    redis_from_url = None  # type: ignore
+# Search results are stored as the serialised response body and served
+# back verbatim on a hit.
+TMDB_SEARCH_TTL_SECONDS = 600
+
+
+def _json_passthrough(r: httpx.Response) -> Response:
+    """Forward a TMDb JSON body as-is: no decode / re-encode round trip."""
+    return Response(content=r.content, media_type="application/json")
 
 
 def _year_from_first_air_date(s: Optional[str]) -> Optional[int]:
@@ -83,48 +89,76 @@ def _serialize_show_row(s: Show) -> dict[str, Any]:
     }
 
 
-async def _get_or_create_show_from_tmdb_item(db: AsyncSession, item: dict) -> Show:
-    tmdb_id = item.get("id")
-    if not tmdb_id:
-        raise ValueError("TMDb item missing id")
-    tmdb_id = int(tmdb_id)
-
-    title = item.get("name") or item.get("original_name") or "Untitled"
-    year = _year_from_first_air_date(item.get("first_air_date"))
+def _show_row_from_tmdb_item(item: dict) -> dict[str, Any]:
+    """Column values for a TMDb search result (show_id is the TMDb id)."""
+    tmdb_id = int(item["id"])
     poster_path = item.get("poster_path")
+    return {
+        "show_id": tmdb_id,
+        "title": item.get("name") or item.get("original_name") or "Untitled",
+        "year": _year_from_first_air_date(item.get("first_air_date")),
+        "external_id": str(tmdb_id),
+        "poster_url": f"{TMDB_IMG_W500}{poster_path}" if poster_path else None,
+    }
+
+
+# Built once: the bound values change per search, the statement doesn't.
+_FIND_SHOWS_STMT = select(Show).where(
+    or_(
+        Show.show_id.in_(bindparam("ids", expanding=True)),
+        Show.external_id.in_(bindparam("exts", expanding=True)),
+    )
+)
+
+
+async def _bulk_upsert_shows(db: AsyncSession, items: list[dict]) -> dict[int, Show]:
+    """
+    Upsert the shows for a page of TMDb results in two statements: one
+    SELECT for the rows we already hold (PK match preferred, legacy string
+    external_id also accepted), updated in place, and one multi-row INSERT
+    for the rest. Returns Show rows keyed by TMDb id; an id lost to a
+    concurrent insert is simply absent.
+    """
+    rows: dict[int, dict[str, Any]] = {}
+    for it in items:
+        if it.get("id"):
+            row = _show_row_from_tmdb_item(it)
+            rows.setdefault(row["show_id"], row)
+    if not rows:
+        return {}
+
+    ext_ids = [row["external_id"] for row in rows.values()]
+    found = (await db.execute(_FIND_SHOWS_STMT, {"ids": list(rows), "exts": ext_ids})).scalars().all()
+
+    by_id: dict[int, Show] = {}
+    for s in found:
+        if s.show_id in rows:
+            by_id[s.show_id] = s
+    for s in found:
+        ext = s.external_id
+        if ext and ext.isdigit() and int(ext) in rows:
+            by_id.setdefault(int(ext), s)
+
+    for tmdb_id, existing in by_id.items():
+        row = rows[tmdb_id]
+        existing.title = row["title"]
+        if row["year"] is not None:
+            existing.year = row["year"]
+        existing.external_id = row["external_id"]
+
+    missing = [row for tmdb_id, row in rows.items() if tmdb_id not in by_id]
+    if missing:
+        ins = (
+            pg_insert(Show)
+            .values(missing)
+            .on_conflict_do_nothing(index_elements=[Show.show_id])
+            .returning(Show)
+        )
+        for s in (await db.execute(ins)).scalars():
+            by_id[s.show_id] = s
 
-    ext_str = str(tmdb_id)
-
-    # Prefer PK match (show_id). Also allow external_id match if you stored it as string.
-    q = select(Show).where((Show.show_id == tmdb_id) | (Show.external_id == ext_str))
-    existing = (await db.execute(q)).scalars().first()
-
-    if existing:
-        # Update only if fields exist on the model
-        if hasattr(existing, "title") and getattr(existing, "title", None) != title:
-            existing.title = title
-        if year is not None and hasattr(existing, "year") and getattr(existing, "year", None) != year:
-            existing.year = year
-        if hasattr(existing, "poster_path") and getattr(existing, "poster_path", None) != poster_path:
-            existing.poster_path = poster_path
-        if hasattr(existing, "external_id") and getattr(existing, "external_id", None) != ext_str:
-            existing.external_id = ext_str
-        await db.flush()
-        return existing
-
-    # ✅ CRITICAL: set show_id (your schema uses this as PK)
-    kwargs: dict[str, Any] = {"show_id": tmdb_id, "title": title, "external_id": ext_str}
-    if year is not None and hasattr(Show, "year"):
-        kwargs["year"] = year
-    if hasattr(Show, "poster_path"):
-        kwargs["poster_path"] = poster_path
-    if hasattr(Show, "poster_url") and poster_path:
-        kwargs["poster_url"] = f"{TMDB_IMG_W500}{poster_path}"
-
-    new_show = Show(**kwargs)
-    db.add(new_show)
     await db.flush()
-    return new_show
+    return by_id
 
 
 @router.api_route("/search", methods=["GET", "HEAD"], summary="Search TMDb TV")
@@ -138,35 +172,37 @@ async def tmdb_search(
         raise HTTPException(status_code=500, detail="TMDB_API_KEY not set on server")
 
     cache_key = f"tmdb:search:tv:{q.strip().lower()}:{page}:{limit}"
-    redis = redis_from_url(REDIS_URL, decode_responses=True) if (redis_from_url and REDIS_URL) else None
+    cache = have_cache()
 
-    if redis:
+    if cache is not None:
         try:
-            cached = await redis.get(cache_key)
+            cached = await cache.get_raw(cache_key)
             if cached:
-                return json.loads(cached)
+                return Response(content=cached, media_type="application/json")
         except Exception:
             log.exception("Redis read failed")
 
     # Call TMDb
     params = {"api_key": TMDB_API_KEY, "query": q, "page": page, "include_adult": "false"}
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        r = await client.get(f"{TMDB_BASE}/search/tv", params=params)
+    r = await tmdb_client().get(f"{TMDB_BASE}/search/tv", params=params)
     if r.status_code != 200:
         raise HTTPException(status_code=502, detail=f"TMDb error {r.status_code}: {r.text[:200]}")
 
-    payload = r.json()
+    payload = orjson.loads(r.content or b"{}") or {}
     items = (payload.get("results") or [])[:limit]
 
+    try:
+        shows = await _bulk_upsert_shows(db, items)
+    except Exception:
+        # Don’t silently swallow — log and return the TMDb items instead
+        log.exception("Show upsert failed during tmdb search")
+        await db.rollback()
+        shows = {}
+
     out: list[dict[str, Any]] = []
     for it in items:
-        try:
-            s = await _get_or_create_show_from_tmdb_item(db, it)
-            out.append(_serialize_show_row(s))
-        except Exception:
-            # Don’t silently swallow — log and return TMDb item instead
-            log.exception("Upsert failed for tmdb_id=%s", it.get("id"))
-            out.append(_serialize_tmdb_item(it))
+        s = shows.get(int(it.get("id") or 0))
+        out.append(_serialize_show_row(s) if s is not None else _serialize_tmdb_item(it))
 
     try:
         await db.commit()
@@ -174,13 +210,14 @@ async def tmdb_search(
         await db.rollback()
         log.exception("Commit failed during tmdb search")
 
-    if redis:
+    body = orjson.dumps(out)
+    if cache is not None:
         try:
-            await redis.setex(cache_key, 600, json.dumps(out))  # 10 mins
+            await cache.set_raw(cache_key, body, ttl=TMDB_SEARCH_TTL_SECONDS)
         except Exception:
             log.exception("Redis write failed")
 
-    return out
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/tv/{tmdb_id}", summary="TMDb TV details (pass-through)")
@@ -189,15 +226,14 @@ async def tmdb_tv_details(tmdb_id: int = Path(..., ge=1)):
         raise HTTPException(status_code=500, detail="TMDB_API_KEY not set on server")
 
     params = {"api_key": TMDB_API_KEY}
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        r = await client.get(f"{TMDB_BASE}/tv/{tmdb_id}", params=params)
+    r = await tmdb_client().get(f"{TMDB_BASE}/tv/{tmdb_id}", params=params)
 
     if r.status_code == 404:
         raise HTTPException(status_code=404, detail="TMDb show not found")
     if r.status_code != 200:
         raise HTTPException(status_code=502, detail=f"TMDb error {r.status_code}: {r.text[:200]}")
 
-    return r.json()
+    return _json_passthrough(r)
 
 @router.get("/tv/{tmdb_id}/videos", summary="TMDb TV videos (trailers, teasers)")
 async def tmdb_tv_videos(tmdb_id: int = Path(..., ge=1)):
@@ -205,8 +241,7 @@ async def tmdb_tv_videos(tmdb_id: int = Path(..., ge=1)):
         raise HTTPException(status_code=500, detail="TMDB_API_KEY not set on server")
 
     params = {"api_key": TMDB_API_KEY}
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        r = await client.get(f"{TMDB_BASE}/tv/{tmdb_id}/videos", params=params)
+    r = await tmdb_client().get(f"{TMDB_BASE}/tv/{tmdb_id}/videos", params=params)
 
     if r.status_code == 404:
         raise HTTPException(status_code=404, detail="TMDb videos not found")
@@ -216,7 +251,7 @@ async def tmdb_tv_videos(tmdb_id: int = Path(..., ge=1)):
             detail=f"TMDb error {r.status_code}: {r.text[:200]}",
         )
 
-    return r.json()
+    return _json_passthrough(r)
 
 @router.get("/tv/{tmdb_id}/watch/providers", summary="TMDb TV watch providers")
 async def tmdb_tv_watch_providers(tmdb_id: int = Path(..., ge=1)):
@@ -224,11 +259,10 @@ async def tmdb_tv_watch_providers(tmdb_id: int = Path(..., ge=1)):
         raise HTTPException(status_code=500, detail="TMDB_API_KEY not set on server")
 
     params = {"api_key": TMDB_API_KEY}
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        r = await client.get(
-            f"{TMDB_BASE}/tv/{tmdb_id}/watch/providers",
-            params=params,
-        )
+    r = await tmdb_client().get(
+        f"{TMDB_BASE}/tv/{tmdb_id}/watch/providers",
+        params=params,
+    )
 
     if r.status_code == 404:
         raise HTTPException(status_code=404, detail="TMDb providers not found")
@@ -238,6 +272,6 @@ async def tmdb_tv_watch_providers(tmdb_id: int = Path(..., ge=1)):
             detail=f"TMDb error {r.status_code}: {r.text[:200]}",
         )
 
-    return r.json()
+    return _json_passthrough(r)
 
 
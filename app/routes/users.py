@@ -4,14 +4,17 @@ from __future__ import annotations
 import os
 from typing import Any, List, Optional
 
-import httpx
+import orjson
 from fastapi import APIRouter, Depends, Path
-from sqlalchemy import and_, select
+from sqlalchemy import and_, bindparam, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_db
 from app.db_models import FavoriteTmdb, NotInterested, Show
+from app.infra.http import tmdb_client
 from app.security import require_user_match
+from app.services import user_cache
 
 TMDB_API = "https://api.themoviedb.org/3"
 TMDB_IMG = "https://image.tmdb.org/t/p/w500"
@@ -19,6 +22,11 @@ TMDB_KEY = os.getenv("TMDB_API_KEY") or os.getenv("TMDB_KEY")
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# Favourite lookup shared by add / remove; user and show ids bound per call.
+_FAVORITE_STMT = select(FavoriteTmdb).where(
+    and_(FavoriteTmdb.user_id == bindparam("uid"), FavoriteTmdb.tmdb_id == bindparam("tid"))
+)
+
 
 
 
@@ -31,18 +39,17 @@ async def _tmdb_details_min(tmdb_id: int) -> dict[str, Any]:
         print("TMDB_KEY missing in users.py", flush=True)
         return {}
 
-    url = f"{TMDB_API}/tv/{tmdb_id}?api_key={TMDB_KEY}"
+    url = f"{TMDB_API}/tv/{tmdb_id}"
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url)
+        r = await tmdb_client().get(url, params={"api_key": TMDB_KEY})
 
         if r.status_code != 200:
             # Log status so Render tells us what's happening (401/429/etc.)
             print(f"TMDb details failed for {tmdb_id}: {r.status_code} {r.text[:200]}", flush=True)
             return {}
 
-        data = r.json() or {}
+        data = orjson.loads(r.content or b"{}") or {}
         first_air = data.get("first_air_date") or ""
         year = None
         if isinstance(first_air, str) and len(first_air) >= 4:
@@ -69,7 +76,8 @@ async def _tmdb_details_min(tmdb_id: int) -> dict[str, Any]:
 
 def _serialize_show(s: Show) -> dict[str, Any]:
     poster_path = getattr(s, "poster_path", None)
-    poster_url = f"{TMDB_IMG}{poster_path}" if poster_path else None
+    # poster_url is stored normalised at ingest; only derive it for old rows
+    poster_url = getattr(s, "poster_url", None) or (f"{TMDB_IMG}{poster_path}" if poster_path else None)
 
     ext: Optional[int] = None
     if getattr(s, "external_id", None) is not None:
@@ -94,31 +102,21 @@ async def list_favorites(
     _: Any = Depends(require_user_match),  # enforce ownership via JWT
     db: AsyncSession = Depends(get_async_db),
 ) -> List[dict[str, Any]]:
+    # Favourites + their local show rows in one round trip.
     fav_rows = (
-        (await db.execute(
-            select(FavoriteTmdb)
-            .where(FavoriteTmdb.user_id == user_id)
+        await db.execute(
+            select(FavoriteTmdb.tmdb_id, Show)
+            .outerjoin(Show, Show.show_id == FavoriteTmdb.tmdb_id)
+            .where(FavoriteTmdb.user_id == user_id, FavoriteTmdb.tmdb_id.isnot(None))
             .order_by(FavoriteTmdb.id.asc())
-        ))
-        .scalars()
-        .all()
-    )
-
-    tmdb_ids = [int(fr.tmdb_id) for fr in fav_rows if fr.tmdb_id is not None]
-    if not tmdb_ids:
+        )
+    ).all()
+    if not fav_rows:
         return []
 
-    shows = (
-        (await db.execute(select(Show).where(Show.show_id.in_(tmdb_ids))))
-        .scalars()
-        .all()
-    )
-    show_by_id = {int(s.show_id): s for s in shows}
-
     out: list[dict[str, Any]] = []
 
-    for tid in tmdb_ids:
-        s = show_by_id.get(int(tid))
+    for tid, s in fav_rows:
 
         # ALWAYS define item (prevents UnboundLocalError)
         if s:
@@ -160,16 +158,14 @@ async def add_favorite(
     db: AsyncSession = Depends(get_async_db),
 ) -> dict[str, Any]:
     existing = (
-        await db.execute(
-            select(FavoriteTmdb).where(
-                and_(FavoriteTmdb.user_id == user_id, FavoriteTmdb.tmdb_id == tmdb_id)
-            )
-        )
+        await db.execute(_FAVORITE_STMT, {"uid": user_id, "tid": tmdb_id})
     ).scalar_one_or_none()
 
     if existing is None:
         db.add(FavoriteTmdb(user_id=user_id, tmdb_id=tmdb_id))
         await db.commit()
+        await user_cache.invalidate_favorites(user_id)
+        await user_cache.invalidate_recs(user_id)
 
     return {"ok": True}
 
@@ -182,16 +178,14 @@ async def remove_favorite(
     db: AsyncSession = Depends(get_async_db),
 ) -> dict[str, Any]:
     row = (
-        await db.execute(
-            select(FavoriteTmdb).where(
-                and_(FavoriteTmdb.user_id == user_id, FavoriteTmdb.tmdb_id == tmdb_id)
-            )
-        )
+        await db.execute(_FAVORITE_STMT, {"uid": user_id, "tid": tmdb_id})
     ).scalar_one_or_none()
 
     if row:
         await db.delete(row)
         await db.commit()
+        await user_cache.invalidate_favorites(user_id)
+        await user_cache.invalidate_recs(user_id)
 
     return {"ok": True}
 
@@ -203,17 +197,17 @@ async def hide_show_path(
     _: Any = Depends(require_user_match),
     db: AsyncSession = Depends(get_async_db),
 ) -> dict:
-    exists = (
-        await db.execute(
-            select(NotInterested).where(
-                and_(NotInterested.user_id == user_id, NotInterested.tmdb_id == tmdb_id)
-            )
-        )
-    ).scalar_one_or_none()
-
-    if not exists:
-        db.add(NotInterested(user_id=user_id, tmdb_id=tmdb_id))
-        await db.commit()
+    # Single round trip; the (user_id, tmdb_id) unique constraint makes it idempotent.
+    ins = pg_insert(NotInterested.__table__).values(
+        user_id=user_id,
+        tmdb_id=tmdb_id,
+    ).on_conflict_do_nothing(
+        index_elements=["user_id", "tmdb_id"]
+    )
+    await db.execute(ins)
+    await db.commit()
+    await user_cache.invalidate_not_interested(user_id)
+    await user_cache.invalidate_recs(user_id)
 
     return {"ok": True}
 
@@ -5,9 +5,10 @@ from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 # We’ll use SQLAlchemy core if available; otherwise do best-effort ORMs
 try:
-    from sqlalchemy import select  # type: ignore
+    from sqlalchemy import select, text  # type: ignore
 except Exception:
     select = None  # type: ignore
+    text = None  # type: ignore
 
 
 def _try_import(*paths: str):
@@ -205,3 +206,30 @@ def apply_user_exclusions(items: List[Dict[str, Any]], excluded_tmdb: Set[int])
         except Exception:
             out.append(it)
     return out
+
+
+# Anti-join the candidate ids against favourites / not-interested in Postgres,
+# so only the (small) surviving id list crosses the wire. Both lookups are
+# served by the (user_id, tmdb_id) unique indexes.
+_SQL_FILTER_EXCLUDED = """
+SELECT v.tmdb_id
+FROM unnest(CAST(:ids AS integer[])) AS v(tmdb_id)
+WHERE NOT EXISTS (
+    SELECT 1 FROM user_favorites f WHERE f.user_id = :uid AND f.tmdb_id = v.tmdb_id
+)
+AND NOT EXISTS (
+    SELECT 1 FROM not_interested n WHERE n.user_id = :uid AND n.tmdb_id = v.tmdb_id
+)
+"""
+
+
+async def filter_excluded(db, user_id: int, tmdb_ids: Iterable[int]) -> Set[int]:
+    """
+    Return the subset of ``tmdb_ids`` the user has neither favourited nor
+    marked not-interested.
+    """
+    ids = sorted({int(t) for t in tmdb_ids})
+    if not ids:
+        return set()
+    res = await db.execute(text(_SQL_FILTER_EXCLUDED), {"uid": int(user_id), "ids": ids})
+    return {int(t) for t in res.scalars()}
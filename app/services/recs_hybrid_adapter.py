@@ -2,10 +2,9 @@ from __future__ import annotations
 
 import os
 import traceback
-from collections import defaultdict
-from typing import Dict, Iterable, List, Tuple, Optional
+from typing import Iterable, List, Tuple, Optional
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://tvuser:tvpass@db:5432/tvrecs")
@@ -62,26 +61,29 @@ async def _fetch_not_interested(session: AsyncSession, user_id: int) -> List[int
     return [int(r[0]) for r in rows]
 
 
-async def _aggregate_pairs_for_favs(session: AsyncSession, favs: Iterable[int]) -> Dict[int, int]:
-    agg: Dict[int, int] = defaultdict(int)
-    q_a = text("""
-        SELECT tmdb_id_b AS rec_id, pair_count
-        FROM reddit_pairs
-        WHERE tmdb_id_a = :fav
-    """)
-    q_b = text("""
-        SELECT tmdb_id_a AS rec_id, pair_count
-        FROM reddit_pairs
-        WHERE tmdb_id_b = :fav
-    """)
-    for fav in favs:
-        for q in (q_a, q_b):
-            rows = (await session.execute(q, {"fav": fav})).all()
-            for rec_id, cnt in rows:
-                if rec_id is None:
-                    continue
-                agg[int(rec_id)] += int(cnt or 0)
-    return agg
+async def _aggregate_pairs_for_favs(
+    session: AsyncSession,
+    favs: Iterable[int],
+    exclude: Iterable[int],
+) -> List[Tuple[int, int]]:
+    """(rec_id, summed pair_count) for every neighbour of ``favs``, best first."""
+    # reddit_pairs_sym mirrors reddit_pairs in both orientations; summing and
+    # excluding in SQL ships one row per candidate instead of one per pair.
+    q = text("""
+        SELECT other_id AS rec_id, SUM(pair_count) AS score
+        FROM reddit_pairs_sym
+        WHERE tmdb_id IN (:favs)
+          AND other_id NOT IN (:exclude)
+        GROUP BY other_id
+        ORDER BY score DESC
+    """).bindparams(
+        bindparam("favs", expanding=True),
+        bindparam("exclude", expanding=True),
+    )
+    # Unbounded (the MMR below wants the whole pool), so read it through a
+    # server-side cursor rather than buffering the full result client-side.
+    result = await session.stream(q, {"favs": list(favs), "exclude": list(exclude)})
+    return [(int(rec_id), int(score or 0)) async for rec_id, score in result]
 
 
 async def hybrid_recommendations_for_user_async(
@@ -109,16 +111,9 @@ async def hybrid_recommendations_for_user_async(
                     },
                 }
             notint = set(await _fetch_not_interested(session, user_id))
-            agg = await _aggregate_pairs_for_favs(session, favorites)
-
             fav_set = set(favorites)
-            filtered = [
-                (tmdb_id, score)
-                for tmdb_id, score in agg.items()
-                if tmdb_id not in fav_set and tmdb_id not in notint
-            ]
+            filtered = await _aggregate_pairs_for_favs(session, favorites, fav_set | notint)
 
-            filtered.sort(key=lambda x: x[1], reverse=True)
             diversified = mmr_diversify(filtered, k=limit, lambda_=mmr_lambda) if filtered else []
             items = [{"tmdb_id": tmdb_id, "score": float(score)} for tmdb_id, score in diversified[:limit]]
 
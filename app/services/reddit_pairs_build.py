@@ -42,6 +42,13 @@ async def ensure_user_reddit_pairs_table(session: AsyncSession) -> None:
             ON user_reddit_pairs (weight DESC);
     """
 
+    # (user_id, weight DESC) covering suggested_tmdb_id: the per-user top-N
+    # read is an index-only scan with no sort.
+    ddl_idx_user_weight = """
+        CREATE INDEX IF NOT EXISTS ix_user_reddit_pairs_user_weight
+            ON user_reddit_pairs (user_id, weight DESC) INCLUDE (suggested_tmdb_id);
+    """
+
     ddl_idx_suggested = """
         CREATE INDEX IF NOT EXISTS ix_user_reddit_pairs_suggested
             ON user_reddit_pairs (suggested_tmdb_id);
@@ -51,6 +58,7 @@ async def ensure_user_reddit_pairs_table(session: AsyncSession) -> None:
     await session.execute(text(ddl_table))
     await session.execute(text(ddl_idx_user))
     await session.execute(text(ddl_idx_weight))
+    await session.execute(text(ddl_idx_user_weight))
     await session.execute(text(ddl_idx_suggested))
     await session.commit()
 
@@ -65,21 +73,12 @@ _SQL_USER_AGG_FROM_REDDIT = text(
         FROM user_favorites
         WHERE user_id = :uid
     ),
-    both_dirs AS (
-        SELECT rp.tmdb_id_b AS suggested, rp.pair_weight AS w
-        FROM reddit_pairs rp
-        JOIN seeds s ON s.tmdb_id = rp.tmdb_id_a
-
-        UNION ALL
-
-        SELECT rp.tmdb_id_a AS suggested, rp.pair_weight AS w
-        FROM reddit_pairs rp
-        JOIN seeds s ON s.tmdb_id = rp.tmdb_id_b
-    ),
+    -- reddit_pairs_sym holds both orientations of every reddit pair
     agg AS (
-        SELECT suggested, SUM(w) AS w
-        FROM both_dirs
-        GROUP BY suggested
+        SELECT ps.other_id AS suggested, SUM(ps.pair_weight) AS w
+        FROM reddit_pairs_sym ps
+        JOIN seeds s ON s.tmdb_id = ps.tmdb_id
+        GROUP BY ps.other_id
     )
     SELECT suggested AS suggested_tmdb_id, w
     FROM agg
@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 TMDB_API = "https://api.themoviedb.org/3"
+TMDB_IMG = "https://image.tmdb.org/t/p/w500"
 TMDB_KEY = os.getenv("TMDB_API_KEY") or os.getenv("TMDB_KEY")
 
 # How fast we hit TMDB (keep gentle)
@@ -118,6 +119,8 @@ def _extract_fields(data: Dict[str, Any]) -> Dict[str, Any]:
         "vote_average": float(data.get("vote_average") or 0.0),
         "vote_count": int(data.get("vote_count") or 0),
         "poster_path": data.get("poster_path") or None,
+        # stored normalised so readers never rebuild it per request
+        "poster_url": f"{TMDB_IMG}{data['poster_path']}" if data.get("poster_path") else None,
     }
 
 
@@ -160,6 +163,7 @@ async def _update_show(session: AsyncSession, show_id: int, fields: Dict[str, An
           vote_average = COALESCE(:vote_average, vote_average),
           vote_count = COALESCE(:vote_count, vote_count),
           poster_path = COALESCE(:poster_path, poster_path),
+          poster_url = COALESCE(:poster_url, poster_url),
           tmdb_checked_at = now()
         WHERE show_id = :show_id
         """
@@ -2,19 +2,11 @@
 from __future__ import annotations
 from typing import Any, Dict, List
 
+from app.infra.cache_guard import have_cache
 from app.services import tmdb
 
-# We import infra.cache but never crash if it can't be used.
-def _have_cache():
-    try:
-        from app.infra import cache
-        return cache
-    except Exception:
-        return None
-
-
 async def get_similar_shows_cached(seed_tmdb_id: int, max_items: int = 20) -> List[Dict[str, Any]]:
-    cache = _have_cache()
+    cache = have_cache()
     ckey = f"tmdb:tv:{int(seed_tmdb_id)}:similar:{int(max_items)}"
 
     # Try cache read
@@ -79,13 +79,18 @@ def mmr_select(
     if not candidates:
         return []
     selected: List[Tuple[int, float, List[float]]] = []
-    remaining = candidates.copy()
-    max_s = max((s for _, s, _ in remaining), default=1.0) or 1.0
-    norm = [(tid, (s/max_s), v) for tid, s, v in remaining]
-    while norm and len(selected) < k:
-        best = None
+    max_s = max((s for _, s, _ in candidates), default=1.0) or 1.0
+    norm = [(tid, (s/max_s), v) for tid, s, v in candidates]
+    # picked (and same-id) entries are switched off in place, not filtered
+    # out into a fresh list every round
+    alive = bytearray(b"\x01") * len(norm)
+    n_alive = len(norm)
+    while n_alive and len(selected) < k:
+        best_i = -1
         best_val = -1e9
-        for tid, rel, vec in norm:
+        for i, (tid, rel, vec) in enumerate(norm):
+            if not alive[i]:
+                continue
             if selected:
                 sim_max = max(cosine(vec, v2) for _, _, v2 in selected)
             else:
@@ -93,7 +98,13 @@ def mmr_select(
             score = lambda_*rel - (1.0-lambda_)*sim_max
             if score > best_val:
                 best_val = score
-                best = (tid, rel, vec)
-        selected.append(best)  # type: ignore[arg-type]
-        norm = [(tid, rel, vec) for tid, rel, vec in norm if tid != best[0]]  # type: ignore[index]
+                best_i = i
+        if best_i < 0:
+            break
+        best = norm[best_i]
+        selected.append(best)
+        for i, (tid, _, _) in enumerate(norm):
+            if alive[i] and tid == best[0]:
+                alive[i] = 0
+                n_alive -= 1
     return [(tid, rel) for tid, rel, _ in selected]
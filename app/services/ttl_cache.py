@@ -0,0 +1,170 @@
+# app/services/ttl_cache.py
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import orjson
+
+from app.infra.cache_guard import have_cache
+
+# Every named cache, for cache_stats() (weak: a dropped cache just vanishes).
+_NAMED: "weakref.WeakValueDictionary[str, AsyncTTLCache]" = weakref.WeakValueDictionary()
+
+
+class AsyncTTLCache:
+    """
+    Small async read-through cache for quasi-static upstream payloads
+    (TMDb details and friends).
+
+    - In-process LRU with per-entry TTL (bounded by ``maxsize``)
+    - Optional shared Redis layer when ``redis_prefix`` is set (best-effort)
+    - Concurrent misses for the same key share one in-flight fetch
+      (singleflight), so N requests for a cold id cost one upstream call —
+      even when the result turns out not to be cacheable
+    - ``hits`` / ``misses`` count in-process lookups made by get_or_fetch
+      (a miss may still be served by Redis); see cache_stats()
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        *,
+        maxsize: int = 4096,
+        redis_prefix: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        self.name = name or (redis_prefix.rstrip(":") if redis_prefix else None)
+        if self.name:
+            _NAMED[self.name] = self
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.redis_prefix = redis_prefix
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        hit = self._data.get(key)
+        if hit is None:
+            return None
+        expires, value = hit
+        if expires < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    async def _redis_get(self, key: Hashable) -> Optional[Any]:
+        cache = have_cache() if self.redis_prefix else None
+        if cache is None:
+            return None
+        try:
+            raw = await cache.get_raw(f"{self.redis_prefix}{key}")
+            return orjson.loads(raw) if raw else None
+        except Exception:
+            # cache not ready / network hiccup → just fall through to upstream
+            return None
+
+    async def _redis_set(self, key: Hashable, value: Any) -> None:
+        cache = have_cache() if self.redis_prefix else None
+        if cache is None:
+            return
+        try:
+            await cache.set_raw(f"{self.redis_prefix}{key}", orjson.dumps(value), ttl=int(self.ttl))
+        except Exception:
+            pass
+
+    async def prefetch(self, keys: Iterable[Hashable]) -> None:
+        """
+        Warm the in-process layer for ``keys`` from Redis in one MGET, so a
+        following batch of get_or_fetch calls only goes upstream (or back to
+        Redis) for keys nobody has cached yet.
+        """
+        cache = have_cache() if self.redis_prefix else None
+        if cache is None:
+            return
+        cold = [k for k in keys if self.get(k) is None]
+        if not cold:
+            return
+        try:
+            raws = await cache.client().mget([f"{self.redis_prefix}{k}" for k in cold])
+        except Exception:
+            return
+        for key, raw in zip(cold, raws):
+            if raw:
+                try:
+                    self.set(key, orjson.loads(raw))
+                except Exception:
+                    pass
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        *,
+        cacheable: Callable[[Any], bool] = bool,
+    ) -> Any:
+        """
+        Return the cached value for ``key`` or await ``fetch()`` once and store
+        it. Values rejected by ``cacheable`` (e.g. error fallbacks) are returned
+        but not stored.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, fetch, cacheable))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        # shield: one caller giving up must not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool],
+    ) -> Any:
+        value = await self._redis_get(key)
+        if value is not None:
+            self.set(key, value)
+            return value
+
+        value = await fetch()
+        if cacheable(value):
+            self.set(key, value)
+            await self._redis_set(key, value)
+        return value
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit / miss counters and size of every named cache in this process."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for name, c in sorted(_NAMED.items()):
+        lookups = c.hits + c.misses
+        out[name] = {
+            "hits": c.hits,
+            "misses": c.misses,
+            "hit_ratio": round(c.hits / lookups, 4) if lookups else None,
+            "size": len(c._data),
+            "ttl_seconds": c.ttl,
+        }
+    return out
@@ -0,0 +1,157 @@
+# app/services/user_cache.py
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Any, Iterable, Optional, Set, Tuple
+
+from app.infra.cache_guard import have_cache
+
+log = logging.getLogger(__name__)
+
+# Short TTL: the key is dropped on every favourite write anyway,
+# this only bounds staleness if an invalidation is missed.
+FAVORITES_TTL_SECONDS = 60
+
+# Membership sets used to filter recs; dropped on every favourite /
+# not-interested write, the TTL just bounds memory for idle users.
+EXCLUSIONS_TTL_SECONDS = 3600
+# Redis can't hold an empty set, so every cached set carries this member
+# (tmdb ids start at 1) to tell "cached, empty" from "not cached".
+_SET_SENTINEL = "0"
+
+# Recs are dropped on every favourite / rating / not-interested / feedback
+# write; the TTL only bounds drift from upstream (TMDb, reddit pairs).
+RECS_TTL_SECONDS = 300
+
+
+def favorites_key(user_id: int) -> str:
+    return f"fav:{int(user_id)}"
+
+
+def favorites_set_key(user_id: int) -> str:
+    return f"user:{int(user_id)}:favs"
+
+
+def blocked_set_key(user_id: int) -> str:
+    return f"user:{int(user_id)}:blocked"
+
+
+async def get_favorites_payload(user_id: int) -> Optional[str]:
+    """Cached JSON body of GET /library/{user_id}/favorites, or None on miss."""
+    cache = have_cache()
+    if cache is None:
+        return None
+    try:
+        return await cache.get_raw(favorites_key(user_id))
+    except Exception:
+        # cache not ready / network hiccup → caller falls through to the DB
+        return None
+
+
+async def set_favorites_payload(user_id: int, payload: bytes) -> None:
+    cache = have_cache()
+    if cache is None:
+        return
+    try:
+        await cache.set_raw(favorites_key(user_id), payload, ttl=FAVORITES_TTL_SECONDS)
+    except Exception:
+        pass
+
+
+async def invalidate_favorites(user_id: int) -> None:
+    """Drop the cached favourites payload + id set. Call after the write is committed."""
+    cache = have_cache()
+    if cache is None:
+        return
+    try:
+        await cache.delete(favorites_key(user_id), favorites_set_key(user_id))
+    except Exception:
+        log.warning("favorites cache invalidation failed for user_id=%s", user_id)
+
+
+async def invalidate_not_interested(user_id: int) -> None:
+    """Drop the cached not-interested id set. Call after the write is committed."""
+    cache = have_cache()
+    if cache is None:
+        return
+    try:
+        await cache.delete(blocked_set_key(user_id))
+    except Exception:
+        log.warning("not-interested cache invalidation failed for user_id=%s", user_id)
+
+
+async def get_exclusion_sets(user_id: int) -> Optional[Tuple[Set[int], Set[int]]]:
+    """(favourite ids, not-interested ids) from Redis, or None unless both are cached."""
+    cache = have_cache()
+    if cache is None:
+        return None
+    try:
+        pipe = cache.client().pipeline(transaction=False)
+        pipe.smembers(favorites_set_key(user_id))
+        pipe.smembers(blocked_set_key(user_id))
+        favs, blocked = await pipe.execute()
+    except Exception:
+        return None
+    if not favs or not blocked:
+        return None
+    return (
+        {int(m) for m in favs if m != _SET_SENTINEL},
+        {int(m) for m in blocked if m != _SET_SENTINEL},
+    )
+
+
+async def set_exclusion_sets(user_id: int, favs: Iterable[int], blocked: Iterable[int]) -> None:
+    cache = have_cache()
+    if cache is None:
+        return
+    try:
+        pipe = cache.client().pipeline(transaction=False)
+        for key, ids in ((favorites_set_key(user_id), favs), (blocked_set_key(user_id), blocked)):
+            pipe.delete(key)
+            pipe.sadd(key, _SET_SENTINEL, *(int(i) for i in ids))
+            pipe.expire(key, EXCLUSIONS_TTL_SECONDS)
+        await pipe.execute()
+    except Exception:
+        pass
+
+
+def recs_prefix(user_id: int) -> str:
+    return f"recs:{int(user_id)}:"
+
+
+def recs_key(user_id: int, *params: Any) -> str:
+    """Key for one parameterisation of a user's recs (params hashed, order-sensitive)."""
+    digest = hashlib.sha256("|".join(map(str, params)).encode()).hexdigest()
+    return recs_prefix(user_id) + digest
+
+
+async def get_recs_payload(key: str) -> Optional[str]:
+    cache = have_cache()
+    if cache is None:
+        return None
+    try:
+        return await cache.get_raw(key)
+    except Exception:
+        return None
+
+
+async def set_recs_payload(key: str, payload: bytes) -> None:
+    cache = have_cache()
+    if cache is None:
+        return
+    try:
+        await cache.set_raw(key, payload, ttl=RECS_TTL_SECONDS)
+    except Exception:
+        pass
+
+
+async def invalidate_recs(user_id: int) -> None:
+    """Drop every cached recs payload for the user. Call after the write is committed."""
+    cache = have_cache()
+    if cache is None:
+        return
+    try:
+        await cache.delete_prefix(recs_prefix(user_id))
+    except Exception:
+        log.warning("recs cache invalidation failed for user_id=%s", user_id)
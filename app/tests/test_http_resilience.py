@@ -0,0 +1,44 @@
+# tests/test_http_resilience.py
+import httpx
+import pytest
+
+import app.infra.http as http
+
+
+def _client(handler, **kwargs):
+    transport = http.ResilientTransport(httpx.MockTransport(handler), **kwargs)
+    return httpx.AsyncClient(transport=transport), transport
+
+
+@pytest.mark.asyncio
+async def test_429_is_retried_honouring_retry_after():
+    statuses = iter([429, 200])
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(next(statuses), headers={"Retry-After": "0"})
+
+    client, _ = _client(handler)
+    r = await client.get("https://api.themoviedb.org/3/tv/1")
+
+    assert r.status_code == 200
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_consecutive_failures():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503, headers={"Retry-After": "0"})
+
+    client, transport = _client(handler, max_retries=0, fail_max=2, reset_seconds=60)
+    for _ in range(2):
+        assert (await client.get("https://api.themoviedb.org/3/tv/1")).status_code == 503
+    assert transport.is_open
+
+    with pytest.raises(http.TMDbUnavailable):
+        await client.get("https://api.themoviedb.org/3/tv/1")
+    assert len(calls) == 2
@@ -0,0 +1,40 @@
+# tests/test_http_revalidate.py
+import httpx
+import pytest
+
+import app.infra.http as http
+
+
+@pytest.fixture
+def tmdb_requests(monkeypatch):
+    """Route the shared TMDb client through a MockTransport honouring If-None-Match."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"results": [{"id": 1}]}, headers={"ETag": '"v1"'})
+
+    monkeypatch.setattr(http, "_tmdb", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return seen
+
+
+@pytest.mark.asyncio
+async def test_second_get_is_conditional_and_served_from_store(tmdb_requests):
+    url = "https://api.themoviedb.org/3/trending/tv/week"
+
+    first = await http.get_json_revalidated(url, cache_key="t:week")
+    second = await http.get_json_revalidated(url, cache_key="t:week")
+
+    assert first == second == {"results": [{"id": 1}]}
+    assert "if-none-match" not in tmdb_requests[0].headers
+    assert tmdb_requests[1].headers["if-none-match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_non_200_returns_none(monkeypatch):
+    transport = httpx.MockTransport(lambda request: httpx.Response(404))
+    monkeypatch.setattr(http, "_tmdb", httpx.AsyncClient(transport=transport))
+
+    assert await http.get_json_revalidated("https://example.test/x", cache_key="t:x") is None
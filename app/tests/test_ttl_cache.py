@@ -0,0 +1,106 @@
+# tests/test_ttl_cache.py
+import asyncio
+
+import pytest
+
+from app.services.ttl_cache import AsyncTTLCache, cache_stats
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_fetch_once():
+    cache = AsyncTTLCache(60)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"tmdb_id": 1, "name": "x"}
+
+    results = await asyncio.gather(*(cache.get_or_fetch(1, fetch) for _ in range(10)))
+    assert calls == 1
+    assert all(r == {"tmdb_id": 1, "name": "x"} for r in results)
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_values_are_refetched():
+    cache = AsyncTTLCache(60)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return {"tmdb_id": 1}
+
+    for _ in range(2):
+        await cache.get_or_fetch(1, fetch, cacheable=lambda d: bool(d.get("name")))
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_uncacheable_misses_share_one_fetch():
+    cache = AsyncTTLCache(60)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"tmdb_id": 1}
+
+    await asyncio.gather(
+        *(cache.get_or_fetch(1, fetch, cacheable=lambda d: bool(d.get("name"))) for _ in range(5))
+    )
+    assert calls == 1
+
+
+def test_lru_bound_and_expiry():
+    cache = AsyncTTLCache(60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+
+    expired = AsyncTTLCache(-1)
+    expired.set("a", 1)
+    assert expired.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_hit_and_miss_counters():
+    cache = AsyncTTLCache(60)
+
+    async def fetch():
+        return {"tmdb_id": 1, "name": "x"}
+
+    for _ in range(3):
+        await cache.get_or_fetch(1, fetch)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_warms_from_redis_in_one_batch():
+    shared = AsyncTTLCache(60, redis_prefix="t:details:")
+    await shared.get_or_fetch(1, lambda: _value({"tmdb_id": 1, "title": "a"}))
+
+    cold = AsyncTTLCache(60, redis_prefix="t:details:")
+    await cold.prefetch([1, 2])
+
+    assert cold.get(1) == {"tmdb_id": 1, "title": "a"}
+    assert cold.get(2) is None
+
+
+async def _value(v):
+    return v
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_reports_named_caches():
+    cache = AsyncTTLCache(60, redis_prefix="t:stats:")
+    await cache.get_or_fetch(1, lambda: _value({"tmdb_id": 1}))
+    await cache.get_or_fetch(1, lambda: _value({"tmdb_id": 1}))
+
+    stats = cache_stats()["t:stats"]
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+    assert stats["hit_ratio"] == 0.5
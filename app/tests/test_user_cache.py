@@ -0,0 +1,30 @@
+# tests/test_user_cache.py
+import pytest
+
+from app.services import user_cache
+
+
+@pytest.mark.asyncio
+async def test_exclusion_sets_round_trip_and_invalidate():
+    assert await user_cache.get_exclusion_sets(7) is None
+
+    await user_cache.set_exclusion_sets(7, [1396, 1399], [])
+    assert await user_cache.get_exclusion_sets(7) == ({1396, 1399}, set())
+
+    await user_cache.invalidate_not_interested(7)
+    assert await user_cache.get_exclusion_sets(7) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_recs_drops_all_param_variants():
+    k1 = user_cache.recs_key(7, 24, 0.6)
+    k2 = user_cache.recs_key(7, 50, 0.6)
+    other = user_cache.recs_key(8, 24, 0.6)
+    for k in (k1, k2, other):
+        await user_cache.set_recs_payload(k, b"[]")
+
+    await user_cache.invalidate_recs(7)
+
+    assert await user_cache.get_recs_payload(k1) is None
+    assert await user_cache.get_recs_payload(k2) is None
+    assert await user_cache.get_recs_payload(other) == "[]"